@@ -0,0 +1,28 @@
+-- Asana Simulation Database Indexes
+-- Secondary indexes built once after the bulk load (see schema.sql for tables)
+
+-- Task lookups: per-user aggregates, project/section/subtask listings, export ordering
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee_id ON tasks(assignee_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_section_id ON tasks(section_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_parent_task_id ON tasks(parent_task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
+
+-- Comments by author (per-user aggregates), by task, and in export order
+CREATE INDEX IF NOT EXISTS idx_comments_author_id ON comments(author_id);
+CREATE INDEX IF NOT EXISTS idx_comments_task_id ON comments(task_id);
+CREATE INDEX IF NOT EXISTS idx_comments_created_at ON comments(created_at);
+
+-- Team membership lookups in both directions
+CREATE INDEX IF NOT EXISTS idx_team_memberships_team_id ON team_memberships(team_id);
+CREATE INDEX IF NOT EXISTS idx_team_memberships_user_id ON team_memberships(user_id);
+
+-- Sections per project, projects per team
+CREATE INDEX IF NOT EXISTS idx_sections_project_id ON sections(project_id, order_index);
+CREATE INDEX IF NOT EXISTS idx_projects_team_id ON projects(team_id);
+
+-- Tags per task / tasks per tag, custom fields per project and values per task/field
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag_id ON task_tags(tag_id);
+CREATE INDEX IF NOT EXISTS idx_custom_field_definitions_project_id ON custom_field_definitions(project_id);
+CREATE INDEX IF NOT EXISTS idx_custom_field_values_task_id ON custom_field_values(task_id);
+CREATE INDEX IF NOT EXISTS idx_custom_field_values_field_id ON custom_field_values(field_id);
@@ -1,5 +1,6 @@
 -- Asana Simulation Database Schema
 -- SQLite DDL for B2B SaaS Company Seed Data
+-- Tables only; secondary indexes are in indexes.sql and are built after loading
 
 -- Organizations table
 CREATE TABLE IF NOT EXISTS organizations (
@@ -138,3 +139,20 @@ CREATE TABLE IF NOT EXISTS custom_field_values (
     FOREIGN KEY (task_id) REFERENCES tasks(task_id),
     FOREIGN KEY (field_id) REFERENCES custom_field_definitions(field_id)
 );
+
+-- Per-user aggregates, maintained during generation (read by export_data.py)
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id TEXT PRIMARY KEY,
+    team_count INTEGER NOT NULL DEFAULT 0,
+    tasks_assigned INTEGER NOT NULL DEFAULT 0,
+    tasks_completed INTEGER NOT NULL DEFAULT 0,
+    comments_authored INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- Per-team aggregates, maintained during generation
+CREATE TABLE IF NOT EXISTS team_stats (
+    team_id TEXT PRIMARY KEY,
+    member_count INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (team_id) REFERENCES teams(team_id)
+);
@@ -0,0 +1,273 @@
+"""Latency benchmark for the local REST API (api_server.py).
+
+Starts the server on the generated database (or targets --url), then runs
+--concurrency client threads, each on its own keep-alive connection, sending
+a weighted mix of requests for randomly chosen records for --duration seconds.
+List responses are sometimes followed to their next page, so keyset paging is
+exercised too.
+
+Reports requests/sec, latency percentiles overall and per endpoint, errors
+and the server's response cache hit rate. The server and the clients share
+the machine, so for the server's own capacity run the clients elsewhere
+(--url) or read the numbers as a lower bound.
+
+Usage:
+    python src/api_benchmark.py
+    python src/api_benchmark.py --concurrency 32 --duration 30 --out output/api_benchmark.json
+    python src/api_benchmark.py --url http://127.0.0.1:8080 --cache-entries 0
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import DB_PATH, SEED, API_POOL_SIZE, API_CACHE_ENTRIES  # type: ignore
+from utils.db import connect_readonly  # type: ignore
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_SIZE = 2000        # Records of each kind requests are drawn from
+FOLLOW_CHANCE = 0.3       # Share of list responses whose next page is requested
+PERCENTILES = (50, 90, 99, 99.9)
+
+# endpoint: (weight, record kind, path template)
+MIX = {
+    "task": (30, "tasks", "/tasks/{}"),
+    "project_tasks": (20, "projects", "/projects/{}/tasks?limit=50"),
+    "subtasks": (10, "parents", "/tasks/{}/subtasks"),
+    "stories": (10, "commented", "/tasks/{}/stories"),
+    "sections": (8, "projects", "/projects/{}/sections"),
+    "section_tasks": (7, "sections", "/sections/{}/tasks?limit=20"),
+    "project": (7, "projects", "/projects/{}"),
+    "user": (5, "users", "/users/{}"),
+    "team_projects": (3, "teams", "/teams/{}/projects?limit=20"),
+}
+
+# kind: (table, gid column, extra condition)
+SAMPLES = {
+    "tasks": ("tasks", "task_id", ""),
+    "parents": ("tasks", "parent_task_id", "AND parent_task_id IS NOT NULL"),
+    "commented": ("comments", "task_id", ""),
+    "projects": ("projects", "project_id", ""),
+    "sections": ("sections", "section_id", ""),
+    "users": ("users", "user_id", ""),
+    "teams": ("teams", "team_id", ""),
+}
+
+
+def sample_gids(db_path, rng, size=SAMPLE_SIZE):
+    """Random gids of each record kind, picked by rowid so large tables are not scanned."""
+    conn = connect_readonly(db_path)
+    samples = {}
+    for kind, (table, column, condition) in SAMPLES.items():
+        max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+        rowids = [rng.randint(1, max_rowid) for _ in range(size)] if max_rowid else []
+        gids = []
+        for start in range(0, len(rowids), 500):
+            chunk = rowids[start:start + 500]
+            gids += [row[0] for row in conn.execute(
+                f"SELECT {column} FROM {table} WHERE rowid IN ({','.join('?' * len(chunk))}) {condition}", chunk)]
+        samples[kind] = [str(gid) for gid in gids]
+    conn.close()
+    return samples
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path, port, pool_size, cache_entries):
+    """Run api_server.py in its own process and wait until it answers."""
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(SRC_DIR, "api_server.py"), "--db", db_path, "--port", str(port),
+         "--pool-size", str(pool_size), "--cache-entries", str(cache_entries)],
+        stdout=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"api_server.py exited with code {server.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("api_server.py did not start within 30s")
+
+
+def run_client(url, samples, seed, deadline, results):
+    """One client thread: a keep-alive connection sending the request mix until deadline."""
+    rng = random.Random(seed)
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    endpoints = [name for name in MIX if samples[MIX[name][1]]]
+    weights = [MIX[name][0] for name in endpoints]
+    latencies = {name: [] for name in endpoints}
+    errors = 0
+    follow = None
+
+    while time.perf_counter() < deadline:
+        if follow is not None:
+            name, path = follow
+        else:
+            name = rng.choices(endpoints, weights)[0]
+            _, kind, template = MIX[name]
+            path = template.format(rng.choice(samples[kind]))
+        want_next = "?" in path and rng.random() < FOLLOW_CHANCE
+        start = time.perf_counter()
+        try:
+            conn.request("GET", "/api/1.0" + path)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            errors += 1
+            follow = None
+            continue
+        latencies[name].append(time.perf_counter() - start)
+        follow = None
+        if response.status != 200:
+            errors += 1
+        elif want_next:
+            next_page = json.loads(body)["next_page"]
+            if next_page:
+                follow = (name, next_page["path"])
+
+    conn.close()
+    results.append((latencies, errors))
+
+
+def percentiles(values):
+    """Latency percentiles in milliseconds."""
+    values = sorted(values)
+    if not values:
+        return {}
+    stats = {f"p{q:g}": round(values[min(len(values) - 1, int(q / 100 * len(values)))] * 1000, 3)
+             for q in PERCENTILES}
+    stats["max"] = round(values[-1] * 1000, 3)
+    return stats
+
+
+def server_stats(url):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    try:
+        conn.request("GET", "/_stats")
+        return json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+
+
+def run_clients(url, samples, concurrency, duration, seed):
+    results = []
+    start = time.perf_counter()
+    deadline = start + duration
+    threads = [threading.Thread(target=run_client, args=(url, samples, seed * 1000 + n, deadline, results))
+               for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def run_benchmark(url, samples, concurrency, duration, warmup, seed):
+    """Warm up, then measure; returns the report dict."""
+    if warmup:
+        run_clients(url, samples, concurrency, warmup, seed + 1)
+    before = server_stats(url)["cache"]
+    results, elapsed = run_clients(url, samples, concurrency, duration, seed)
+    after = server_stats(url)["cache"]
+
+    merged = {}
+    errors = 0
+    for latencies, client_errors in results:
+        errors += client_errors
+        for name, values in latencies.items():
+            merged.setdefault(name, []).extend(values)
+    everything = [value for values in merged.values() for value in values]
+    hits = after["hits"] - before["hits"]
+    lookups = hits + after["misses"] - before["misses"]
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests": len(everything),
+        "errors": errors,
+        "requests_per_sec": round(len(everything) / elapsed) if elapsed else None,
+        "latency_ms": percentiles(everything),
+        "endpoints": {name: {"requests": len(values), **percentiles(values)}
+                      for name, values in sorted(merged.items())},
+        "cache_hit_rate": round(hits / lookups, 4) if lookups else None,
+        "cache": after,
+    }
+
+
+def print_report(report):
+    latency = report["latency_ms"]
+    print(f"\n{report['requests']:,} requests in {report['seconds']:.1f}s with {report['concurrency']} clients: "
+          f"{report['requests_per_sec'] or 0:,} req/s, {report['errors']} errors, "
+          f"cache hit rate {report['cache_hit_rate'] or 0:.1%}")
+    print("  latency (ms): " + "  ".join(f"{name} {value:.2f}" for name, value in latency.items()))
+    print(f"\n  {'endpoint':<15} {'requests':>9} {'p50':>8} {'p99':>8} {'max':>8}")
+    for name, stats in report["endpoints"].items():
+        print(f"  {name:<15} {stats['requests']:>9,} {stats['p50']:>8.2f} {stats['p99']:>8.2f} {stats['max']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency benchmark for the local REST API")
+    parser.add_argument("--db", default=DB_PATH, help=f"database the requests are drawn from (default: {DB_PATH})")
+    parser.add_argument("--url", default=None,
+                        help="benchmark a running server (default: start api_server.py on a free port)")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads (default: 8)")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds (default: 10)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds first (default: 2)")
+    parser.add_argument("--pool-size", type=int, default=API_POOL_SIZE,
+                        help=f"connections of the started server (default: {API_POOL_SIZE})")
+    parser.add_argument("--cache-entries", type=int, default=API_CACHE_ENTRIES,
+                        help=f"response cache of the started server, 0 to disable (default: {API_CACHE_ENTRIES})")
+    parser.add_argument("--seed", type=int, default=SEED, help=f"seed of the request mix (default: {SEED})")
+    parser.add_argument("--out", default=None, help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"Database not found: {args.db} (run src/main.py first)")
+    if args.concurrency < 1 or args.duration <= 0:
+        parser.error("--concurrency must be at least 1 and --duration positive")
+
+    samples = sample_gids(args.db, random.Random(args.seed))
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        server = start_server(args.db, port, args.pool_size, args.cache_entries)
+        url = f"http://127.0.0.1:{port}"
+    print(f"Benchmarking {url} with {args.concurrency} clients for {args.duration:g}s "
+          f"(+{args.warmup:g}s warm-up)...")
+    try:
+        report = run_benchmark(url, samples, args.concurrency, args.duration, args.warmup, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_report(report)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""Serve the generated database through a local Asana-style REST API.
+
+Read-only GET endpoints shaped like Asana's (responses wrapped in "data",
+records with gid and resource_type, offset tokens for paging), so API
+clients can be load-tested against a realistic dataset offline:
+
+    /workspaces                         /workspaces/{gid}
+    /workspaces/{gid}/users             /users/{gid}
+    /workspaces/{gid}/teams             /teams/{gid}
+    /workspaces/{gid}/projects          /teams/{gid}/users
+    /workspaces/{gid}/tags              /tags/{gid}
+    /teams/{gid}/projects               /projects/{gid}
+    /projects/{gid}/sections            /sections/{gid}
+    /projects/{gid}/tasks               /sections/{gid}/tasks
+    /tasks/{gid}                        /tasks/{gid}/subtasks
+    /tasks/{gid}/stories                /stories/{gid}
+
+All paths are under /api/1.0. Lists return compact records unless opt_fields
+names the fields wanted, and take limit (1-100) and offset.
+
+Methodology:
+- Keyset pagination: the offset token encodes the sort key of the last
+  record returned (rowid, or order_index for sections), so every page is an
+  index range scan however deep the client pages
+- Every query is a constant SQL string with ? parameters; sqlite3 keeps the
+  compiled statements of each connection, so each is prepared once per connection
+- Request threads borrow read-only connections from a fixed pool
+- Response bodies are cached by request path, least recently used evicted
+  first (the database is read-only, so entries never go stale)
+
+Usage:
+    python src/api_server.py
+    python src/api_server.py --port 9000 --pool-size 16 --cache-entries 100000
+    curl 'http://127.0.0.1:8080/api/1.0/projects/{gid}/tasks?limit=10'
+"""
+import argparse
+import base64
+import json
+import os
+import queue
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import DB_PATH, API_HOST, API_PORT, API_POOL_SIZE, API_PAGE_LIMIT  # type: ignore
+from config import API_CACHE_ENTRIES, API_CACHE_MB  # type: ignore
+from utils.db import connect_readonly  # type: ignore
+
+API_PREFIX = "/api/1.0"
+MAX_LIMIT = 100
+STATEMENT_CACHE = 256  # Compiled statements kept per connection (more than the routes use)
+MMAP_SIZE = 256 * 1024 * 1024  # Pooled connections read pages through one shared mapping
+
+
+class ApiError(Exception):
+    """A request error, returned to the client in Asana's error format."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ConnectionPool:
+    """
+    A fixed set of read-only connections shared by the request threads.
+    Connections are handed out last-in first-out, so the busiest ones keep
+    their page caches warm.
+    """
+
+    def __init__(self, db_path, size=API_POOL_SIZE):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Database not found: {db_path} (run src/main.py first)")
+        self.size = size
+        self.idle = queue.LifoQueue()
+        for _ in range(size):
+            conn = connect_readonly(db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE)
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+            self.idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the block (waits while all are in use)."""
+        conn = self.idle.get()
+        try:
+            yield conn
+        finally:
+            self.idle.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self.idle.get().close()
+
+
+class ResponseCache:
+    """
+    Response bodies by request path, bounded by entry count and total bytes.
+    The least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries=API_CACHE_ENTRIES, max_mb=API_CACHE_MB):
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            body = self.entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        if not self.max_entries or len(body) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self.entries[key] = body
+            self.bytes += len(body)
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+# ============================================
+# RESOURCES
+# ============================================
+
+def ref(gid, resource_type):
+    """Compact reference to a related record (None when there is none). Like Asana, gids are strings."""
+    return None if gid is None else {"gid": str(gid), "resource_type": resource_type}
+
+
+def asana_time(value):
+    """Database timestamp ("2025-09-16 00:00:00") as Asana's ISO 8601 UTC form."""
+    return None if value is None else value.replace(" ", "T") + ".000Z"
+
+
+def workspace_record(row):
+    org_id, name, domain = row
+    return {"gid": str(org_id), "resource_type": "workspace", "name": name,
+            "email_domains": [domain], "is_organization": True}
+
+
+def user_record(row):
+    user_id, name, email, org_id = row
+    return {"gid": str(user_id), "resource_type": "user", "name": name, "email": email,
+            "workspaces": [ref(org_id, "workspace")]}
+
+
+def team_record(row):
+    team_id, name, org_id = row
+    return {"gid": str(team_id), "resource_type": "team", "name": name, "organization": ref(org_id, "workspace")}
+
+
+def project_record(row):
+    project_id, name, notes, team_id, owner_id, status, created_at, due_date = row
+    return {"gid": str(project_id), "resource_type": "project", "name": name, "notes": notes or "",
+            "team": ref(team_id, "team"), "owner": ref(owner_id, "user"),
+            "completed": status == "completed", "created_at": asana_time(created_at), "due_on": due_date}
+
+
+def section_record(row):
+    section_id, name, project_id, created_at = row
+    return {"gid": str(section_id), "resource_type": "section", "name": name,
+            "project": ref(project_id, "project"), "created_at": asana_time(created_at)}
+
+
+def task_record(row):
+    (task_id, name, notes, completed, completed_at, created_at, due_date, assignee_id,
+     parent_id, project_id, section_id, num_subtasks, tag_ids) = row
+    return {"gid": str(task_id), "resource_type": "task", "resource_subtype": "default_task", "name": name,
+            "notes": notes or "", "completed": bool(completed), "completed_at": asana_time(completed_at),
+            "created_at": asana_time(created_at), "due_on": due_date,
+            "assignee": ref(assignee_id, "user"), "parent": ref(parent_id, "task"),
+            "projects": [ref(project_id, "project")],
+            "memberships": [{"project": ref(project_id, "project"), "section": ref(section_id, "section")}],
+            "num_subtasks": num_subtasks,
+            "tags": [ref(tag_id, "tag") for tag_id in tag_ids.split(",")] if tag_ids else []}
+
+
+def story_record(row):
+    comment_id, text, created_at, author_id, task_id = row
+    return {"gid": str(comment_id), "resource_type": "story", "type": "comment", "resource_subtype": "comment_added",
+            "text": text, "created_at": asana_time(created_at), "created_by": ref(author_id, "user"),
+            "target": ref(task_id, "task")}
+
+
+def tag_record(row):
+    tag_id, name, color, org_id, created_at = row
+    return {"gid": str(tag_id), "resource_type": "tag", "name": name, "color": color,
+            "workspace": ref(org_id, "workspace"), "created_at": asana_time(created_at)}
+
+
+# resource: (render, fields of the compact form lists return, selected columns)
+RESOURCES = {
+    "workspaces": (workspace_record, ("gid", "resource_type", "name"), "o.org_id, o.name, o.domain"),
+    "users": (user_record, ("gid", "resource_type", "name"), "u.user_id, u.full_name, u.email, u.org_id"),
+    "teams": (team_record, ("gid", "resource_type", "name"), "t.team_id, t.name, t.org_id"),
+    "projects": (project_record, ("gid", "resource_type", "name"),
+                 "p.project_id, p.name, p.description, p.team_id, p.owner_id, p.status, p.created_at, p.due_date"),
+    "sections": (section_record, ("gid", "resource_type", "name"), "s.section_id, s.name, s.project_id, s.created_at"),
+    "tasks": (task_record, ("gid", "resource_type", "resource_subtype", "name"),
+              "k.task_id, k.name, k.description, k.completed, k.completed_at, k.created_at, k.due_date, "
+              "k.assignee_id, k.parent_task_id, k.project_id, k.section_id, "
+              "(SELECT COUNT(*) FROM tasks c WHERE c.parent_task_id = k.task_id), "
+              "(SELECT group_concat(g.tag_id) FROM task_tags g WHERE g.task_id = k.task_id)"),
+    "stories": (story_record, ("gid", "resource_type", "resource_subtype", "created_at", "created_by", "text"),
+                "m.comment_id, m.content, m.created_at, m.author_id, m.task_id"),
+    "tags": (tag_record, ("gid", "resource_type", "name"), "a.tag_id, a.name, a.color, a.org_id, a.created_at"),
+}
+
+# resource: FROM clause and key column of single-record lookups
+TABLES = {
+    "workspaces": ("organizations o", "o.org_id"),
+    "users": ("users u", "u.user_id"),
+    "teams": ("teams t", "t.team_id"),
+    "projects": ("projects p", "p.project_id"),
+    "sections": ("sections s", "s.section_id"),
+    "tasks": ("tasks k", "k.task_id"),
+    "stories": ("comments m", "m.comment_id"),
+    "tags": ("tags a", "a.tag_id"),
+}
+
+# (parent resource, listed resource): FROM ... WHERE clause and keyset column.
+# None as parent is a top-level list. The parent gid is the first parameter. Unary +
+# keeps the planner off an index that would match most rows (parent_task_id IS NULL)
+# or return them out of keyset order (team_id of a whole workspace).
+LISTS = {
+    (None, "workspaces"): ("organizations o WHERE 1", "o.rowid"),
+    ("workspaces", "users"): ("users u WHERE u.org_id = ?", "u.rowid"),
+    ("workspaces", "teams"): ("teams t WHERE t.org_id = ?", "t.rowid"),
+    ("workspaces", "projects"): ("projects p WHERE +p.team_id IN (SELECT t.team_id FROM teams t WHERE t.org_id = ?)", "p.rowid"),
+    ("workspaces", "tags"): ("tags a WHERE a.org_id = ?", "a.rowid"),
+    ("teams", "users"): ("team_memberships j JOIN users u ON u.user_id = j.user_id WHERE j.team_id = ?", "j.rowid"),
+    ("teams", "projects"): ("projects p WHERE p.team_id = ?", "p.rowid"),
+    ("projects", "sections"): ("sections s WHERE s.project_id = ?", "s.order_index"),
+    ("projects", "tasks"): ("tasks k WHERE k.project_id = ? AND +k.parent_task_id IS NULL", "k.rowid"),
+    ("sections", "tasks"): ("tasks k WHERE k.section_id = ? AND +k.parent_task_id IS NULL", "k.rowid"),
+    ("tasks", "subtasks"): ("tasks k WHERE k.parent_task_id = ?", "k.rowid"),
+    ("tasks", "stories"): ("comments m WHERE m.task_id = ?", "m.rowid"),
+}
+LIST_RESOURCES = {"subtasks": "tasks"}
+ALIASES = {"organizations": "workspaces"}
+
+
+def single_sql(resource):
+    table, key = TABLES[resource]
+    return f"SELECT {RESOURCES[resource][2]} FROM {table} WHERE {key} = ?"
+
+
+def list_sql(parent, name):
+    """Keyset page query: parameters are ([parent gid,] last key, limit + 1)."""
+    where, key = LISTS[(parent, name)]
+    columns = RESOURCES[LIST_RESOURCES.get(name, name)][2]
+    return f"SELECT {key}, {columns} FROM {where} AND {key} > ? ORDER BY {key} LIMIT ?"
+
+
+def encode_offset(key):
+    return base64.urlsafe_b64encode(str(key).encode()).decode().rstrip("=")
+
+
+def decode_offset(token):
+    try:
+        key = int(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode())
+    except ValueError:
+        key = -1
+    # Keys are rowids, which SQLite stores as signed 64-bit integers
+    if not 0 <= key < 2**63:
+        raise ApiError(400, "offset: Your pagination token is invalid.")
+    return key
+
+
+def dumps(data):
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+class AsanaApi:
+    """
+    Request handling independent of the HTTP server: handle(path) returns
+    (status, JSON body bytes) for a GET of path.
+    """
+
+    def __init__(self, db_path=DB_PATH, pool_size=API_POOL_SIZE, cache_entries=API_CACHE_ENTRIES,
+                 cache_mb=API_CACHE_MB, base_url=""):
+        self.pool = ConnectionPool(db_path, pool_size)
+        self.cache = ResponseCache(cache_entries, cache_mb)
+        self.base_url = base_url
+        self.singles = {resource: single_sql(resource) for resource in TABLES}
+        self.lists = {route: list_sql(*route) for route in LISTS}
+
+    def handle(self, path):
+        if path == "/_stats":
+            return 200, dumps({"cache": self.cache.stats(), "pool_size": self.pool.size})
+        body = self.cache.get(path)
+        if body is not None:
+            return 200, body
+        try:
+            body = dumps(self.respond(path))
+        except ApiError as e:
+            return e.status, dumps({"errors": [{"message": e.message}]})
+        self.cache.put(path, body)
+        return 200, body
+
+    def respond(self, path):
+        route, _, query = path.partition("?")
+        if not route.startswith(API_PREFIX + "/"):
+            raise ApiError(404, f"Unknown path: {route}")
+        parts = [ALIASES.get(part, part) for part in route[len(API_PREFIX) + 1:].strip("/").split("/")]
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        fields = params["opt_fields"].split(",") if params.get("opt_fields") else None
+
+        if len(parts) == 2 and parts[0] in TABLES:
+            return {"data": self.get_one(parts[0], parts[1], fields)}
+        if len(parts) == 1 and (None, parts[0]) in LISTS:
+            return self.get_page(None, parts[0], None, route, params, fields)
+        if len(parts) == 3 and (parts[0], parts[2]) in LISTS:
+            return self.get_page(parts[0], parts[2], parts[1], route, params, fields)
+        raise ApiError(404, f"Unknown path: {route}")
+
+    def get_one(self, resource, gid, fields):
+        with self.pool.connection() as conn:
+            row = conn.execute(self.singles[resource], (gid,)).fetchone()
+        if row is None:
+            raise ApiError(404, f"{resource[:-1]}: Unknown object: {gid}")
+        return select_fields(RESOURCES[resource][0](row), fields)
+
+    def get_page(self, parent, name, gid, route, params, fields):
+        try:
+            limit = params.get("limit", API_PAGE_LIMIT)
+            limit = int(limit) if str(limit).isdecimal() else 0
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ApiError(400, f"limit: Must be between 1 and {MAX_LIMIT}")
+        after = decode_offset(params["offset"]) if params.get("offset") else -1
+        args = (after, limit + 1) if parent is None else (gid, after, limit + 1)
+
+        with self.pool.connection() as conn:
+            if parent is not None:
+                table, key = TABLES[parent]
+                if conn.execute(f"SELECT 1 FROM {table} WHERE {key} = ?", (gid,)).fetchone() is None:
+                    raise ApiError(404, f"{parent[:-1]}: Unknown object: {gid}")
+            rows = conn.execute(self.lists[(parent, name)], args).fetchall()
+
+        render, compact, _ = RESOURCES[LIST_RESOURCES.get(name, name)]
+        data = [select_fields(render(row[1:]), fields or compact) for row in rows[:limit]]
+        next_page = None
+        if len(rows) > limit:
+            token = encode_offset(rows[limit - 1][0])
+            page_path = f"{route[len(API_PREFIX):]}?limit={limit}&offset={token}"
+            if fields:
+                page_path += f"&opt_fields={','.join(fields)}"
+            next_page = {"offset": token, "path": page_path, "uri": f"{self.base_url}{API_PREFIX}{page_path}"}
+        return {"data": data, "next_page": next_page}
+
+    def close(self):
+        self.pool.close()
+
+
+def select_fields(record, fields):
+    """The requested fields of a record (all of them when fields is None); gid is always included."""
+    if fields is None:
+        return record
+    return {name: record[name] for name in record if name == "gid" or name in fields}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients reuse connections
+    server_version = "AsanaSimulationAPI/1.0"
+    disable_nagle_algorithm = True  # Headers and body go out without waiting for an ACK
+
+    def do_GET(self):
+        status, body = self.server.api.handle(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Listen backlog: clients opening many connections at once are not refused
+
+
+def make_server(db_path=DB_PATH, host=API_HOST, port=API_PORT, pool_size=API_POOL_SIZE,
+                cache_entries=API_CACHE_ENTRIES, cache_mb=API_CACHE_MB, verbose=False):
+    """Create the HTTP server (one thread per client connection); call serve_forever() to run it."""
+    server = ApiServer((host, port), ApiHandler)
+    host, port = server.server_address[:2]
+    server.api = AsanaApi(db_path, pool_size, cache_entries, cache_mb, base_url=f"http://{host}:{port}")
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the generated database through an Asana-style REST API")
+    parser.add_argument("--db", default=DB_PATH, help=f"database to serve (default: {DB_PATH})")
+    parser.add_argument("--host", default=API_HOST, help=f"address to listen on (default: {API_HOST})")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"port to listen on (default: {API_PORT})")
+    parser.add_argument("--pool-size", type=int, default=API_POOL_SIZE,
+                        help=f"read-only database connections (default: {API_POOL_SIZE})")
+    parser.add_argument("--cache-entries", type=int, default=API_CACHE_ENTRIES,
+                        help=f"responses kept in the cache, 0 to disable it (default: {API_CACHE_ENTRIES})")
+    parser.add_argument("--cache-mb", type=float, default=API_CACHE_MB,
+                        help=f"cache size limit in MB (default: {API_CACHE_MB})")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    if args.pool_size < 1:
+        parser.error("--pool-size must be at least 1")
+    try:
+        server = make_server(args.db, args.host, args.port, args.pool_size, args.cache_entries,
+                             args.cache_mb, args.verbose)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+
+    print(f"Serving {args.db} at {server.api.base_url}{API_PREFIX} "
+          f"({args.pool_size} connections, cache {args.cache_entries:,} responses / {args.cache_mb:g} MB)",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.api.close()
+
+
+if __name__ == "__main__":
+    main()
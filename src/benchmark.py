@@ -0,0 +1,154 @@
+"""Scale-ladder benchmark for the generation pipeline.
+
+Runs main.py and export_data.py at preset scales (in fresh processes, with the
+scale applied through environment overrides) and records wall time, rows/sec
+and peak RSS per stage plus the final database size. Results are written as
+JSON and can be compared against a stored baseline to catch regressions.
+
+Usage:
+    python src/benchmark.py --scales baseline,10x
+    python src/benchmark.py --scales baseline --save-baseline
+    python src/benchmark.py --scales baseline --baseline output/benchmark_baseline.json
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scale presets: config overrides applied through environment variables
+SCALES = {
+    "baseline": {"NUM_USERS": 7500, "NUM_PROJECTS": 500},
+    "10x": {"NUM_USERS": 75000, "NUM_PROJECTS": 5000},
+    "100k": {"NUM_USERS": 100000, "NUM_PROJECTS": 10000},
+    "1m": {"NUM_USERS": 1000000, "NUM_PROJECTS": 100000},
+}
+
+DEFAULT_RESULTS = "output/benchmark_results.json"
+DEFAULT_BASELINE = "output/benchmark_baseline.json"
+REFERENCE_DATE = "2026-01-07"
+
+
+def run_step(script: str, env: dict, metrics_path: str, extra_args: list[str]) -> dict:
+    """Run one pipeline script in a fresh process and return its metrics JSON."""
+    cmd = [sys.executable, os.path.join(SRC_DIR, script), "--metrics-out", metrics_path, *extra_args]
+    result = subprocess.run(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} failed:\n{result.stdout[-2000:]}")
+    with open(metrics_path) as f:
+        return json.load(f)
+
+
+def run_scale(name: str, overrides: dict, main_args: list[str], keep: bool) -> dict:
+    """Generate and export one scale; return its per-stage metrics."""
+    workdir = tempfile.mkdtemp(prefix=f"asana-bench-{name}-")
+    env = dict(os.environ,
+               DATABASE_PATH=os.path.join(workdir, "asana_simulation.sqlite"),
+               OUTPUT_DIR=os.path.join(workdir, "csv"),
+               REFERENCE_DATE=REFERENCE_DATE,
+               USE_LLM="false",
+               **{key: str(value) for key, value in overrides.items()})
+
+    start = time.perf_counter()
+    generated = run_step("main.py", env, os.path.join(workdir, "generate.json"), main_args)
+    exported = run_step("export_data.py", env, os.path.join(workdir, "export.json"), [])
+    elapsed = time.perf_counter() - start
+
+    if keep:
+        print(f"  Kept output in {workdir}")
+    else:
+        shutil.rmtree(workdir)
+
+    return {
+        "scale": name,
+        "config": overrides,
+        "args": main_args,
+        "total_seconds": round(elapsed, 3),
+        "db_size_bytes": generated["db_size_bytes"],
+        "stages": generated["stages"] + exported["stages"],
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List stages whose rows/sec fell more than `tolerance` below the baseline."""
+    regressions = []
+    baseline_runs = {run["scale"]: run for run in baseline.get("runs", [])}
+    for run in results["runs"]:
+        base_run = baseline_runs.get(run["scale"])
+        if not base_run:
+            continue
+        base_stages = {stage["stage"]: stage for stage in base_run["stages"]}
+        for stage in run["stages"]:
+            base = base_stages.get(stage["stage"])
+            if not base or not base.get("rows_per_sec") or not stage.get("rows_per_sec"):
+                continue
+            ratio = stage["rows_per_sec"] / base["rows_per_sec"]
+            stage["baseline_ratio"] = round(ratio, 3)
+            if ratio < 1 - tolerance:
+                regressions.append(f"{run['scale']}/{stage['stage']}: {stage['rows_per_sec']:,.0f} rows/s "
+                                   f"vs baseline {base['rows_per_sec']:,.0f} ({ratio:.0%})")
+    return regressions
+
+
+def print_run(run: dict) -> None:
+    print(f"\n{run['scale']}: {run['total_seconds']:.1f}s total, DB {run['db_size_bytes'] / 1e6:,.1f} MB")
+    print(f"  {'stage':<14}{'seconds':>10}{'rows':>14}{'rows/s':>14}{'peak MB':>10}{'vs base':>9}")
+    for stage in run["stages"]:
+        ratio = f"{stage['baseline_ratio']:.0%}" if "baseline_ratio" in stage else ""
+        print(f"  {stage['stage']:<14}{stage['seconds']:>10.2f}{stage['rows']:>14,}"
+              f"{stage['rows_per_sec'] or 0:>14,.0f}{stage['peak_rss_mb']:>10,.0f}{ratio:>9}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the generation pipeline at preset scales.")
+    parser.add_argument("--scales", default="baseline",
+                        help=f"comma-separated presets to run ({', '.join(SCALES)})")
+    parser.add_argument("--output", default=DEFAULT_RESULTS, help="results JSON path")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also save results to {DEFAULT_BASELINE}")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed rows/sec drop before a stage counts as a regression (default: 0.2)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated databases and CSVs")
+    parser.add_argument("main_args", nargs="*", help="extra arguments for main.py (after --)")
+    args = parser.parse_args(argv)
+
+    scales = [name.strip() for name in args.scales.split(",") if name.strip()]
+    unknown = [name for name in scales if name not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+
+    results = {"created_at": time.strftime("%Y-%m-%d %H:%M:%S"), "python": sys.version.split()[0], "runs": []}
+    for name in scales:
+        print(f"Running scale '{name}' ({SCALES[name]})...")
+        results["runs"].append(run_scale(name, SCALES[name], args.main_args, args.keep))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+    for run in results["runs"]:
+        print_run(run)
+
+    paths = [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else [])
+    for path in paths:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {path}")
+
+    if regressions:
+        print("\nThroughput regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,17 @@ load_dotenv()
 # ============================================
 # DATABASE CONFIGURATION
 # ============================================
-DB_PATH = "output/asana_simulation.sqlite"
+DB_PATH = os.getenv("DATABASE_PATH", "output/asana_simulation.sqlite")
+OUTPUT_DIR = os.getenv("OUTPUT_DIR", "output")  # CSV export folder
+TABLES_DIR = os.path.join(OUTPUT_DIR, "tables")  # Per-table files written by --sink csv/jsonl
+SHARD_DIR = os.path.join(OUTPUT_DIR, "shards")  # Per-organization databases (--orgs)
+POSTGRES_DIR = os.path.join(OUTPUT_DIR, "postgres")  # COPY bundle written by export_postgres.py
+EXPORT_WORKERS = 1        # Files exported concurrently (export_data.py / export_postgres.py --workers)
 SCHEMA_PATH = "schema.sql"
+INDEXES_PATH = "indexes.sql"  # Secondary indexes, built after the bulk load
+BATCH_SIZE = 5000         # Rows buffered per table before an executemany flush
+BULK_LOAD = True          # Use fast-loading PRAGMAs while generating
+MEMORY_BUDGET = os.getenv("MEMORY_BUDGET")  # e.g. "2G": tune batch, cache, commits and workers to fit (--memory-budget)
 
 # ============================================
 # COMPANY CONFIGURATION
@@ -22,11 +31,27 @@ COMPANY_DOMAIN = "techflow.io"
 # ============================================
 # SCALE CONFIGURATION
 # ============================================
-NUM_USERS = 7500          # Target: 5000-10000 employees
+NUM_ORGS = int(os.getenv("NUM_ORGS", 1))             # Organizations (tenants); each gets the sizes below
+NUM_USERS = int(os.getenv("NUM_USERS", 7500))        # Target: 5000-10000 employees
 NUM_TEAMS = 78            # Number of teams
-NUM_PROJECTS = 500        # Number of projects
+NUM_PROJECTS = int(os.getenv("NUM_PROJECTS", 500))   # Number of projects
 TASKS_PER_PROJECT = (30, 100)  # Min/max tasks per project
 
+# Faker locales user names are drawn from, with their share of users.
+# NAME_LOCALES=en_US,de_DE gives each listed locale an equal share.
+NAME_LOCALES = ({locale.strip(): 1.0 for locale in os.getenv("NAME_LOCALES").split(",") if locale.strip()}
+                if os.getenv("NAME_LOCALES") else {"en_US": 1.0})
+
+# ============================================
+# REPRODUCIBILITY & PARALLELISM
+# ============================================
+SEED = 42                 # Base seed; per-project seeds are derived from it
+ID_MODE = os.getenv("ID_MODE", "seeded")  # "seeded", "counter" or "integer" (--id-mode)
+WORKERS = 1               # Processes used for task generation (--workers)
+REFERENCE_DATE = os.getenv("REFERENCE_DATE")  # "YYYY-MM-DD[ HH:MM:SS]" to pin "now"; default: run start
+TASK_ENGINE = "python"    # "python" or "numpy" (vectorized, needs numpy) (--engine)
+TASK_BATCH = 64           # Most projects passed to the task engine per call
+
 # ============================================
 # DATA GENERATION SETTINGS
 # ============================================
@@ -83,6 +108,49 @@ SECTION_TEMPLATES = {
     "default": ["To Do", "In Progress", "Done"]
 }
 
+# ============================================
+# TAGS & CUSTOM FIELDS
+# ============================================
+TAG_NAMES = ["urgent", "bug", "blocked", "needs-review", "customer-request", "tech-debt", "quick-win",
+             "design", "documentation", "security", "performance", "follow-up", "q1", "q2", "q3", "q4",
+             "external", "internal", "research", "release"]
+TAG_COLORS = ["red", "orange", "yellow", "green", "teal", "blue", "purple", "pink", "gray"]
+TAG_CHANCE = 0.5          # 50% of tasks are tagged
+TAGS_PER_TASK = (1, 3)    # Distinct tags on a tagged task
+
+# Field name -> (field_type, enum options); projects pick a few of these
+CUSTOM_FIELDS = {
+    "Story Points": ("number", None),
+    "Effort": ("enum", ["XS", "S", "M", "L", "XL"]),
+    "Stage": ("enum", ["Discovery", "Build", "QA", "Rollout"]),
+    "Target Quarter": ("enum", ["Q1", "Q2", "Q3", "Q4"]),
+    "Budget": ("number", None),
+    "Customer": ("text", None),
+    "Review Date": ("date", None),
+    "Risk": ("enum", ["Low", "Medium", "High"]),
+}
+CUSTOM_FIELDS_PER_PROJECT = (1, 4)  # Min/max field definitions per project
+CUSTOM_FIELD_FILL_RATE = 0.7        # Share of tasks with a value for each field
+
+# ============================================
+# EVENT STREAM (stream_events.py)
+# ============================================
+STREAM_RATE = float(os.getenv("STREAM_RATE", 0))        # Target events/sec (0 = as fast as possible)
+STREAM_SPEEDUP = float(os.getenv("STREAM_SPEEDUP", 0))  # Simulated seconds per second (0 = ignore event times)
+STREAM_BATCH = 1000                 # Most events written per write call
+STREAM_MAX_LAG = 1.0                # Seconds a slow consumer may put the stream behind before it is rebased
+STREAM_MAX_EVENTS = int(os.getenv("STREAM_MAX_EVENTS", 1_000_000))  # Events held in memory at once (~300 bytes each)
+
+# ============================================
+# API SERVER (api_server.py)
+# ============================================
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", 8080))
+API_POOL_SIZE = 8                   # Read-only connections shared by the request threads
+API_PAGE_LIMIT = 50                 # Page size when a list request has no limit (Asana's maximum is 100)
+API_CACHE_ENTRIES = 20000           # Responses kept in the cache (least recently used evicted first)
+API_CACHE_MB = 64                   # Cache size limit by response bytes
+
 # ============================================
 # LLM CONFIGURATION (Optional)
 # ============================================
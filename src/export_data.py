@@ -1,101 +1,99 @@
 """Export Asana seed data to CSV files.
 
 Usage:
-    python src/export_data.py
+    python src/export_data.py [--workers N] [--metrics-out PATH]
 """
+import argparse
 import csv
 import os
 import sqlite3
 import sys
+import time
+from multiprocessing import Pool
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import DB_PATH, COMPANY_NAME  # type: ignore
+from config import DB_PATH, COMPANY_NAME, OUTPUT_DIR, EXPORT_WORKERS  # type: ignore
+from utils.metrics import StageRecorder  # type: ignore
+from utils.db import connect_readonly  # type: ignore
 
-OUTPUT_DIR = "output"
+CHUNK_SIZE = 10000
 
+# Rough relative size of each export, used to start the largest ones first
+EXPORT_WEIGHTS = {"tasks.csv": 100, "comments.csv": 20, "users.csv": 10, "team_memberships.csv": 5,
+                  "sections.csv": 4, "projects.csv": 2}
 
-def write_csv(path: str, headers: list[str], rows: list) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        writer.writerows(rows)
-    print(f"Wrote {path}")
-
-
-def main() -> None:
-    if not os.path.exists(DB_PATH):
-        raise FileNotFoundError(f"Database not found at {DB_PATH}. Run 'python src/main.py' first.")
-
-    conn = sqlite3.connect(DB_PATH)
-    print(f"Exporting data for {COMPANY_NAME}...\n")
+# Summary tables the exports read besides the entity tables (added by later generator versions)
+STATS_TABLES = ("user_stats", "team_stats")
 
+# (file name, CSV headers, query), in the order they are written sequentially
+EXPORTS = [
     # Organization
-    rows = conn.execute("SELECT org_id, name, domain, created_at FROM organizations").fetchall()
-    write_csv(os.path.join(OUTPUT_DIR, "org.csv"), ["org_id", "name", "domain", "created_at"], rows)
-
-    # Users with aggregates
-    rows = conn.execute("""
+    ("org.csv",
+     ["org_id", "name", "domain", "created_at"],
+     "SELECT org_id, name, domain, created_at FROM organizations"),
+
+    # Users with aggregates (maintained during generation in user_stats)
+    ("users.csv",
+     ["user_id", "full_name", "email", "department", "role", "created_at", "team_count", "tasks_assigned", "tasks_completed", "comments_authored"],
+     """
         SELECT u.user_id, u.full_name, u.email, u.department, u.role, u.created_at,
-               COALESCE(tm.team_count, 0) AS team_count,
-               COALESCE(t.assigned_count, 0) AS tasks_assigned,
-               COALESCE(t.completed_count, 0) AS tasks_completed,
-               COALESCE(c.comments_count, 0) AS comments_authored
+               COALESCE(s.team_count, 0), COALESCE(s.tasks_assigned, 0), COALESCE(s.tasks_completed, 0),
+               COALESCE(s.comments_authored, 0)
         FROM users u
-        LEFT JOIN (SELECT user_id, COUNT(*) AS team_count FROM team_memberships GROUP BY user_id) tm ON tm.user_id = u.user_id
-        LEFT JOIN (SELECT assignee_id, COUNT(*) AS assigned_count, SUM(CASE WHEN completed THEN 1 ELSE 0 END) AS completed_count FROM tasks WHERE assignee_id IS NOT NULL GROUP BY assignee_id) t ON t.assignee_id = u.user_id
-        LEFT JOIN (SELECT author_id, COUNT(*) AS comments_count FROM comments GROUP BY author_id) c ON c.author_id = u.user_id
+        LEFT JOIN user_stats s ON s.user_id = u.user_id
         ORDER BY u.department, u.full_name
-    """).fetchall()
-    write_csv(os.path.join(OUTPUT_DIR, "users.csv"),
-              ["user_id", "full_name", "email", "department", "role", "created_at", "team_count", "tasks_assigned", "tasks_completed", "comments_authored"], rows)
-
-    # Teams
-    rows = conn.execute("""
-        SELECT t.team_id, t.org_id, t.name, t.department, t.created_at,
-               COALESCE(tm.member_count, 0) AS member_count
+    """),
+
+    # Teams (member_count from team_stats)
+    ("teams.csv",
+     ["team_id", "org_id", "name", "department", "created_at", "member_count"],
+     """
+        SELECT t.team_id, t.org_id, t.name, t.department, t.created_at, COALESCE(s.member_count, 0)
         FROM teams t
-        LEFT JOIN (SELECT team_id, COUNT(*) AS member_count FROM team_memberships GROUP BY team_id) tm ON tm.team_id = t.team_id
+        LEFT JOIN team_stats s ON s.team_id = t.team_id
         ORDER BY t.department, t.name
-    """).fetchall()
-    write_csv(os.path.join(OUTPUT_DIR, "teams.csv"), ["team_id", "org_id", "name", "department", "created_at", "member_count"], rows)
+    """),
 
     # Team memberships
-    rows = conn.execute("""
+    ("team_memberships.csv",
+     ["membership_id", "team_id", "user_id", "role", "joined_at", "user_name", "team_name"],
+     """
         SELECT tm.id, tm.team_id, tm.user_id, tm.role, tm.joined_at,
                u.full_name AS user_name, t.name AS team_name
         FROM team_memberships tm
         JOIN users u ON u.user_id = tm.user_id
         JOIN teams t ON t.team_id = tm.team_id
         ORDER BY t.name, u.full_name
-    """).fetchall()
-    write_csv(os.path.join(OUTPUT_DIR, "team_memberships.csv"),
-              ["membership_id", "team_id", "user_id", "role", "joined_at", "user_name", "team_name"], rows)
+    """),
 
     # Projects
-    rows = conn.execute("""
+    ("projects.csv",
+     ["project_id", "team_id", "owner_id", "name", "project_type", "status", "created_at", "due_date", "team_name", "owner_name", "owner_email"],
+     """
         SELECT p.project_id, p.team_id, p.owner_id, p.name, p.project_type, p.status,
                p.created_at, p.due_date, t.name AS team_name, u.full_name AS owner_name, u.email AS owner_email
         FROM projects p
         JOIN teams t ON t.team_id = p.team_id
         LEFT JOIN users u ON u.user_id = p.owner_id
         ORDER BY p.project_type, p.name
-    """).fetchall()
-    write_csv(os.path.join(OUTPUT_DIR, "projects.csv"),
-              ["project_id", "team_id", "owner_id", "name", "project_type", "status", "created_at", "due_date", "team_name", "owner_name", "owner_email"], rows)
+    """),
 
     # Sections
-    rows = conn.execute("""
+    ("sections.csv",
+     ["section_id", "project_id", "name", "order_index", "created_at", "project_name"],
+     """
         SELECT s.section_id, s.project_id, s.name, s.order_index, s.created_at, p.name AS project_name
         FROM sections s
         JOIN projects p ON p.project_id = s.project_id
         ORDER BY p.name, s.order_index
-    """).fetchall()
-    write_csv(os.path.join(OUTPUT_DIR, "sections.csv"), ["section_id", "project_id", "name", "order_index", "created_at", "project_name"], rows)
+    """),
 
     # Tasks
-    rows = conn.execute("""
+    ("tasks.csv",
+     ["task_id", "project_id", "section_id", "parent_task_id", "assignee_id", "name", "description",
+                       "completed", "priority", "due_date", "created_at", "completed_at", "project_name", "section_name", "assignee_name", "assignee_email"],
+     """
         SELECT t.task_id, t.project_id, t.section_id, t.parent_task_id, t.assignee_id,
                t.name, t.description, t.completed, t.priority, t.due_date, t.created_at, t.completed_at,
                p.name AS project_name, s.name AS section_name, u.full_name AS assignee_name, u.email AS assignee_email
@@ -104,24 +102,138 @@ def main() -> None:
         LEFT JOIN sections s ON s.section_id = t.section_id
         LEFT JOIN users u ON u.user_id = t.assignee_id
         ORDER BY t.created_at
-    """).fetchall()
-    write_csv(os.path.join(OUTPUT_DIR, "tasks.csv"),
-              ["task_id", "project_id", "section_id", "parent_task_id", "assignee_id", "name", "description",
-               "completed", "priority", "due_date", "created_at", "completed_at", "project_name", "section_name", "assignee_name", "assignee_email"], rows)
+    """),
 
     # Comments
-    rows = conn.execute("""
+    ("comments.csv",
+     ["comment_id", "task_id", "author_id", "content", "created_at", "author_name", "task_name"],
+     """
         SELECT c.comment_id, c.task_id, c.author_id, c.content, c.created_at,
                u.full_name AS author_name, t.name AS task_name
         FROM comments c
         JOIN users u ON u.user_id = c.author_id
         JOIN tasks t ON t.task_id = c.task_id
         ORDER BY c.created_at
-    """).fetchall()
-    write_csv(os.path.join(OUTPUT_DIR, "comments.csv"), ["comment_id", "task_id", "author_id", "content", "created_at", "author_name", "task_name"], rows)
+    """),
+]
+
+
+def iter_rows(cursor: sqlite3.Cursor, chunk_size: int = CHUNK_SIZE):
+    """Yield chunks of rows from a cursor so only one chunk is in memory at a time."""
+    while True:
+        chunk = cursor.fetchmany(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv(path: str, headers: list[str], cursor: sqlite3.Cursor) -> dict:
+    """Stream the rows of an executed query to a CSV file and return its row count, size and time."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    start = time.perf_counter()
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for chunk in iter_rows(cursor):
+            writer.writerows(chunk)
+            count += len(chunk)
+    return {"file": os.path.basename(path), "path": path, "rows": count, "bytes": os.path.getsize(path),
+            "seconds": round(time.perf_counter() - start, 4)}
+
+
+def export_file(spec: tuple, db_path: str = None, conn: sqlite3.Connection = None) -> dict:
+    """
+    Export one EXPORTS entry to OUTPUT_DIR, over conn or a new read-only
+    connection to db_path. Returns the file's stats.
+    """
+    name, headers, query = spec
+    own_conn = conn is None
+    conn = conn or connect_readonly(db_path)
+    try:
+        return write_csv(os.path.join(OUTPUT_DIR, name), headers, conn.execute(query))
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def _export_worker(args: tuple) -> dict:
+    spec, db_path = args
+    return export_file(spec, db_path)
+
+
+def print_file(stats: dict) -> None:
+    seconds = max(stats["seconds"], 1e-9)
+    megabytes = stats["bytes"] / 1e6
+    print(f"Wrote {stats['path']}: {stats['rows']:,} rows, {megabytes:,.1f} MB in {stats['seconds']:.2f}s "
+          f"({stats['rows'] / seconds:,.0f} rows/s, {megabytes / seconds:,.1f} MB/s)")
+
+
+def check_stats_tables(db_path: str) -> None:
+    """Fail with a clear message if the database predates the summary tables."""
+    conn = connect_readonly(db_path)
+    try:
+        present = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conn.close()
+    missing = [table for table in STATS_TABLES if table not in present]
+    if missing:
+        raise RuntimeError(f"{db_path} has no {', '.join(missing)} table(s); it was generated by an older "
+                           f"version. Regenerate it with 'python src/main.py'.")
+
+
+def export_all(db_path: str, workers: int = 1) -> list[dict]:
+    """
+    Export every table to OUTPUT_DIR and return per-file stats.
+
+    With more than one worker, files are exported concurrently by a process
+    pool, each worker reading through its own read-only connection. Readers
+    only take shared locks, so they never block each other, and the total time
+    is bounded by the largest file rather than the sum of all of them.
+    """
+    check_stats_tables(db_path)
+    if workers <= 1:
+        conn = connect_readonly(db_path)
+        try:
+            results = []
+            for spec in EXPORTS:
+                results.append(export_file(spec, conn=conn))
+                print_file(results[-1])
+            return results
+        finally:
+            conn.close()
+
+    # Largest exports first, so they do not start last and finish late
+    order = sorted(EXPORTS, key=lambda spec: EXPORT_WEIGHTS.get(spec[0], 0), reverse=True)
+    results = {}
+    with Pool(min(workers, len(EXPORTS))) as pool:
+        for stats in pool.imap_unordered(_export_worker, [(spec, db_path) for spec in order]):
+            print_file(stats)
+            results[stats["file"]] = stats
+    return [results[spec[0]] for spec in EXPORTS]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Export Asana seed data to CSV files.")
+    parser.add_argument("--workers", type=int, default=EXPORT_WORKERS,
+                        help=f"files exported concurrently, each over its own read-only connection "
+                             f"(default: {EXPORT_WORKERS})")
+    parser.add_argument("--metrics-out", metavar="PATH", help="write export timing and row counts as JSON")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(DB_PATH):
+        raise FileNotFoundError(f"Database not found at {DB_PATH}. Run 'python src/main.py' first.")
+
+    print(f"Exporting data for {COMPANY_NAME} with {args.workers} worker(s)...\n")
+
+    recorder = StageRecorder()
+    with recorder.stage("export") as record:
+        files = export_all(DB_PATH, args.workers)
+        record["rows"] = sum(stats["rows"] for stats in files)
 
-    conn.close()
-    print("\nDone. CSVs are in the output/ folder.")
+    if args.metrics_out:
+        recorder.write_json(args.metrics_out, output_dir=OUTPUT_DIR, workers=args.workers, files=files)
+    print(f"\nDone. CSVs are in the {OUTPUT_DIR}/ folder.")
 
 
 if __name__ == "__main__":
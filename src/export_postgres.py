@@ -0,0 +1,123 @@
+"""Export the generated database as a PostgreSQL bulk-load bundle.
+
+Writes every table in COPY text format, in foreign-key dependency order,
+with DDL that creates the tables bare and adds keys, references and indexes
+after the load, a psql load script and a manifest with row counts and
+SHA-256 checksums (see utils/postgres.py).
+
+Usage:
+    python src/export_postgres.py [--out DIR] [--workers N] [--metrics-out PATH]
+    python src/export_postgres.py --validate output/postgres
+    cd output/postgres && psql -d asana -f load.sql
+"""
+import argparse
+import os
+import sys
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import DB_PATH, COMPANY_NAME, POSTGRES_DIR, EXPORT_WORKERS  # type: ignore
+from utils.metrics import StageRecorder  # type: ignore
+from utils.db import connect_readonly  # type: ignore
+from utils.postgres import (read_tables, index_definitions, write_copy, write_bundle_sql,  # type: ignore
+                            write_manifest, validate_bundle, COPY_SUFFIX)
+
+
+def copy_path(directory, table):
+    return os.path.join(directory, table["name"] + COPY_SUFFIX)
+
+
+def _copy_worker(args):
+    table, db_path, directory = args
+    conn = connect_readonly(db_path)
+    try:
+        return write_copy(conn, table, copy_path(directory, table))
+    finally:
+        conn.close()
+
+
+def print_file(stats):
+    seconds = max(stats["seconds"], 1e-9)
+    megabytes = stats["bytes"] / 1e6
+    print(f"Wrote {stats['file']}: {stats['rows']:,} rows, {megabytes:,.1f} MB in {stats['seconds']:.2f}s "
+          f"({stats['rows'] / seconds:,.0f} rows/s, {megabytes / seconds:,.1f} MB/s)")
+
+
+def export_bundle(db_path, directory, workers=1):
+    """
+    Write the bundle for db_path into directory.
+
+    With more than one worker, COPY files are written concurrently, each over
+    its own read-only connection, largest table first.
+
+    Returns:
+        tuple: (per-file stats in load order, manifest path)
+    """
+    os.makedirs(directory, exist_ok=True)
+    conn = connect_readonly(db_path)
+    try:
+        tables = read_tables(conn)
+        indexes = index_definitions(conn)
+        sizes = {table["name"]: conn.execute(f"SELECT MAX(rowid) FROM {table['name']}").fetchone()[0] or 0
+                 for table in tables}
+        if workers <= 1:
+            files = []
+            for table in tables:
+                files.append(write_copy(conn, table, copy_path(directory, table)))
+                print_file(files[-1])
+    finally:
+        conn.close()
+
+    if workers > 1:
+        order = sorted(tables, key=lambda table: sizes[table["name"]], reverse=True)
+        done = {}
+        with Pool(min(workers, len(tables))) as pool:
+            for stats in pool.imap_unordered(_copy_worker, [(table, db_path, directory) for table in order]):
+                print_file(stats)
+                done[stats["table"]] = stats
+        files = [done[table["name"]] for table in tables]
+
+    sql_paths = write_bundle_sql(directory, tables, indexes)
+    manifest = write_manifest(directory, tables, files, sql_paths, source=os.path.basename(db_path),
+                              indexes=[name for name, _, _ in indexes])
+    return files, manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the database as a PostgreSQL COPY bundle.")
+    parser.add_argument("--out", default=POSTGRES_DIR, help=f"bundle directory (default: {POSTGRES_DIR})")
+    parser.add_argument("--workers", type=int, default=EXPORT_WORKERS,
+                        help=f"COPY files written concurrently (default: {EXPORT_WORKERS})")
+    parser.add_argument("--validate", metavar="DIR",
+                        help="check an existing bundle against its manifest instead of exporting")
+    parser.add_argument("--metrics-out", metavar="PATH", help="write export timing and row counts as JSON")
+    args = parser.parse_args(argv)
+
+    if args.validate:
+        print(f"Validating {args.validate}...")
+        errors = validate_bundle(args.validate)
+        for error in errors:
+            print(f"  {error}")
+        if errors:
+            sys.exit(f"Bundle is invalid ({len(errors)} problem(s))")
+        print("Bundle is valid: every COPY file parses and matches the manifest.")
+        return
+
+    if not os.path.exists(DB_PATH):
+        raise FileNotFoundError(f"Database not found at {DB_PATH}. Run 'python src/main.py' first.")
+
+    print(f"Exporting PostgreSQL bundle for {COMPANY_NAME} with {args.workers} worker(s)...\n")
+    recorder = StageRecorder()
+    with recorder.stage("export_postgres") as record:
+        files, manifest = export_bundle(DB_PATH, args.out, args.workers)
+        record["rows"] = sum(stats["rows"] for stats in files)
+
+    if args.metrics_out:
+        recorder.write_json(args.metrics_out, output_dir=args.out, workers=args.workers, files=files)
+    print(f"\nDone. Bundle is in {args.out}/ (manifest: {os.path.basename(manifest)}).")
+    print(f"Load it with: cd {args.out} && psql -d DATABASE -f load.sql")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Custom field generator module.
+Creates per-project custom field definitions and the task values for them.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ids import IdAllocator
+from utils.dates import to_epoch, format_date, SECONDS_PER_DAY
+from generators.tags import TASK_ID, TASK_CREATED_AT
+from config import CUSTOM_FIELDS, CUSTOM_FIELDS_PER_PROJECT, CUSTOM_FIELD_FILL_RATE
+
+FIELD_NAMES = list(CUSTOM_FIELDS)
+CUSTOMER_NAMES = ["Acme Corp", "TechStart Inc", "Global Systems", "Northwind", "Initech", "Umbrella Co"]
+
+
+def generate_field_definitions(rng, project_index, project):
+    """
+    Build the custom field definitions for one project.
+
+    Methodology:
+    - Each project picks CUSTOM_FIELDS_PER_PROJECT distinct fields from CUSTOM_FIELDS
+    - Definitions are created with the project
+
+    Returns:
+        list: (field_id, field_type, options) for each definition, in row order
+        list: custom_field_definitions rows
+    """
+    ids = IdAllocator("custom_field", block=project_index)
+    low, high = CUSTOM_FIELDS_PER_PROJECT
+    names = rng.sample(FIELD_NAMES, rng.randint(low, min(high, len(FIELD_NAMES))))
+    fields = []
+    rows = []
+    for name in names:
+        field_type, options = CUSTOM_FIELDS[name]
+        field_id = ids.next()
+        fields.append((field_id, field_type, options))
+        rows.append((field_id, project["project_id"], name, field_type, project["created_at"]))
+    return fields, rows
+
+
+def _field_value(rng, field_type, options, created):
+    if field_type == "enum":
+        return rng.choice(options)
+    if field_type == "number":
+        return str(rng.randint(1, 100))
+    if field_type == "date":
+        return format_date(created + rng.randint(1, 90) * SECONDS_PER_DAY)
+    return rng.choice(CUSTOMER_NAMES)
+
+
+def generate_field_values(rng, project_index, fields, task_rows):
+    """
+    Yield custom_field_values rows for one project's tasks.
+
+    Methodology:
+    - Every task (and subtask) gets a value for each field with CUSTOM_FIELD_FILL_RATE
+    - Values are set when the task is created
+    """
+    if not fields:
+        return
+    ids = IdAllocator("custom_field_value", block=project_index)
+    draw = rng.random
+    has_dates = any(field_type == "date" for _, field_type, _ in fields)
+    for row in task_rows:
+        task_id, created_at = row[TASK_ID], row[TASK_CREATED_AT]
+        # Parsed once per task, and only when a date value can be drawn
+        created = to_epoch(created_at) if has_dates else None
+        for field_id, field_type, options in fields:
+            if draw() < CUSTOM_FIELD_FILL_RATE:
+                yield (ids.next(), task_id, field_id, _field_value(rng, field_type, options, created),
+                       created_at)
@@ -0,0 +1,150 @@
+"""
+Activity event generator module.
+Turns the rows generated for each project into time-ordered task events
+(created, assigned, commented, completed) for stream_events.py.
+
+Events come from the same per-project task generation as the tables, so
+their rates and timings are those of generate_tasks: COMPLETION_RATE of tasks
+get a task.completed event 1-30 days after creation, COMMENT_CHANCE get a
+comment.added event 1-72 hours after creation, and so on.
+"""
+import sys
+import os
+import json
+import math
+from operator import itemgetter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db import TABLE_COLUMNS
+from utils.dates import reference_now, format_datetime, SECONDS_PER_DAY
+from utils.budget import rows_per_project
+from config import UNASSIGNED_RATE, COMPLETION_RATE
+
+# Event types, in the order events with the same timestamp are emitted
+EVENT_TYPES = ("task.created", "task.assigned", "comment.added", "task.completed")
+CREATED, ASSIGNED, COMMENTED, COMPLETED = range(len(EVENT_TYPES))
+
+_ORDER = itemgetter(0, 1)  # Timestamp, then type (a task is created before it is assigned)
+
+# Days before and after the reference time that event times fall in (tasks are created
+# 150-5 days before it and completed up to 30 days later); only used to balance windows
+EVENT_SPAN_DAYS = (150, 30)
+# Time strings sort chronologically, so windows are compared as strings; these bound any time
+_FIRST, _LAST = "", "~"
+
+_TASK = {name: TABLE_COLUMNS["tasks"].index(name) for name in TABLE_COLUMNS["tasks"]}
+_COMMENT = {name: TABLE_COLUMNS["comments"].index(name) for name in TABLE_COLUMNS["comments"]}
+
+
+class _JsonCache(dict):
+    """JSON text of repeated values (names, dates, section IDs), encoded once."""
+
+    def __missing__(self, value):
+        text = self[value] = json.dumps(value)
+        return text
+
+
+def project_events(tables, cache=None, window=(_FIRST, _LAST)):
+    """
+    Build the events of one project's rows (from generate_project_rows).
+
+    Bodies are pre-encoded JSON object members, so emitting an event only
+    adds its sequence number and time.
+
+    Args:
+        window: (first, end) time strings; only events at first <= time < end are built
+
+    Returns:
+        list: (time, type index, body) per event, in generation order
+    """
+    first, end = window
+    enc = cache if cache is not None else _JsonCache()
+    dumps = json.dumps
+    t = _TASK
+    events = []
+    task_ids = {}  # Unique IDs are encoded per project, not kept in the shared cache
+    for row in tables["tasks"]:
+        task_id = task_ids[row[t["task_id"]]] = dumps(row[t["task_id"]])
+        created_at = row[t["created_at"]]
+        completed_at = row[t["completed_at"]]
+        if row[t["completed"]] and first <= completed_at < end:
+            completion = (completed_at, COMPLETED,
+                          f'"type":"task.completed","task_id":{task_id},"section_id":{enc[row[t["section_id"]]]}')
+        else:
+            completion = None
+        if not first <= created_at < end:
+            if completion:
+                events.append(completion)
+            continue
+        events.append((created_at, CREATED,
+                       f'"type":"task.created","task_id":{task_id},"project_id":{enc[row[t["project_id"]]]},'
+                       f'"section_id":{enc[row[t["section_id"]]]},"parent_task_id":{task_ids.get(row[t["parent_task_id"]], "null")},'
+                       f'"name":{enc[row[t["name"]]]},"priority":{enc[row[t["priority"]]]},'
+                       f'"due_date":{enc[row[t["due_date"]]]}'))
+        if row[t["assignee_id"]] is not None:
+            events.append((created_at, ASSIGNED,
+                           f'"type":"task.assigned","task_id":{task_id},"assignee_id":{enc[row[t["assignee_id"]]]}'))
+        if completion:
+            events.append(completion)
+    c = _COMMENT
+    for row in tables["comments"]:
+        if not first <= row[c["created_at"]] < end:
+            continue
+        events.append((row[c["created_at"]], COMMENTED,
+                       f'"type":"comment.added","comment_id":{dumps(row[c["comment_id"]])},'
+                       f'"task_id":{task_ids[row[c["task_id"]]]},"author_id":{enc[row[c["author_id"]]]},'
+                       f'"content":{enc[row[c["content"]]]}'))
+    return events
+
+
+def events_per_project():
+    """Expected events per project, from the config rates."""
+    rows = rows_per_project()
+    # Every task (and subtask) is created, most are assigned and some completed; one event per comment
+    return rows["tasks"] * (2 - UNASSIGNED_RATE + COMPLETION_RATE) + rows["comments"]
+
+
+def event_windows(num_projects, max_events):
+    """
+    Split the event timeline into windows of about max_events events each.
+
+    Returns:
+        list: (first, end) time strings per window, in time order, together covering every time
+    """
+    count = max(1, math.ceil(num_projects * events_per_project() / max_events))
+    before, after = EVENT_SPAN_DAYS
+    start, span = reference_now() - before * SECONDS_PER_DAY, (before + after) * SECONDS_PER_DAY
+    bounds = [format_datetime(start + span * w // count) for w in range(1, count)]
+    return list(zip([_FIRST] + bounds, bounds + [_LAST]))
+
+
+def build_events(dataset, num_projects, windows=None):
+    """
+    Events of the first num_projects projects of a VirtualDataset, in time order.
+
+    Methodology:
+    - Task times do not depend on the project, so every project has events
+      all over the timeline; the timeline is cut into windows of about
+      max_events events (event_windows) and each window is one pass over the
+      projects that keeps only the events inside it
+    - A pass generates only the task and comment rows, a batch of projects
+      per task engine call, and builds bodies only for events in the window
+    - A window's events are sorted by timestamp, then by type (a task is
+      created before it is assigned); the sort is stable, so ties stay in
+      project and generation order whatever the number of windows
+    - Memory is bounded by one window; streaming starts after the first pass,
+      and each further window pauses the stream for one more pass
+
+    Args:
+        windows: Time windows from event_windows (default: one window with every event)
+
+    Returns:
+        iterator: (time, type index, body) per event
+    """
+    for window in windows or [(_FIRST, _LAST)]:
+        cache = _JsonCache()
+        events = []
+        for tables in dataset.project_task_batches(0, num_projects):
+            events.extend(project_events(tables, cache, window))
+        events.sort(key=_ORDER)
+        yield from events
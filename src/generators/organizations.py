@@ -6,23 +6,25 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.helpers import gen_id
+from utils.ids import IdAllocator
 from config import COMPANY_NAME, COMPANY_DOMAIN
 
 
-def generate_organization(cursor):
+def generate_organization(writer, name=COMPANY_NAME, domain=COMPANY_DOMAIN):
     """
     Generate the organization (top-level container).
     
     Returns:
         org_id: The generated organization ID
     """
-    org_id = gen_id()
+    org_id = IdAllocator("organization").next()
     
-    cursor.execute("""
-        INSERT INTO organizations (org_id, name, domain, created_at)
-        VALUES (?, ?, ?, ?)
-    """, (org_id, COMPANY_NAME, COMPANY_DOMAIN, "2018-03-15 00:00:00"))
+    writer.add("organizations", (org_id, name, domain, "2018-03-15 00:00:00"))
     
-    print(f"Created organization: {COMPANY_NAME}")
+    print(f"Created organization: {name}")
     return org_id
+
+
+def load_organization(conn):
+    """Load the organization ID from an existing database."""
+    return conn.execute("SELECT org_id FROM organizations ORDER BY rowid LIMIT 1").fetchone()[0]
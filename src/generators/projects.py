@@ -4,23 +4,55 @@ Creates projects with various types and statuses.
 """
 import sys
 import os
-import random
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from faker import Faker
-from utils.helpers import gen_id
-from utils.dates import random_date, parse_datetime, add_days, to_date_only
+from faker.providers.company.en_US import Provider as CompanyProvider
+from utils.ids import IdAllocator
+from utils.dates import random_epoch, format_datetime, format_date, SECONDS_PER_DAY
+from utils.keyed import KeyedStream, consistent_choice
+from models.entities import EntityStore
 from config import NUM_PROJECTS
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
-
 PROJECT_TYPES = ["sprint", "kanban", "campaign", "operations"]
 PROJECT_STATUSES = ["active", "active", "active", "completed", "on_hold"]  # Weighted towards active
 
+# Faker's catch-phrase word lists (what fake.bs() joins), drawn with keyed draws instead
+BS_WORDS = CompanyProvider.bsWords
+
+
+def new_project_store():
+    """Empty store with the project columns later stages use."""
+    return EntityStore(("project_id", "team_id", "department", "project_type", "created_at"),
+                       coded=("department", "project_type", "created_at"))
+
+
+def project_row(project_id, draws, teams, members_by_team):
+    """
+    Draw one project from its keyed draws.
+    
+    Args:
+        teams: Teams store (team_id, department)
+        members_by_team: Mapping of team_id to member user_ids (anything with get())
+    
+    Returns:
+        tuple: (projects row, team record)
+    """
+    team = teams[draws.below(len(teams))]
+    project_type = draws.choice(PROJECT_TYPES)
+    
+    # Get a team member as owner (consistent hashing, so new members only take the projects they win)
+    owner_id = consistent_choice(members_by_team.get(team["team_id"]) or ()).choose(draws.bits())
+    
+    bs = " ".join(draws.choice(words) for words in BS_WORDS)
+    name = f"{team['department']} - {bs.title()}"[:50]
+    created = random_epoch(180, 10, draws)
+    due_date = format_date(created + draws.randint(30, 90) * SECONDS_PER_DAY)
+    
+    return (project_id, team["team_id"], owner_id, name, project_type, draws.choice(PROJECT_STATUSES),
+            format_datetime(created), due_date), team
+
 
-def generate_projects(cursor, teams):
+def generate_projects(writer, teams, members_by_team):
     """
     Generate projects assigned to teams.
     
@@ -28,42 +60,39 @@ def generate_projects(cursor, teams):
     - Projects distributed across teams
     - Project types: sprint (30%), kanban (25%), campaign (25%), operations (20%)
     - Status: 60% active, 20% completed, 20% on_hold
+    - Owner: a random member of the project's team, picked by consistent
+      hashing over the members (utils.keyed.ConsistentChoice)
+    - Each project is a keyed draw for its index (see project_row)
     
     Returns:
-        list: List of project dictionaries
+        EntityStore: Projects (project_id, team_id, department, project_type, created_at)
     """
     print(f"Creating {NUM_PROJECTS} projects...")
     
-    projects = []
+    projects = new_project_store()
+    stream = KeyedStream("project")
+    ids = IdAllocator("project")
     
-    for i in range(NUM_PROJECTS):
-        team = random.choice(teams)
-        project_id = gen_id()
-        project_type = random.choice(PROJECT_TYPES)
-        
-        # Get a team member as owner
-        cursor.execute("SELECT user_id FROM team_memberships WHERE team_id = ? LIMIT 1", 
-                      (team["team_id"],))
-        row = cursor.fetchone()
-        owner_id = row[0] if row else None
+    for i, project_id in enumerate(ids.take(NUM_PROJECTS)):
+        row, team = project_row(project_id, stream.at(i), teams, members_by_team)
+        writer.add("projects", row)
         
-        name = f"{team['department']} - {fake.bs().title()}"[:50]
-        created_at = random_date(180, 10)
-        due_date = to_date_only(add_days(created_at, random.randint(30, 90)))
-        
-        cursor.execute("""
-            INSERT INTO projects (project_id, team_id, owner_id, name, project_type, status, created_at, due_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (project_id, team["team_id"], owner_id, name, project_type,
-              random.choice(PROJECT_STATUSES), created_at, due_date))
-        
-        projects.append({
-            "project_id": project_id,
-            "team_id": team["team_id"],
-            "department": team["department"],
-            "project_type": project_type,
-            "created_at": created_at
-        })
+        project_id, team_id, _, _, project_type, _, created_at, _ = row
+        projects.append(project_id, team_id, team["department"], project_type, created_at)
     
     print(f"  Created {len(projects)} projects")
     return projects
+
+
+def load_projects(conn):
+    """Load projects from an existing database (same shape as generate_projects)."""
+    rows = conn.execute("""
+        SELECT p.project_id, p.team_id, t.department, p.project_type, p.created_at
+        FROM projects p
+        JOIN teams t ON t.team_id = p.team_id
+        ORDER BY p.rowid
+    """)
+    projects = new_project_store()
+    for row in rows:
+        projects.append(*row)
+    return projects
@@ -6,11 +6,20 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.helpers import gen_id
+from models.entities import GroupedIds
+from utils.ids import IdAllocator
 from config import SECTION_TEMPLATES
 
 
-def generate_sections(cursor, projects):
+def section_rows(project_index, project):
+    """Sections rows of one project (IDs come from the project's own ID block)."""
+    ids = IdAllocator("section", block=project_index)
+    sections = SECTION_TEMPLATES.get(project["project_type"], SECTION_TEMPLATES["default"])
+    return [(ids.next(), project["project_id"], section_name, idx, project["created_at"])
+            for idx, section_name in enumerate(sections)]
+
+
+def generate_sections(writer, projects):
     """
     Generate sections for each project based on project type.
     
@@ -20,24 +29,28 @@ def generate_sections(cursor, projects):
     - Campaign projects: Planning, In Progress, Review, Launched
     
     Returns:
-        dict: Mapping of project_id to list of section_ids
+        GroupedIds: Section IDs per project, by position in projects
     """
     print("Creating sections...")
     
-    project_sections = {}
+    project_sections = GroupedIds()
     
-    for project in projects:
-        sections = SECTION_TEMPLATES.get(project["project_type"], SECTION_TEMPLATES["default"])
-        section_ids = []
-        
-        for idx, section_name in enumerate(sections):
-            section_id = gen_id()
-            cursor.execute("""
-                INSERT INTO sections (section_id, project_id, name, order_index, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (section_id, project["project_id"], section_name, idx, project["created_at"]))
-            section_ids.append(section_id)
-        
-        project_sections[project["project_id"]] = section_ids
+    for project_index, project in enumerate(projects):
+        rows = section_rows(project_index, project)
+        writer.add_many("sections", rows)
+        project_sections.append_group([row[0] for row in rows])
     
     return project_sections
+
+
+def load_sections(conn, projects):
+    """Load section IDs per project from an existing database (same shape as generate_sections)."""
+    by_project = {project_id: [] for project_id in projects.column("project_id")}
+    for project_id, section_id in conn.execute(
+            "SELECT project_id, section_id FROM sections ORDER BY project_id, order_index"):
+        if project_id in by_project:
+            by_project[project_id].append(section_id)
+    project_sections = GroupedIds()
+    for section_ids in by_project.values():
+        project_sections.append_group(section_ids)
+    return project_sections
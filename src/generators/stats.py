@@ -0,0 +1,74 @@
+"""
+Summary table generator module.
+Writes the per-user and per-team counters that the generators keep while
+creating memberships, tasks and comments, so exports need no aggregation.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db import TABLE_COLUMNS
+
+# Positions of the columns counted per user
+TASK_ASSIGNEE = TABLE_COLUMNS["tasks"].index("assignee_id")
+TASK_COMPLETED = TABLE_COLUMNS["tasks"].index("completed")
+COMMENT_AUTHOR = TABLE_COLUMNS["comments"].index("author_id")
+
+
+def count_user_activity(task_rows, comment_rows, counts=None):
+    """
+    Add one project's task and comment rows to per-user counters.
+
+    Returns:
+        dict: user_id -> [tasks_assigned, tasks_completed, comments_authored]
+    """
+    counts = {} if counts is None else counts
+    for row in task_rows:
+        user_id = row[TASK_ASSIGNEE]
+        if user_id is not None:
+            entry = counts.get(user_id)
+            if entry is None:
+                entry = counts[user_id] = [0, 0, 0]
+            entry[0] += 1
+            if row[TASK_COMPLETED]:
+                entry[1] += 1
+    for row in comment_rows:
+        user_id = row[COMMENT_AUTHOR]
+        entry = counts.get(user_id)
+        if entry is None:
+            entry = counts[user_id] = [0, 0, 0]
+        entry[2] += 1
+    return counts
+
+
+def merge_user_activity(totals, counts):
+    """Add per-project counters (from count_user_activity) into run totals."""
+    for user_id, (assigned, completed, comments) in counts.items():
+        entry = totals.get(user_id)
+        if entry is None:
+            totals[user_id] = [assigned, completed, comments]
+        else:
+            entry[0] += assigned
+            entry[1] += completed
+            entry[2] += comments
+    return totals
+
+
+def generate_team_stats(writer, teams, members_by_team):
+    """Write one team_stats row per team (member_count)."""
+    for team_id in teams.column("team_id"):
+        writer.add("team_stats", (team_id, len(members_by_team.get(team_id, []))))
+
+
+def generate_user_stats(writer, users, team_counts, activity):
+    """
+    Write one user_stats row per user.
+
+    Args:
+        team_counts: Teams per user, by position in the users store
+        activity: user_id -> [tasks_assigned, tasks_completed, comments_authored]
+    """
+    no_activity = (0, 0, 0)
+    for user_id, team_count in zip(users.column("user_id"), team_counts):
+        assigned, completed, comments = activity.get(user_id, no_activity)
+        writer.add("user_stats", (user_id, team_count, assigned, completed, comments))
@@ -0,0 +1,75 @@
+"""
+Tag generator module.
+Creates the organization's tags and the task-tag associations.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db import TABLE_COLUMNS
+from utils.ids import IdAllocator
+from utils.dates import random_date
+from utils.keyed import KeyedStream
+from config import TAG_NAMES, TAG_COLORS, TAG_CHANCE, TAGS_PER_TASK
+
+# Positions of the task columns used for associations
+TASK_ID = TABLE_COLUMNS["tasks"].index("task_id")
+TASK_CREATED_AT = TABLE_COLUMNS["tasks"].index("created_at")
+
+
+def tag_rows(org_id):
+    """Tags rows, each a keyed draw for the tag's index."""
+    stream = KeyedStream("tag")
+    ids = IdAllocator("tag")
+    rows = []
+    for t, name in enumerate(TAG_NAMES):
+        draws = stream.at(t)
+        rows.append((ids.id_for(t), org_id, name, draws.choice(TAG_COLORS), random_date(730, 200, draws)))
+    return rows
+
+
+def generate_tags(writer, org_id):
+    """
+    Generate the organization-wide tags.
+
+    Methodology:
+    - One tag per name in TAG_NAMES, with a random color
+    - Tags were created over the last two years
+
+    Returns:
+        list: Tag IDs
+    """
+    print(f"Creating {len(TAG_NAMES)} tags...")
+
+    tag_ids = []
+
+    for row in tag_rows(org_id):
+        writer.add("tags", row)
+        tag_ids.append(row[0])
+
+    return tag_ids
+
+
+def load_tags(conn):
+    """Load tag IDs from an existing database (same shape as generate_tags)."""
+    return [tag_id for (tag_id,) in conn.execute("SELECT tag_id FROM tags ORDER BY rowid")]
+
+
+def generate_task_tags(rng, task_rows, tag_ids):
+    """
+    Yield task_tags rows for one project's tasks.
+
+    Methodology:
+    - TAG_CHANCE of tasks (and subtasks) are tagged
+    - A tagged task gets TAGS_PER_TASK distinct tags, added when the task was created
+    """
+    if not tag_ids:
+        return
+    low, high = TAGS_PER_TASK
+    high = min(high, len(tag_ids))
+    draw = rng.random
+    for row in task_rows:
+        if draw() < TAG_CHANCE:
+            task_id, created_at = row[TASK_ID], row[TASK_CREATED_AT]
+            for tag_id in rng.sample(tag_ids, rng.randint(min(low, high), high)):
+                yield (task_id, tag_id, created_at)
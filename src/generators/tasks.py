@@ -5,14 +5,26 @@ Creates tasks and subtasks with realistic names and distributions.
 import sys
 import os
 import random
+from collections import deque
+from functools import partial
+from itertools import chain, islice
+from multiprocessing import Pool
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.helpers import gen_id
-from utils.dates import random_date, add_days, add_hours, to_date_only
-from utils.llm import generate_task_names_with_llm
+from utils.helpers import derive_seed, base_seed, set_base_seed
+from utils.ids import IdAllocator, configure_ids, id_settings
+from utils.keyed import consistent_choice
+from utils.dates import (random_epoch, format_datetime, format_date, reference_now, set_reference_now,
+                         SECONDS_PER_DAY, SECONDS_PER_HOUR)
+from utils.llm import prefetch_task_names
+from utils.templates import compile_templates
+from generators.tags import generate_task_tags
+from generators.custom_fields import generate_field_definitions, generate_field_values
+from generators.stats import count_user_activity, merge_user_activity
 from config import TASKS_PER_PROJECT, SUBTASK_CHANCE, COMMENT_CHANCE, COMPLETION_RATE, UNASSIGNED_RATE, USE_LLM
+from config import WORKERS, TASK_ENGINE, TASK_BATCH
 
-random.seed(42)
+LLM_NAMES_PER_REQUEST = 20
 
 # ============================================
 # TASK NAME TEMPLATES (Fallback when no LLM)
@@ -106,19 +118,189 @@ COMMENT_TEMPLATES = [
 ]
 
 
-def generate_task_name(department):
-    """Generate a realistic task name using templates."""
-    templates = TASK_TEMPLATES.get(department, TASK_TEMPLATES["default"])
-    template = random.choice(templates)
+# Templates compiled once per department (placeholder slots resolved at import)
+COMPILED_TEMPLATES = compile_templates(TASK_TEMPLATES, PLACEHOLDERS)
+
+
+def task_templates(department):
+    """Compiled templates for a department (or the default set)."""
+    return COMPILED_TEMPLATES.get(department, COMPILED_TEMPLATES["default"])
+
+
+def generate_task_names(department, count, rng=random):
+    """Generate count realistic task names for a department using templates."""
+    return task_templates(department).sample(count, rng)
+
+
+def _init_worker(reference, ids, seed):
+    """Share the parent's reference time, ID settings and seed so rows match any worker count."""
+    set_reference_now(reference)
+    configure_ids(**ids)
+    set_base_seed(seed)
+
+
+def generate_project_tasks(job):
+    """
+    Generate the task and comment rows for a single project.
+    
+    Runs in worker processes, so it only touches its arguments. All randomness
+    comes from a private RNG seeded from the project's position, and IDs come
+    from the project's own ID block, which makes the rows independent of how
+    projects are spread across workers.
+    
+    Args:
+        job: (project_index, project, section_ids, team_members, llm_names)
+    
+    Returns:
+        tuple: (task_rows, comment_rows, num_tasks, num_subtasks)
+    """
+    project_index, project, section_ids, team_members, llm_names = job
+    rng = random.Random(derive_seed(base_seed(), "tasks", project_index))
+    task_ids = IdAllocator("task", block=project_index)
+    comment_ids = IdAllocator("comment", block=project_index)
+    dept = project["department"]
+    project_id = project["project_id"]
+    
+    members = consistent_choice(team_members)
+    
+    task_rows = []
+    comment_rows = []
+    num_subtasks = 0
+    
+    # Number of tasks for this project
+    num_tasks = rng.randint(*TASKS_PER_PROJECT)
+    
+    # Task names, drawn for the whole project at once
+    if llm_names:
+        names = [rng.choice(llm_names) for _ in range(num_tasks)]
+    else:
+        names = generate_task_names(dept, num_tasks, rng)
+    
+    for task_name in names:
+        task_id = task_ids.next()
+        
+        # Completion status
+        completed = rng.random() < COMPLETION_RATE
+        
+        # Section based on completion
+        if completed:
+            section_id = section_ids[-1]  # Done section
+        else:
+            section_id = rng.choice(section_ids[:-1]) if len(section_ids) > 1 else section_ids[0]
+        
+        # Assignee: consistent hashing on 64 drawn bits, so new team members only take the tasks they win
+        assignee_id = members.choose(rng.getrandbits(64)) if team_members and rng.random() > UNASSIGNED_RATE else None
+        
+        # Timestamps (epoch seconds, formatted once for the row)
+        created = random_epoch(150, 5, rng)
+        created_at = format_datetime(created)
+        completed_at = format_datetime(created + rng.randint(1, 30) * SECONDS_PER_DAY) if completed else None
+        due_date = format_date(created + rng.randint(7, 60) * SECONDS_PER_DAY)
+        
+        task_rows.append((task_id, project_id, section_id, None, assignee_id, task_name, completed,
+                          rng.choice(["high", "medium", "low", None]), due_date, created_at, completed_at))
+        
+        # Subtasks
+        if rng.random() < SUBTASK_CHANCE:
+            for j in range(rng.randint(1, 4)):
+                task_rows.append((task_ids.next(), project_id, section_id, task_id, assignee_id,
+                                  f"Subtask {j+1}: {task_name[:30]}", completed, None, None,
+                                  created_at, completed_at))
+                num_subtasks += 1
+        
+        # Comments
+        if rng.random() < COMMENT_CHANCE and team_members:
+            comment_rows.append((comment_ids.next(), task_id, members.choose(rng.getrandbits(64)),
+                                 rng.choice(COMMENT_TEMPLATES),
+                                 format_datetime(created + rng.randint(1, 72) * SECONDS_PER_HOUR)))
+    
+    return task_rows, comment_rows, num_tasks, num_subtasks
+
+
+def generate_projects_tasks(jobs):
+    """Python task engine over a batch of jobs: generate_project_tasks for each."""
+    return [generate_project_tasks(job) for job in jobs]
+
+
+def generate_batch_rows(generate_batch, tag_ids, jobs):
+    """
+    Generate every row for a batch of projects: tasks and comments from the
+    task engine (one call for the whole batch), plus each project's custom
+    fields and the tags and field values of its tasks.
+    
+    Returns:
+        list: generate_project_rows result per job
+    """
+    return [_project_rows(tag_ids, job, tasks) for job, tasks in zip(jobs, generate_batch(jobs))]
+
+
+def generate_project_rows(generate_batch, tag_ids, job):
+    """
+    Generate every row for one project: tasks and comments from the task engine,
+    plus the project's custom fields and the tags and field values of its tasks.
     
-    for key, values in PLACEHOLDERS.items():
-        if "{" + key + "}" in template:
-            template = template.replace("{" + key + "}", random.choice(values))
+    The extra rows come from their own RNG (seeded from the project's position),
+    so they do not change the task engine's random stream. Per-user activity
+    counters for the summary tables are counted here, in the worker.
     
-    return template
+    Returns:
+        tuple: ({table: rows}, {user_id: [assigned, completed, comments]}, num_tasks, num_subtasks)
+    """
+    return generate_batch_rows(generate_batch, tag_ids, [job])[0]
+
+
+def _project_rows(tag_ids, job, tasks):
+    task_rows, comment_rows, num_tasks, num_subtasks = tasks
+    project_index, project = job[0], job[1]
+    rng = random.Random(derive_seed(base_seed(), "task_extras", project_index))
+    fields, definition_rows = generate_field_definitions(rng, project_index, project)
+    return {
+        "tasks": task_rows,
+        "comments": comment_rows,
+        "custom_field_definitions": definition_rows,
+        "custom_field_values": list(generate_field_values(rng, project_index, fields, task_rows)),
+        "task_tags": list(generate_task_tags(rng, task_rows, tag_ids)),
+    }, count_user_activity(task_rows, comment_rows), num_tasks, num_subtasks
+
+
+def imap_bounded(pool, func, jobs, chunksize, max_pending):
+    """
+    Like pool.imap, but keeps at most max_pending chunks in flight, so results
+    never pile up faster than the caller consumes them. max_pending may be a
+    callable, read before each chunk is submitted, so the limit can change
+    while the pool runs.
+    """
+    limit = max_pending if callable(max_pending) else lambda: max_pending
+    pending = deque()
+    jobs = iter(jobs)
+    while True:
+        chunk = list(islice(jobs, chunksize))
+        if not chunk:
+            break
+        pending.append(pool.map_async(func, chunk))
+        while len(pending) >= limit():
+            yield from pending.popleft().get()
+    while pending:
+        yield from pending.popleft().get()
+
+
+def get_task_engine(engine):
+    """
+    Return the batch generation function (list of jobs -> list of results) for
+    an engine name. Falls back to the Python engine when NumPy is not installed.
+    """
+    if engine == "numpy":
+        from generators.tasks_vectorized import generate_projects_tasks_vectorized, numpy_available
+        if numpy_available():
+            return generate_projects_tasks_vectorized
+        print("  NumPy is not installed, using the python task engine")
+    elif engine != "python":
+        raise ValueError(f"Unknown task engine: {engine}")
+    return generate_projects_tasks
 
 
-def generate_tasks(cursor, projects, project_sections):
+def generate_tasks(writer, projects, project_sections, members_by_team, tag_ids=(), workers=WORKERS,
+                   engine=TASK_ENGINE, governor=None):
     """
     Generate tasks for each project.
     
@@ -128,96 +310,76 @@ def generate_tasks(cursor, projects, project_sections):
     - Unassigned rate: 15% of tasks have no assignee
     - Subtask rate: 20% of tasks have subtasks
     - Comment rate: 30% of tasks have comments
+    - Custom fields, field values and task tags are generated in the same pass
+    
+    Projects are generated independently (optionally in a process pool) and
+    merged by this process in project order, so the output is the same for
+    any number of workers. The engine gets up to TASK_BATCH projects per call
+    (one pool task per batch with workers); the "numpy" engine draws the
+    attributes of a whole batch at once instead of per task. A MemoryGovernor
+    (utils/budget.py), when given, commits every few projects and sets the
+    batch size and how many batches are in flight.
     
     Returns:
-        tuple: (total_tasks, total_subtasks)
+        tuple: (total_tasks, total_subtasks, {user_id: [tasks_assigned, tasks_completed, comments_authored]})
     """
-    print("Creating tasks (this may take a moment)...")
+    print(f"Creating tasks with {workers} worker(s) (this may take a moment)...")
+    generate_batch = partial(generate_batch_rows, get_task_engine(engine), list(tag_ids))
     
     total_tasks = 0
     total_subtasks = 0
-    llm_cache = {}
+    activity = {}
     
-    for project in projects:
-        dept = project["department"]
-        project_id = project["project_id"]
-        section_ids = project_sections.get(project_id, [])
-        
-        if not section_ids:
-            continue
-        
-        # Get team members for assignment
-        cursor.execute("SELECT user_id FROM team_memberships WHERE team_id = ?", 
-                      (project["team_id"],))
-        team_members = [row[0] for row in cursor.fetchall()]
-        
-        # Number of tasks for this project
-        num_tasks = random.randint(*TASKS_PER_PROJECT)
-        
-        # Try LLM for task names (cached per department)
-        llm_names = None
-        if USE_LLM and dept not in llm_cache:
-            llm_names = generate_task_names_with_llm(dept, project["project_type"], 5)
-            if llm_names:
-                llm_cache[dept] = llm_names
-        
-        if dept in llm_cache:
-            llm_names = llm_cache[dept]
-        
-        for _ in range(num_tasks):
-            task_id = gen_id()
-            
-            # Task name
-            task_name = random.choice(llm_names) if llm_names else generate_task_name(dept)
-            
-            # Completion status
-            completed = random.random() < COMPLETION_RATE
-            
-            # Section based on completion
-            if completed:
-                section_id = section_ids[-1]  # Done section
-            else:
-                section_id = random.choice(section_ids[:-1]) if len(section_ids) > 1 else section_ids[0]
-            
-            # Assignee
-            assignee_id = random.choice(team_members) if team_members and random.random() > UNASSIGNED_RATE else None
-            
-            # Timestamps
-            created_at = random_date(150, 5)
-            completed_at = add_days(created_at, random.randint(1, 30)) if completed else None
-            due_date = to_date_only(add_days(created_at, random.randint(7, 60)))
+    # Fetch LLM task names for every department/project type up front
+    llm_names = {}
+    if USE_LLM:
+        combos = sorted(set(zip(projects.column("department"), projects.column("project_type"))))
+        llm_names = prefetch_task_names(combos, LLM_NAMES_PER_REQUEST)
+    
+    def iter_jobs():
+        # Built lazily, so only the projects in flight exist as plain dicts
+        for project_index, project in enumerate(projects):
+            section_ids = project_sections[project_index]
             
-            cursor.execute("""
-                INSERT INTO tasks (task_id, project_id, section_id, assignee_id, name, completed,
-                                   priority, due_date, created_at, completed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (task_id, project_id, section_id, assignee_id, task_name, completed,
-                  random.choice(["high", "medium", "low", None]), due_date, created_at, completed_at))
+            if not section_ids:
+                continue
             
-            total_tasks += 1
+            # Team members for assignment
+            team_members = members_by_team.get(project["team_id"], [])
             
-            # Subtasks
-            if random.random() < SUBTASK_CHANCE:
-                for j in range(random.randint(1, 4)):
-                    subtask_id = gen_id()
-                    cursor.execute("""
-                        INSERT INTO tasks (task_id, project_id, section_id, parent_task_id,
-                                           assignee_id, name, completed, created_at, completed_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (subtask_id, project_id, section_id, task_id, assignee_id,
-                          f"Subtask {j+1}: {task_name[:30]}", completed, created_at, completed_at))
-                    total_subtasks += 1
+            names = llm_names.get((project["department"], project["project_type"]))
+            yield (project_index, project.to_dict(), section_ids, team_members, names)
+    
+    if governor:
+        batch_size, max_pending = governor.plan["chunksize"], governor.pending_limit
+    elif workers > 1:
+        batch_size, max_pending = max(1, min(TASK_BATCH, len(projects) // (workers * 8))), workers * 2
+    else:
+        batch_size = TASK_BATCH
+    jobs = iter_jobs()
+    batches = iter(lambda: list(islice(jobs, batch_size)), [])
+    if workers > 1:
+        pool = Pool(workers, initializer=_init_worker, initargs=(reference_now(), id_settings(), base_seed()))
+        results = imap_bounded(pool, generate_batch, batches, chunksize=1, max_pending=max_pending)
+    else:
+        pool = None
+        results = map(generate_batch, batches)
+    
+    try:
+        for done, (tables, counts, num_tasks, num_subtasks) in enumerate(chain.from_iterable(results), 1):
+            for table, rows in tables.items():
+                writer.add_many(table, rows)
+            merge_user_activity(activity, counts)
+            total_tasks += num_tasks
+            total_subtasks += num_subtasks
+            if governor:
+                governor.project_done()
             
-            # Comments
-            if random.random() < COMMENT_CHANCE and team_members:
-                cursor.execute("""
-                    INSERT INTO comments (comment_id, task_id, author_id, content, created_at)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (gen_id(), task_id, random.choice(team_members),
-                      random.choice(COMMENT_TEMPLATES), add_hours(created_at, random.randint(1, 72))))
-        
-        if (projects.index(project) + 1) % 100 == 0:
-            print(f"  Processed {projects.index(project) + 1} projects...")
+            if done % 100 == 0:
+                print(f"  Processed {done} projects...")
+    finally:
+        if pool:
+            pool.terminate()
     
     print(f"  Created {total_tasks} tasks + {total_subtasks} subtasks")
-    return total_tasks, total_subtasks
+    return total_tasks, total_subtasks, activity
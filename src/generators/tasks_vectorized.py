@@ -0,0 +1,221 @@
+"""
+Vectorized task generator module.
+Draws every random attribute of a batch of projects' tasks at once as NumPy
+arrays, and turns them into rows with array-wide ID encoding and date
+formatting.
+
+Uses the same rates and ranges as generators/tasks.py and the same job/result
+format as generate_projects_tasks, so either engine can be plugged into
+generate_tasks. Every draw is a keyed hash of (project, task, attribute)
+rather than the next value of a generator, so a project's rows do not depend
+on which projects share its batch. The two engines use different random
+streams, so they do not produce the same rows for a given seed.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from utils.helpers import derive_seed, base_seed
+from utils.ids import encode_ids
+from utils.keyed import consistent_choice
+from utils.dates import reference_now, SECONDS_PER_DAY, SECONDS_PER_HOUR
+from config import TASKS_PER_PROJECT, SUBTASK_CHANCE, COMMENT_CHANCE, COMPLETION_RATE, UNASSIGNED_RATE
+from generators.tasks import COMMENT_TEMPLATES, task_templates
+
+PRIORITIES = ["high", "medium", "low", None]
+
+# Draw address: | project (28 bits) | task (24 bits) | attribute (8 bits) |
+_TASK_SHIFT = 8
+_PROJECT_SHIFT = 32
+_PROJECT_DRAW = (1 << 24) - 1  # Task slot of the per-project draws
+_MASK64 = (1 << 64) - 1
+
+# Attribute numbers of the per-task draws
+(COMPLETED, SECTION, ASSIGNED, ASSIGNEE, CREATED, COMPLETED_AFTER, DUE_AFTER, PRIORITY, HAS_SUBTASKS,
+ SUBTASK_COUNT, HAS_COMMENT, AUTHOR, COMMENT, COMMENT_AFTER, NAME, NAME_SLOT) = range(16)
+
+
+def numpy_available():
+    """Check whether the vectorized engine can be used."""
+    return np is not None
+
+
+class _Draws:
+    """Keyed uniform draws for arrays of (project, task) addresses."""
+
+    def __init__(self, key, projects, tasks):
+        self.base = (np.uint64(key) + (projects.astype(np.uint64) << np.uint64(_PROJECT_SHIFT)) +
+                     (tasks.astype(np.uint64) << np.uint64(_TASK_SHIFT)))
+
+    def bits(self, attribute):
+        """64-bit values: the SplitMix64 finalizer of each address (as utils.keyed.mix64)."""
+        value = self.base + np.uint64((attribute + 0x9E3779B97F4A7C15) & _MASK64)
+        value = (value ^ (value >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        value = (value ^ (value >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        value ^= value >> np.uint64(31)
+        return value
+
+    def random(self, attribute):
+        """Floats in [0, 1)."""
+        return (self.bits(attribute) >> np.uint64(11)) * (1.0 / (1 << 53))
+
+    def below(self, attribute, n):
+        """Integers in [0, n); n may be an array of per-address bounds."""
+        return (self.random(attribute) * n).astype(np.int64)
+
+
+def _ordinals(counts):
+    """0, 1, ..., count - 1 for each count, concatenated."""
+    return np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def _format_datetimes(epochs):
+    """Epoch seconds as "YYYY-MM-DD HH:MM:SS" strings (like utils.dates.format_datetime)."""
+    text = np.datetime_as_string(epochs.astype("datetime64[s]"))
+    chars = text.view(np.uint32).reshape(len(text), -1)
+    chars[:, 10] = ord(" ")
+    return text.astype(object)
+
+
+def _format_dates(epochs):
+    """Epoch seconds as "YYYY-MM-DD" strings (like utils.dates.format_date)."""
+    return np.datetime_as_string((epochs // SECONDS_PER_DAY).astype("datetime64[D]")).astype(object)
+
+
+def _flatten(lists):
+    """Concatenate per-project lists into one object array, plus each list's offset."""
+    sizes = np.array([len(values) for values in lists], dtype=np.int64)
+    flat = np.empty(int(sizes.sum()), dtype=object)
+    flat[:] = [value for values in lists for value in values]
+    return flat, np.cumsum(sizes) - sizes, sizes
+
+
+def _choose_members(jobs, row_job, bits):
+    """
+    Team member picked by each row's bits (as ConsistentChoice.choose), for
+    rows grouped by job; None where the job's team has no members.
+    """
+    picks = np.full(len(row_job), None, dtype=object)
+    bounds = np.searchsorted(row_job, np.arange(len(jobs) + 1)).tolist()
+    for j, job in enumerate(jobs):
+        start, end = bounds[j], bounds[j + 1]
+        if start == end or not job[3]:
+            continue
+        choice = consistent_choice(job[3])
+        points = np.frombuffer(choice.points, dtype=np.uint64)
+        slots = np.searchsorted(points, bits[start:end]) % len(points)
+        values = np.array(choice.values, dtype=object)
+        picks[start:end] = values[np.frombuffer(choice.owners, dtype=np.uint32)[slots]]
+    return picks
+
+
+def generate_projects_tasks_vectorized(jobs):
+    """
+    Generate the task and comment rows for a batch of projects using NumPy.
+
+    Args:
+        jobs: list of (project_index, project, section_ids, team_members, llm_names)
+
+    Returns:
+        list: (task_rows, comment_rows, num_tasks, num_subtasks) per job
+    """
+    if not jobs:
+        return []
+    key = derive_seed(base_seed(), "tasks_vectorized")
+    project_index = np.array([job[0] for job in jobs], dtype=np.int64)
+    sections, section_start, section_count = _flatten([job[2] for job in jobs])
+    member_count = np.array([len(job[3]) for job in jobs], dtype=np.int64)
+
+    # Tasks per project, then one array entry per task of the batch
+    low, high = TASKS_PER_PROJECT
+    counts = low + _Draws(key, project_index, np.full(len(jobs), _PROJECT_DRAW)).below(0, high - low + 1)
+    first_task = np.cumsum(counts) - counts
+    owner = np.repeat(np.arange(len(jobs)), counts)
+    number = _ordinals(counts)
+    draws = _Draws(key, project_index[owner], number)
+    n = len(owner)
+
+    # Draw all per-task attributes at once
+    completed = draws.random(COMPLETED) < COMPLETION_RATE
+    open_sections = np.maximum(section_count - 1, 1)[owner]
+    section_idx = np.where(completed, section_count[owner] - 1, draws.below(SECTION, open_sections))
+    has_members = member_count[owner] > 0
+    assigned = has_members & (draws.random(ASSIGNED) > UNASSIGNED_RATE)
+    created = reference_now() - (5 + draws.below(CREATED, 146)) * SECONDS_PER_DAY
+    completed_times = created + (1 + draws.below(COMPLETED_AFTER, 30)) * SECONDS_PER_DAY
+    due_times = created + (7 + draws.below(DUE_AFTER, 54)) * SECONDS_PER_DAY
+    subtask_counts = np.where(draws.random(HAS_SUBTASKS) < SUBTASK_CHANCE, 1 + draws.below(SUBTASK_COUNT, 4), 0)
+    has_comment = has_members & (draws.random(HAS_COMMENT) < COMMENT_CHANCE)
+
+    # Names: template renderings grouped by department, or LLM names per project
+    names = np.empty(n, dtype=object)
+    name_draws, slot_draws = draws.random(NAME), draws.random(NAME_SLOT)
+    by_template = {}
+    for j, job in enumerate(jobs):
+        if job[4]:
+            start = int(first_task[j])
+            picks = (name_draws[start:start + counts[j]] * len(job[4])).astype(np.int64).tolist()
+            names[start:start + counts[j]] = [job[4][i] for i in picks]
+        else:
+            by_template.setdefault(job[1]["department"], []).append(j)
+    for department, owners in by_template.items():
+        templates = task_templates(department)
+        rows = np.flatnonzero(np.isin(owner, owners))
+        names[rows] = templates.render((name_draws[rows] * len(templates)).astype(np.int64).tolist(),
+                                       slot_draws[rows].tolist())
+
+    # Resolve draws to column values
+    task_ids = np.array(encode_ids("task", project_index[owner], number), dtype=object)
+    project_ids = np.array([job[1]["project_id"] for job in jobs], dtype=object)[owner]
+    section_ids = sections[section_start[owner] + section_idx]
+    assignees = np.where(assigned, _choose_members(jobs, owner, draws.bits(ASSIGNEE)), None)
+    created_at = _format_datetimes(created)
+    completed_at = np.where(completed, _format_datetimes(completed_times), None)
+    due = _format_dates(due_times)
+    priorities = np.array(PRIORITIES, dtype=object)[draws.below(PRIORITY, len(PRIORITIES))]
+    completed_list = completed.tolist()
+
+    task_rows = list(zip(task_ids.tolist(), project_ids.tolist(), section_ids.tolist(), [None] * n,
+                         assignees.tolist(), names.tolist(), completed_list, priorities.tolist(), due.tolist(),
+                         created_at.tolist(), completed_at.tolist()))
+
+    # Subtask expansion: one entry per subtask pointing at its parent task, numbered after the tasks
+    parent = np.repeat(np.arange(n), subtask_counts)
+    subtask_owner = owner[parent]
+    subtask_numbers = (_ordinals(subtask_counts) + 1).tolist()
+    per_project_subtasks = np.bincount(subtask_owner, minlength=len(jobs))
+    subtask_ids = encode_ids("task", project_index[subtask_owner], counts[subtask_owner] + _ordinals(per_project_subtasks))
+    subtask_rows = [(subtask_id, row[1], row[2], row[0], row[4], f"Subtask {j}: {row[5][:30]}", row[6],
+                     None, None, row[9], row[10])
+                    for subtask_id, row, j in zip(subtask_ids, map(task_rows.__getitem__, parent.tolist()),
+                                                  subtask_numbers)]
+
+    # One comment on each commented task
+    commented = np.flatnonzero(has_comment)
+    comment_owner = owner[commented]
+    per_project_comments = np.bincount(comment_owner, minlength=len(jobs))
+    comment_ids = encode_ids("comment", project_index[comment_owner], _ordinals(per_project_comments))
+    authors = _choose_members(jobs, comment_owner, draws.bits(AUTHOR)[commented])
+    templates = np.array(COMMENT_TEMPLATES, dtype=object)[draws.below(COMMENT, len(COMMENT_TEMPLATES))[commented]]
+    comment_times = _format_datetimes(created[commented] + (1 + draws.below(COMMENT_AFTER, 72)[commented]) *
+                                      SECONDS_PER_HOUR)
+    comment_rows = list(zip(comment_ids, task_ids[commented].tolist(), authors.tolist(), templates.tolist(),
+                            comment_times.tolist()))
+
+    # Split the batch back into projects
+    results = []
+    task_end = np.cumsum(counts).tolist()
+    subtask_end = np.cumsum(per_project_subtasks).tolist()
+    comment_end = np.cumsum(per_project_comments).tolist()
+    task_start = subtask_start = comment_start = 0
+    for j in range(len(jobs)):
+        results.append((task_rows[task_start:task_end[j]] + subtask_rows[subtask_start:subtask_end[j]],
+                        comment_rows[comment_start:comment_end[j]],
+                        task_end[j] - task_start, subtask_end[j] - subtask_start))
+        task_start, subtask_start, comment_start = task_end[j], subtask_end[j], comment_end[j]
+    return results
@@ -4,17 +4,63 @@ Creates teams and team memberships.
 """
 import sys
 import os
-import random
+from array import array
+from heapq import nlargest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.helpers import gen_id
+from utils.ids import IdAllocator
 from utils.dates import random_date
+from utils.keyed import KeyedStream
+from models.entities import EntityStore
 from config import TEAM_NAMES
 
-random.seed(42)
+# Every team in creation order: (department, name)
+TEAMS = [(dept, name) for dept, names in TEAM_NAMES.items() for name in names]
 
 
-def generate_teams(cursor, org_id, users_by_dept):
+def draw_team_members(team_index, dept_users):
+    """
+    Choose one team's members from the users of its department.
+
+    Methodology:
+    - The team takes the 20-100 users (all of them in a smaller department)
+      with the highest keyed scores for (team, user)
+    - Scores and join dates are keyed per user, not by position, so a new
+      user either joins in place of the lowest-scored member or changes
+      nothing; the other members and their join dates stay the same
+
+    Args:
+        dept_users: Indexes of the department's users
+
+    Returns:
+        list: (user index, joined_at) per member, in user order
+    """
+    if not dept_users:
+        return []
+    num_members = min(KeyedStream("team_members").at(team_index).randint(20, 100), len(dept_users))
+    stream = KeyedStream(f"team_members/{team_index}")
+    members = []
+    for user_index in sorted(nlargest(num_members, dept_users, key=stream.bits)):
+        draws = stream.at(user_index)
+        draws.bits()  # Draw 0 is the score
+        members.append((user_index, random_date(200, 50, draws)))
+    return members
+
+
+def users_by_department(departments):
+    """Indexes of the users of each department, from the users' departments in index order."""
+    by_dept = {}
+    for user_index, dept in enumerate(departments):
+        by_dept.setdefault(dept, []).append(user_index)
+    return by_dept
+
+
+def membership_id(user_index, team_index):
+    """ID of a membership: from the member's own ID block, numbered by team."""
+    return IdAllocator("membership", block=user_index).id_for(team_index)
+
+
+def generate_teams(writer, org_id):
     """
     Generate teams organized by department.
     
@@ -23,45 +69,75 @@ def generate_teams(cursor, org_id, users_by_dept):
     - Team names follow common organizational patterns
     
     Returns:
-        list: List of team dictionaries
+        EntityStore: Teams (team_id, department)
     """
     print(f"Creating teams...")
     
-    teams = []
+    teams = new_team_store()
+    stream = KeyedStream("team")
+    ids = IdAllocator("team")
     
-    for dept, names in TEAM_NAMES.items():
-        for name in names:
-            team_id = gen_id()
-            cursor.execute("""
-                INSERT INTO teams (team_id, org_id, name, department, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (team_id, org_id, f"{dept} - {name}", dept, random_date(300, 100)))
-            teams.append({"team_id": team_id, "department": dept})
+    for t, (dept, name) in enumerate(TEAMS):
+        team_id = ids.id_for(t)
+        writer.add("teams", (team_id, org_id, f"{dept} - {name}", dept, random_date(300, 100, stream.at(t))))
+        teams.append(team_id, dept)
     
     print(f"  Created {len(teams)} teams")
     return teams
 
 
-def generate_team_memberships(cursor, teams, users_by_dept):
+def generate_team_memberships(writer, teams, users):
     """
     Assign users to teams based on their department.
     
     Methodology:
     - Users assigned to teams within their department
     - Each team gets 20-100 members (varies by availability)
+    - Members are keyed per (team, user) and membership IDs per (user, team)
+      (see draw_team_members), so adding users does not shift existing rows
+    
+    The only per-user state kept is a team count.
+    
+    Returns:
+        tuple: (dict of member user_ids by team_id, array of team counts by user position)
     """
     print("Assigning users to teams...")
     
-    for team in teams:
-        dept = team["department"]
-        dept_users = users_by_dept.get(dept, [])
+    members_by_team = {}
+    team_counts = array("H", bytes(2 * len(users)))
+    user_ids = users.column("user_id")
+    by_dept = users_by_department(users.column("department"))
+    
+    for t, team in enumerate(teams):
+        members = draw_team_members(t, by_dept.get(team["department"], []))
+        member_ids = members_by_team[team["team_id"]] = [user_ids[i] for i, _ in members]
         
-        if dept_users:
-            num_members = min(random.randint(20, 100), len(dept_users))
-            members = random.sample(dept_users, num_members)
-            
-            for user_id in members:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO team_memberships (id, team_id, user_id, role, joined_at)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (gen_id(), team["team_id"], user_id, "member", random_date(200, 50)))
+        for (i, joined_at), user_id in zip(members, member_ids):
+            writer.add("team_memberships", (membership_id(i, t), team["team_id"], user_id, "member", joined_at))
+            team_counts[i] += 1
+    
+    return members_by_team, team_counts
+
+
+def new_team_store():
+    """Empty store of teams: team_id and a coded department."""
+    return EntityStore(("team_id", "department"), coded=("department",))
+
+
+def load_teams(conn):
+    """Load teams from an existing database (same shape as generate_teams)."""
+    teams = new_team_store()
+    for team_id, dept in conn.execute("SELECT team_id, department FROM teams ORDER BY rowid"):
+        teams.append(team_id, dept)
+    return teams
+
+
+def load_team_memberships(conn, teams, users):
+    """Load the membership indexes from an existing database (same shape as generate_team_memberships)."""
+    members_by_team = {team_id: [] for team_id in teams.column("team_id")}
+    team_counts = array("H", bytes(2 * len(users)))
+    position = {user_id: i for i, user_id in enumerate(users.column("user_id"))}
+    for team_id, user_id in conn.execute("SELECT team_id, user_id FROM team_memberships ORDER BY rowid"):
+        members_by_team.setdefault(team_id, []).append(user_id)
+        team_counts[position[user_id]] += 1
+    return members_by_team, team_counts
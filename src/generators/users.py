@@ -6,52 +6,89 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from faker import Faker
-from utils.helpers import gen_id, pick_weighted
-from utils.dates import random_date
-from config import NUM_USERS, DEPARTMENTS, ROLES, ROLE_WEIGHTS, COMPANY_DOMAIN
+from itertools import accumulate
+from utils.ids import IdAllocator
+from utils.dates import random_epoch, format_datetime
+from utils.keyed import KeyedStream
+from utils.names import NamePool, EmailAllocator
+from models.entities import EntityStore
+from config import NUM_USERS, DEPARTMENTS, ROLES, ROLE_WEIGHTS, COMPANY_DOMAIN, NAME_LOCALES
 
-fake = Faker()
-Faker.seed(42)
+ROLE_CUM_WEIGHTS = list(accumulate(ROLE_WEIGHTS))
+DEPARTMENT_NAMES = list(DEPARTMENTS)
+DEPARTMENT_CUM_WEIGHTS = list(accumulate(DEPARTMENTS.values()))
 
 
-def generate_users(cursor, org_id):
+def draw_department(draws):
+    """Draw one user's department (its own keyed stream, so it can be looked up for any user)."""
+    return draws.pick(DEPARTMENT_NAMES, DEPARTMENT_CUM_WEIGHTS)
+
+
+def draw_user(draws, pool):
+    """
+    Draw one user's keyed attributes.
+
+    Returns:
+        tuple: (first_name, last_name, role, created_at)
+    """
+    first, last = pool.draw(draws)
+    role = draws.pick(ROLES, ROLE_CUM_WEIGHTS)
+    return first, last, role, format_datetime(random_epoch(365, 30, draws))
+
+
+def new_user_store():
+    """Empty store of users: user_id and a coded department."""
+    return EntityStore(("user_id", "department"), coded=("department",))
+
+
+def generate_users(writer, org_id, domain=COMPANY_DOMAIN):
     """
     Generate users with realistic department and role distributions.
     
     Methodology:
-    - Names generated via Faker library
-    - Departments distributed based on typical SaaS company ratios
+    - Names drawn from Faker's locale name lists (NAME_LOCALES)
+    - Emails are first.last@domain, numbered only when a name repeats
+    - Departments distributed based on typical SaaS company ratios, drawn
+      per user, so adding users never moves existing users between departments
     - Roles follow pyramid structure (more ICs than managers)
+    - Every attribute except the email number is a keyed draw for the user's
+      index, so user i does not depend on the users generated before it
     
     Returns:
-        tuple: (list of user dicts, dict of users by department)
+        EntityStore: Users (user_id, department)
     """
     print(f"Creating {NUM_USERS} users...")
     
-    users = []
-    users_by_dept = {dept: [] for dept in DEPARTMENTS.keys()}
-    dept_list = list(DEPARTMENTS.keys())
-    dept_weights = list(DEPARTMENTS.values())
+    users = new_user_store()
+    stream = KeyedStream("user")
+    departments = KeyedStream("department")
+    ids = IdAllocator("user")
+    pool = NamePool(NAME_LOCALES)
+    emails = EmailAllocator(domain)
+    slug = pool.slug
     
-    for i in range(NUM_USERS):
-        user_id = gen_id()
-        name = fake.name()
-        dept = pick_weighted(dept_list, dept_weights)
-        role = pick_weighted(ROLES, ROLE_WEIGHTS)
-        email = f"{name.lower().replace(' ', '.')}_{i}@{COMPANY_DOMAIN}"
-        created_at = random_date(365, 30)
-        
-        cursor.execute("""
-            INSERT INTO users (user_id, org_id, full_name, email, department, role, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (user_id, org_id, name, email, dept, role, created_at))
+    for i, user_id in enumerate(ids.take(NUM_USERS)):
+        first, last, role, created_at = draw_user(stream.at(i), pool)
+        dept = draw_department(departments.at(i))
+        email = emails.allocate(slug(first), slug(last))
         
-        user = {"user_id": user_id, "department": dept}
-        users.append(user)
-        users_by_dept[dept].append(user_id)
+        writer.add("users", (user_id, org_id, f"{first} {last}", email, dept, role, created_at))
+        users.append(user_id, dept)
         
         if (i + 1) % 1000 == 0:
             print(f"  Created {i + 1} users...")
     
-    return users, users_by_dept
+    return users
+
+
+def load_users(conn):
+    """
+    Load users from an existing database.
+    
+    Returns:
+        EntityStore: Same shape as generate_users
+    """
+    users = new_user_store()
+    for user_id, dept in conn.execute("SELECT user_id, department FROM users ORDER BY rowid"):
+        users.append(user_id, dept)
+    return users
@@ -0,0 +1,211 @@
+"""
+Virtual dataset module.
+Random access to the rows a generation run would produce, one entity at a time.
+
+Every generator takes its random values from keyed streams (utils/keyed.py),
+so user i, project j or the tasks of project k are computed directly from
+(seed, kind, index): nothing before them is generated and no database is
+written. A VirtualDataset built with a run's seed, ID mode and sizes returns
+the same rows as the generated tables, except:
+- Emails are the plain first.last address; the users table numbers repeated
+  names in creation order (first.last2), which needs every earlier user
+- Task names always come from the templates (LLM names need the API or its cache)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.helpers import set_base_seed
+from utils.ids import IdAllocator, configure_ids
+from utils.dates import random_date, set_reference_now
+from utils.keyed import KeyedStream
+from utils.names import NamePool
+from utils.shards import org_seed, org_identities
+from generators.users import draw_user, draw_department
+from generators.teams import TEAMS, draw_team_members, users_by_department, membership_id, new_team_store
+from generators.projects import project_row
+from generators.sections import section_rows
+from generators.tags import tag_rows
+from generators.tasks import generate_project_rows, get_task_engine
+from config import SEED, ID_MODE, REFERENCE_DATE, NUM_USERS, NUM_PROJECTS, COMPANY_NAME, COMPANY_DOMAIN, NAME_LOCALES
+from config import TASK_BATCH
+
+
+class _LazyMembers:
+    """members_by_team for project_row that samples each team's members on first use."""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def get(self, team_id, default=None):
+        index = self.dataset.team_index.get(team_id)
+        return default if index is None else self.dataset.team_member_ids(index)
+
+
+class VirtualDataset:
+    """
+    The dataset of one organization, materialized on demand.
+
+    Rows are tuples in TABLE_COLUMNS order, like the rows the generators write.
+    Like main.py, this configures the process-wide seed and ID settings, so
+    use one VirtualDataset at a time in a process.
+
+    Args:
+        seed, id_mode: The run's SEED and --id-mode
+        reference_date: The run's reference time (--reference-date; default: now)
+        num_users, num_projects: The run's NUM_USERS and NUM_PROJECTS
+        org_index: Organization number in a multi-org (--orgs) run
+        engine: Task engine ("python" or "numpy")
+
+    Example:
+        dataset = VirtualDataset(num_projects=20_000_000)
+        tables = dataset.project_tasks(12_345_678)   # {"tasks": [...], "comments": [...], ...}
+    """
+
+    def __init__(self, seed=SEED, id_mode=ID_MODE, reference_date=REFERENCE_DATE, num_users=NUM_USERS,
+                 num_projects=NUM_PROJECTS, org_index=0, engine="python"):
+        self.seed = seed
+        self.id_mode = id_mode
+        self.reference = set_reference_now(reference_date)
+        self.org_index = org_index
+        self.num_users = num_users
+        self.num_projects = num_projects
+        self.name, self.domain = org_identities(org_index + 1, seed, first=(COMPANY_NAME, COMPANY_DOMAIN))[-1]
+        self._activate()
+
+        self.org_id = IdAllocator("organization").id_for(0)
+        self.pool = NamePool(NAME_LOCALES)
+        self.streams = {kind: KeyedStream(kind) for kind in ("user", "department", "team", "project")}
+        self.ids = {kind: IdAllocator(kind) for kind in ("user", "team", "project")}
+        self.teams = new_team_store()
+        for t in range(len(TEAMS)):
+            self.teams.append(self.ids["team"].id_for(t), TEAMS[t][0])
+        self.team_index = {team_id: t for t, team_id in enumerate(self.teams.column("team_id"))}
+        self.engine = get_task_engine(engine)
+        self._members = {}
+        self._member_ids = {}
+        self._by_dept = None
+        self._tag_ids = None
+
+    def _activate(self):
+        # Generators read the base seed, ID settings and reference time when they run
+        set_reference_now(self.reference)
+        configure_ids(self.id_mode, self.seed, shard=self.org_index)
+        set_base_seed(org_seed(self.seed, self.org_index))
+
+    def _check(self, kind, index, count):
+        if not 0 <= index < count:
+            raise IndexError(f"{kind} {index} is out of range (0-{count - 1})")
+
+    def organization(self):
+        """The organizations row."""
+        return (self.org_id, self.name, self.domain, "2018-03-15 00:00:00")
+
+    def user(self, index):
+        """The users row of user index (email without the repeated-name number)."""
+        self._check("user", index, self.num_users)
+        first, last, role, created_at = draw_user(self.streams["user"].at(index), self.pool)
+        email = f"{self.pool.slug(first)}.{self.pool.slug(last)}@{self.domain}"
+        return (self.ids["user"].id_for(index), self.org_id, f"{first} {last}", email,
+                self.department(index), role, created_at)
+
+    def department(self, index):
+        """Department of user index."""
+        return draw_department(self.streams["department"].at(index))
+
+    def users(self, start, stop):
+        """The users rows of users start to stop - 1."""
+        return [self.user(index) for index in range(start, min(stop, self.num_users))]
+
+    def team(self, index):
+        """The teams row of team index."""
+        self._check("team", index, len(TEAMS))
+        dept, name = TEAMS[index]
+        return (self.teams.value(index, "team_id"), self.org_id, f"{dept} - {name}", dept,
+                random_date(300, 100, self.streams["team"].at(index)))
+
+    def _team_members(self, index):
+        members = self._members.get(index)
+        if members is None:
+            if self._by_dept is None:
+                # Members are chosen among every user of the department (one pass over all users)
+                self._by_dept = users_by_department(self.department(u) for u in range(self.num_users))
+            members = self._members[index] = draw_team_members(index, self._by_dept.get(TEAMS[index][0], []))
+        return members
+
+    def team_member_ids(self, index):
+        """User IDs of team index's members, in membership order."""
+        self._check("team", index, len(TEAMS))
+        member_ids = self._member_ids.get(index)
+        if member_ids is None:
+            member_ids = self._member_ids[index] = [self.ids["user"].id_for(user_index)
+                                                    for user_index, _ in self._team_members(index)]
+        return member_ids
+
+    def team_memberships(self, index):
+        """The team_memberships rows of team index."""
+        self._check("team", index, len(TEAMS))
+        self._activate()
+        team_id = self.teams.value(index, "team_id")
+        return [(membership_id(user_index, index), team_id, user_id, "member", joined_at)
+                for user_id, (user_index, joined_at) in zip(self.team_member_ids(index), self._team_members(index))]
+
+    def project(self, index):
+        """The projects row of project index."""
+        self._check("project", index, self.num_projects)
+        row, _ = project_row(self.ids["project"].id_for(index), self.streams["project"].at(index),
+                             self.teams, _LazyMembers(self))
+        return row
+
+    def sections(self, index):
+        """The sections rows of project index."""
+        project = self._project_dict(index)
+        self._activate()
+        return section_rows(index, project)
+
+    def tags(self):
+        """The tags rows."""
+        self._activate()
+        return tag_rows(self.org_id)
+
+    def _project_dict(self, index):
+        project_id, team_id, _, _, project_type, _, created_at, _ = self.project(index)
+        return {"project_id": project_id, "team_id": team_id,
+                "department": self.teams.value(self.team_index[team_id], "department"),
+                "project_type": project_type, "created_at": created_at}
+
+    def project_tasks(self, index):
+        """
+        Every row generated with project index's tasks.
+
+        Returns:
+            dict: {table: rows} for tasks, comments, custom_field_definitions,
+                  custom_field_values and task_tags
+        """
+        job = self._task_job(index)
+        if self._tag_ids is None:
+            self._tag_ids = [row[0] for row in self.tags()]
+        self._activate()
+        tables, _, _, _ = generate_project_rows(self.engine, self._tag_ids, job)
+        return tables
+
+    def project_task_batches(self, start, stop, batch_size=TASK_BATCH):
+        """
+        Task and comment rows of projects start to stop - 1, generated a batch
+        of projects per task engine call (without custom field or tag rows).
+
+        Yields:
+            dict: {"tasks": rows, "comments": rows} per project, in project order
+        """
+        stop = min(stop, self.num_projects)
+        for first in range(start, stop, batch_size):
+            jobs = [self._task_job(index) for index in range(first, min(first + batch_size, stop))]
+            self._activate()
+            for task_rows, comment_rows, _, _ in self.engine(jobs):
+                yield {"tasks": task_rows, "comments": comment_rows}
+
+    def _task_job(self, index):
+        project = self._project_dict(index)
+        section_ids = [row[0] for row in self.sections(index)]
+        team_members = self.team_member_ids(self.team_index[project["team_id"]])
+        return (index, project, section_ids, team_members, None)
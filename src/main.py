@@ -5,85 +5,474 @@ Asana Seed Data Generator - Main Entry Point
 Generates realistic seed data for an Asana-like project management simulation.
 Simulates a B2B SaaS company with ~7500 employees.
 
-Usage: python src/main.py
+Usage: python src/main.py [--workers N] [--engine python|numpy] [--reference-date YYYY-MM-DD] [--resume]
+       python src/main.py --memory-budget 2G
+       python src/main.py --sink csv|jsonl [--gzip] [--sink-dir DIR]
+       python src/main.py --orgs N [--shard-workers N] [--shard-layout merge|manifest]
 """
+import argparse
 import sqlite3
 import os
 import sys
-import random
+import shutil
+from contextlib import nullcontext
+from multiprocessing import Pool
 
 # Add src to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import DB_PATH, SCHEMA_PATH
-from generators.organizations import generate_organization
-from generators.users import generate_users
-from generators.teams import generate_teams, generate_team_memberships
-from generators.projects import generate_projects
-from generators.sections import generate_sections
+from config import DB_PATH, TABLES_DIR, SHARD_DIR, NUM_ORGS, SCHEMA_PATH, INDEXES_PATH, BATCH_SIZE, BULK_LOAD, WORKERS, TASK_ENGINE, REFERENCE_DATE
+from config import MEMORY_BUDGET
+from config import SEED, ID_MODE, COMPANY_NAME, COMPANY_DOMAIN, NUM_USERS, NUM_PROJECTS, DEPARTMENTS, ROLES
+from config import ROLE_WEIGHTS, TEAM_NAMES, SECTION_TEMPLATES, TASKS_PER_PROJECT, SUBTASK_CHANCE
+from config import COMMENT_CHANCE, COMPLETION_RATE, UNASSIGNED_RATE, USE_LLM, LLM_MODEL, NAME_LOCALES
+from config import TAG_NAMES, TAG_COLORS, TAG_CHANCE, TAGS_PER_TASK, CUSTOM_FIELDS, CUSTOM_FIELDS_PER_PROJECT
+from config import CUSTOM_FIELD_FILL_RATE
+from utils.db import BulkWriter, bulk_load, load_schema, drop_indexes, build_indexes
+from utils.db import BULK_LOAD_PRAGMAS, RESUMABLE_BULK_LOAD_PRAGMAS
+from utils.sinks import FileWriter, SINK_FORMATS
+from utils.ids import configure_ids, ID_MODES, SHARD_BITS
+from utils.metrics import StageRecorder, parse_stage_list
+from utils.budget import parse_size, plan_memory, describe_plan, MemoryGovernor, MIN_FREE_MB
+from utils.dates import set_reference_now, reference_now, now_str
+from utils.helpers import set_base_seed
+from utils.shards import shard_path, org_seed, org_identities, merge_shards, write_manifest
+from utils.checkpoints import fingerprint, load_checkpoints, save_checkpoint, ensure_checkpoint_table
+from generators.organizations import generate_organization, load_organization
+from generators.users import generate_users, load_users
+from generators.teams import generate_teams, generate_team_memberships, load_teams, load_team_memberships
+from generators.projects import generate_projects, load_projects
+from generators.sections import generate_sections, load_sections
+from generators.tags import generate_tags, load_tags
+from generators.stats import generate_team_stats, generate_user_stats
 from generators.tasks import generate_tasks
 
-# Set seeds for reproducibility
-random.seed(42)
+# Bump when the generators produce different rows for the same config, so --resume
+# regenerates databases written by older versions
+GENERATOR_VERSION = 4
 
+# Pipeline stages in dependency order, with the tables each one fills
+STAGES = [
+    ("organization", ["organizations"]),
+    ("users", ["users"]),
+    ("teams", ["teams"]),
+    ("memberships", ["team_memberships", "team_stats"]),
+    ("projects", ["projects"]),
+    ("sections", ["sections"]),
+    ("tags", ["tags"]),
+    ("tasks", ["tasks", "comments", "custom_field_definitions", "custom_field_values", "task_tags",
+               "user_stats"]),
+]
 
-def main():
+
+def stage_inputs(args):
+    """Config values each stage's output depends on (besides the stages before it)."""
+    return {
+        "organization": [COMPANY_NAME, COMPANY_DOMAIN],
+        "users": [NUM_USERS, DEPARTMENTS, ROLES, ROLE_WEIGHTS, NAME_LOCALES],
+        "teams": [TEAM_NAMES],
+        "memberships": [],
+        "projects": [NUM_PROJECTS],
+        "sections": [SECTION_TEMPLATES],
+        "tags": [TAG_NAMES, TAG_COLORS],
+        "tasks": [TASKS_PER_PROJECT, SUBTASK_CHANCE, COMMENT_CHANCE, COMPLETION_RATE, UNASSIGNED_RATE,
+                  args.engine, USE_LLM, LLM_MODEL, TAG_CHANCE, TAGS_PER_TASK, CUSTOM_FIELDS,
+                  CUSTOM_FIELDS_PER_PROJECT, CUSTOM_FIELD_FILL_RATE],
+    }
+
+
+def stage_fingerprints(args):
+    """
+    Fingerprint every stage. Each fingerprint covers the generator version, seed,
+    ID mode, reference time and the previous stage's fingerprint, so a change invalidates everything
+    downstream of it.
+    """
+    inputs = stage_inputs(args)
+    previous = fingerprint(GENERATOR_VERSION, SEED, args.id_mode, reference_now())
+    fingerprints = {}
+    for name, _ in STAGES:
+        previous = fingerprints[name] = fingerprint(previous, name, inputs[name])
+    return fingerprints
+
+
+def run_stage(name, writer, state, args, governor=None):
+    """Generate one stage, storing its results in state for later stages."""
+    # Every random value is a keyed draw (utils.keyed), so skipping earlier stages
+    # does not change a stage's output
+    org_name, org_domain = state.get("org", (COMPANY_NAME, COMPANY_DOMAIN))
+    if name == "organization":
+        state["org_id"] = generate_organization(writer, org_name, org_domain)
+    elif name == "users":
+        state["users"] = generate_users(writer, state["org_id"], org_domain)
+    elif name == "teams":
+        state["teams"] = generate_teams(writer, state["org_id"])
+    elif name == "memberships":
+        state["members_by_team"], state["team_counts"] = generate_team_memberships(
+            writer, state["teams"], state["users"])
+        generate_team_stats(writer, state["teams"], state["members_by_team"])
+    elif name == "projects":
+        state["projects"] = generate_projects(writer, state["teams"], state["members_by_team"])
+    elif name == "sections":
+        state["project_sections"] = generate_sections(writer, state["projects"])
+    elif name == "tags":
+        state["tag_ids"] = generate_tags(writer, state["org_id"])
+    elif name == "tasks":
+        _, _, activity = generate_tasks(writer, state["projects"], state["project_sections"],
+                                        state["members_by_team"], state["tag_ids"], args.workers, args.engine,
+                                        governor)
+        generate_user_stats(writer, state["users"], state["team_counts"], activity)
+
+
+def load_stage(name, conn, state):
+    """Rebuild a skipped stage's in-memory results from the database."""
+    if name == "organization":
+        state["org_id"] = load_organization(conn)
+    elif name == "users":
+        state["users"] = load_users(conn)
+    elif name == "teams":
+        state["teams"] = load_teams(conn)
+    elif name == "memberships":
+        state["members_by_team"], state["team_counts"] = load_team_memberships(conn, state["teams"], state["users"])
+    elif name == "projects":
+        state["projects"] = load_projects(conn)
+    elif name == "sections":
+        state["project_sections"] = load_sections(conn, state["projects"])
+    elif name == "tags":
+        state["tag_ids"] = load_tags(conn)
+
+
+def read_checkpoints(path):
+    """Read checkpoints from an existing database without modifying it."""
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(path)
+    try:
+        return load_checkpoints(conn)
+    except sqlite3.DatabaseError:
+        return {}
+    finally:
+        conn.close()
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Generate Asana seed data into SQLite or per-table files.")
+    parser.add_argument("--workers", type=int,
+                        help=f"processes used for task generation (default: {WORKERS}, "
+                             "or chosen by --memory-budget, which treats this as a maximum)")
+    parser.add_argument("--memory-budget", default=MEMORY_BUDGET, metavar="SIZE",
+                        help="memory for the whole run, e.g. 512M or 2G; batch size, commit interval, "
+                             "SQLite cache and workers are chosen to fit and adjusted as it runs")
+    parser.add_argument("--reference-date", default=REFERENCE_DATE,
+                        help="fixed 'now' for all generated dates, e.g. 2026-01-07 (default: run start)")
+    parser.add_argument("--id-mode", choices=ID_MODES, default=ID_MODE,
+                        help=f"ID format; 'integer' uses INTEGER primary keys (default: {ID_MODE})")
+    parser.add_argument("--engine", choices=["python", "numpy"], default=TASK_ENGINE,
+                        help=f"task generation engine (default: {TASK_ENGINE})")
+    parser.add_argument("--metrics-out", metavar="PATH",
+                        help="write a JSON report of per-stage timings, row/statement counts and memory")
+    parser.add_argument("--profile", metavar="STAGES",
+                        help="run these stages under cProfile, e.g. 'tasks' or 'users,tasks' or 'all'")
+    parser.add_argument("--tracemalloc", metavar="STAGES",
+                        help="trace Python allocations in these stages (slow)")
+    parser.add_argument("--trace-sql", action="store_true",
+                        help="count every SQLite statement executed (adds per-statement overhead)")
+    parser.add_argument("--profile-dir", default="output/profiles", help="where .prof files are written")
+    parser.add_argument("--resume", action="store_true",
+                        help="reuse the existing database, regenerating only stages whose config changed")
+    parser.add_argument("--sink", choices=("sqlite",) + SINK_FORMATS, default="sqlite",
+                        help="write to SQLite (default) or stream one CSV/JSON Lines file per table")
+    parser.add_argument("--gzip", action="store_true", help="gzip-compress csv/jsonl sink files")
+    parser.add_argument("--sink-dir", default=TABLES_DIR,
+                        help=f"directory for csv/jsonl sink files (default: {TABLES_DIR})")
+    parser.add_argument("--orgs", type=int, default=NUM_ORGS,
+                        help=f"organizations to generate, one shard database each (default: {NUM_ORGS})")
+    parser.add_argument("--shard-workers", type=int, default=os.cpu_count(),
+                        help="processes building shards in parallel (default: CPU count)")
+    parser.add_argument("--shard-dir", default=SHARD_DIR, help=f"directory for shard databases (default: {SHARD_DIR})")
+    parser.add_argument("--shard-layout", choices=["merge", "manifest"], default="merge",
+                        help="merge shards into the main database, or keep them with a manifest (default: merge)")
+    parser.add_argument("--keep-shards", action="store_true", help="keep shard databases after merging")
+    args = parser.parse_args(argv)
+    if not 1 <= args.orgs <= 1 << SHARD_BITS:
+        parser.error(f"--orgs must be between 1 and {1 << SHARD_BITS}")
+    if args.orgs > 1 and (args.sink != "sqlite" or args.resume):
+        parser.error("--orgs requires --sink sqlite and does not support --resume")
+    if args.sink == "sqlite" and args.gzip:
+        parser.error("--gzip only applies to --sink csv or jsonl")
+    if args.sink != "sqlite" and args.resume:
+        parser.error("--resume requires --sink sqlite")
+    if args.memory_budget:
+        try:
+            args.memory_budget = parse_size(args.memory_budget)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def memory_plan(args):
+    """
+    Plan batch size, cache, commits and workers for args.memory_budget, and
+    fill in args.workers (at most the --workers given). Returns None without a budget.
+    """
+    if not args.memory_budget:
+        args.workers = args.workers or WORKERS
+        return None
+    plan = plan_memory(args.memory_budget, max_workers=args.workers)
+    args.workers = plan["workers"]
+    print(f"Memory budget {args.memory_budget:,.0f} MB: {describe_plan(plan)}")
+    return plan
+
+
+def generate_files(args):
+    """
+    Run every stage straight into per-table files, bypassing SQLite.
+    Uses the same generators and seeds, so the rows match the database tables.
+    """
+    plan = memory_plan(args)
+    writer = FileWriter(args.sink_dir, args.sink, compress=args.gzip, batch_size=BATCH_SIZE)
+    governor = MemoryGovernor(plan, writer) if plan else None
+    recorder = StageRecorder(profile=parse_stage_list(args.profile),
+                             trace_memory=parse_stage_list(args.tracemalloc),
+                             profile_dir=args.profile_dir, verbose=True)
+    state = {}
+    try:
+        for name, _ in STAGES:
+            with recorder.stage(name, writer):
+                run_stage(name, writer, state, args, governor)
+    finally:
+        writer.close()
+    
+    print()
+    print("=" * 50)
+    print("Generation Complete!")
+    print("=" * 50)
+    print(f"Files: {args.sink_dir}/")
+    print()
+    for table, count in writer.rows_written.items():
+        print(f"{table}: {count:,} rows -> {writer.paths[table]}")
+    
+    if args.metrics_out:
+        recorder.write_json(args.metrics_out, sink=args.sink, output_dir=args.sink_dir,
+                            output_bytes=writer.total_bytes(), memory_plan=plan,
+                            memory=governor.report() if governor else None, args=vars(args))
+        print(f"Metrics: {args.metrics_out}")
+    
+    print()
+    print("Done!")
+
+
+def _init_shard_worker(reference):
+    """Shard workers share the parent's reference time and keep their progress output quiet."""
+    set_reference_now(reference)
+    sys.stdout = open(os.devnull, "w")
+
+
+def build_shard(job):
+    """
+    Generate one organization into its own database (runs in a worker process).
+    
+    The organization gets its own ID shard and base seed; task generation runs
+    in this process, since parallelism comes from building shards side by side.
+    
+    Returns:
+        dict: Shard description for the merge step or manifest
+    """
+    index, org, path, args, build_index = job
+    configure_ids(args.id_mode, SEED, shard=index)
+    set_base_seed(org_seed(SEED, index))
+    if os.path.exists(path):
+        os.remove(path)
+    
+    conn = sqlite3.connect(path)
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    load_schema(conn, os.path.join(root_dir, SCHEMA_PATH), integer_ids=args.id_mode == "integer")
+    writer = BulkWriter(conn, batch_size=BATCH_SIZE)
+    recorder = StageRecorder()
+    state = {"org": org}
+    shard_args = argparse.Namespace(**dict(vars(args), workers=1))
+    plan = memory_plan(shard_args)
+    with bulk_load(conn):
+        governor = MemoryGovernor(plan, writer, conn) if plan else None
+        for name, _ in STAGES:
+            with recorder.stage(name, writer):
+                run_stage(name, writer, state, shard_args, governor)
+        writer.commit()
+        if build_index:
+            with recorder.stage("indexes"):
+                build_indexes(conn, os.path.join(root_dir, INDEXES_PATH))
+    conn.close()
+    
+    return {"index": index, "org_id": state["org_id"], "name": org[0], "domain": org[1], "path": path,
+            "rows": dict(writer.rows_written), "bytes": os.path.getsize(path),
+            "seconds": recorder.to_dict()["total_seconds"]}
+
+
+def generate_orgs(args):
+    """
+    Generate args.orgs organizations into shard databases in parallel, then
+    merge them into DB_PATH or describe them with a manifest.
+    """
+    os.makedirs(args.shard_dir, exist_ok=True)
+    orgs = org_identities(args.orgs, SEED, first=(COMPANY_NAME, COMPANY_DOMAIN))
+    merge = args.shard_layout == "merge"
+    jobs = [(index, org, shard_path(args.shard_dir, index), args, not merge) for index, org in enumerate(orgs)]
+    workers = max(1, min(args.shard_workers, len(jobs)))
+    if args.memory_budget:
+        # Each shard is a whole generation run, so the budget is shared between them
+        shard_mb = plan_memory(args.memory_budget, max_workers=1)["fixed_mb"] + MIN_FREE_MB
+        workers = max(1, min(workers, int(args.memory_budget // shard_mb)))
+        args.memory_budget /= workers
+        print(f"Memory budget: {args.memory_budget:,.0f} MB per shard")
+    
+    recorder = StageRecorder(verbose=True)
+    print(f"Building {len(jobs)} organization shards with {workers} worker(s)...")
+    with recorder.stage("shards") as record:
+        with Pool(workers, initializer=_init_shard_worker, initargs=(reference_now(),)) as pool:
+            shards = []
+            for shard in pool.imap_unordered(build_shard, jobs):
+                shards.append(shard)
+                print(f"  [{len(shards)}/{len(jobs)}] {shard['name']}: {sum(shard['rows'].values()):,} rows "
+                      f"in {shard['seconds']:.1f}s")
+        shards.sort(key=lambda shard: shard["index"])
+        record["rows"] = sum(sum(shard["rows"].values()) for shard in shards)
+    
+    totals = {table: sum(shard["rows"][table] for shard in shards) for table in shards[0]["rows"]}
+    if merge:
+        if os.path.exists(DB_PATH):
+            os.remove(DB_PATH)
+        conn = sqlite3.connect(DB_PATH)
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        load_schema(conn, os.path.join(root_dir, SCHEMA_PATH), integer_ids=args.id_mode == "integer")
+        with bulk_load(conn):
+            with recorder.stage("merge") as record:
+                totals = merge_shards(conn, [shard["path"] for shard in shards])
+                record["rows"] = sum(totals.values())
+            with recorder.stage("indexes"):
+                build_indexes(conn, os.path.join(root_dir, INDEXES_PATH))
+        conn.close()
+        if not args.keep_shards:
+            shutil.rmtree(args.shard_dir)
+        output = DB_PATH
+    else:
+        output = write_manifest(args.shard_dir, shards, reference_now=reference_now(), id_mode=args.id_mode,
+                                seed=SEED)
+    
+    print()
+    print("=" * 50)
+    print("Generation Complete!")
+    print("=" * 50)
+    print(f"{'Database' if merge else 'Manifest'}: {output}")
+    print()
+    print(f"Organizations: {len(shards)}")
+    for table, count in totals.items():
+        print(f"{table}: {count:,}")
+    
+    if args.metrics_out:
+        size = os.path.getsize(DB_PATH) if merge else sum(shard["bytes"] for shard in shards)
+        recorder.write_json(args.metrics_out, db_path=output, db_size_bytes=size, shards=shards, args=vars(args))
+        print(f"Metrics: {args.metrics_out}")
+    
+    print()
+    print("Done!")
+
+
+def main(argv=None):
     """
     Main orchestration function.
     Generates all data in dependency order to maintain referential integrity.
     """
+    args = parse_args(argv)
+    configure_ids(args.id_mode, SEED)
+    set_base_seed(SEED)
+    
+    # A resumed run keeps the reference time of the run that created the database
+    checkpoints = read_checkpoints(DB_PATH) if args.resume else {}
+    if args.reference_date is None and checkpoints:
+        set_reference_now(next(iter(checkpoints.values()))[1])
+    else:
+        set_reference_now(args.reference_date)
+    fingerprints = stage_fingerprints(args)
+    
     print("=" * 50)
     print("Asana Seed Data Generator")
     print("=" * 50)
+    print(f"Reference time: {now_str()}")
     print()
     
+    if args.orgs > 1:
+        generate_orgs(args)
+        return
+    
+    if args.sink != "sqlite":
+        generate_files(args)
+        return
+    
     # Create output directory
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     
-    # Remove existing database
-    if os.path.exists(DB_PATH):
+    # Remove existing database unless it can be resumed
+    resumable = checkpoints.get("organization", (None,))[0] == fingerprints["organization"]
+    if os.path.exists(DB_PATH) and not resumable:
         os.remove(DB_PATH)
         print(f"Removed existing database: {DB_PATH}")
+        checkpoints = {}
     
     # Connect to database
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
+    writer = BulkWriter(conn, batch_size=BATCH_SIZE)
+    plan = memory_plan(args)
     
-    # Load and execute schema
-    schema_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), SCHEMA_PATH)
-    with open(schema_path, 'r') as f:
-        conn.executescript(f.read())
+    # Load and execute schema (tables only; indexes are built after loading)
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    load_schema(conn, os.path.join(root_dir, SCHEMA_PATH), integer_ids=args.id_mode == "integer")
+    ensure_checkpoint_table(conn)
     print(f"Created database schema from {SCHEMA_PATH}")
     print()
     
+    pending = [name for name, _ in STAGES if checkpoints.get(name, (None,))[0] != fingerprints[name]]
+    if pending:
+        drop_indexes(conn)
+    
     # ============================================
     # GENERATION PIPELINE
     # ============================================
     
-    # 1. Organization (top-level container)
-    org_id = generate_organization(cursor)
-    conn.commit()
-    
-    # 2. Users
-    users, users_by_dept = generate_users(cursor, org_id)
-    conn.commit()
+    recorder = StageRecorder(conn, trace_sql=args.trace_sql, profile=parse_stage_list(args.profile),
+                             trace_memory=parse_stage_list(args.tracemalloc),
+                             profile_dir=args.profile_dir, verbose=True)
+    state = {}
     
-    # 3. Teams
-    teams = generate_teams(cursor, org_id, users_by_dept)
-    generate_team_memberships(cursor, teams, users_by_dept)
-    conn.commit()
-    
-    # 4. Projects
-    projects = generate_projects(cursor, teams)
-    conn.commit()
-    
-    # 5. Sections
-    project_sections = generate_sections(cursor, projects)
-    conn.commit()
-    
-    # 6. Tasks (includes subtasks and comments)
-    total_tasks, total_subtasks = generate_tasks(cursor, projects, project_sections)
-    conn.commit()
+    # With --resume the load keeps a journal so an interrupted stage rolls back cleanly
+    pragmas = RESUMABLE_BULK_LOAD_PRAGMAS if args.resume else BULK_LOAD_PRAGMAS
+    with bulk_load(conn, pragmas) if BULK_LOAD else nullcontext():
+        # Sets the batch size and page cache, and commits within the tasks stage; rows an
+        # interrupted stage committed are cleared when it is rerun
+        governor = MemoryGovernor(plan, writer, conn) if plan else None
+        for name, tables in STAGES:
+            if name not in pending:
+                print(f"Skipping {name} (unchanged since last run)")
+                load_stage(name, conn, state)
+                recorder.skip(name)
+                continue
+            
+            with recorder.stage(name, writer):
+                # Clear rows left by an earlier or interrupted run of this stage
+                for table in tables:
+                    conn.execute(f"DELETE FROM {table}")
+                
+                run_stage(name, writer, state, args, governor)
+                
+                writer.flush()
+                save_checkpoint(conn, name, fingerprints[name], reference_now())
+                conn.commit()
+        
+        # 7. Secondary indexes, built once over the loaded tables
+        if pending:
+            with recorder.stage("indexes"):
+                build_indexes(conn, os.path.join(root_dir, INDEXES_PATH))
+            print(f"Built indexes from {INDEXES_PATH}")
     
     # ============================================
     # SUMMARY
@@ -117,7 +506,26 @@ def main():
     cursor.execute("SELECT COUNT(*) FROM comments")
     print(f"Comments: {cursor.fetchone()[0]}")
     
+    cursor.execute("SELECT COUNT(*) FROM tags")
+    print(f"Tags: {cursor.fetchone()[0]}")
+    
+    cursor.execute("SELECT COUNT(*) FROM task_tags")
+    print(f"Task tags: {cursor.fetchone()[0]}")
+    
+    cursor.execute("SELECT COUNT(*) FROM custom_field_definitions")
+    print(f"Custom fields: {cursor.fetchone()[0]}")
+    
+    cursor.execute("SELECT COUNT(*) FROM custom_field_values")
+    print(f"Custom field values: {cursor.fetchone()[0]}")
+    
+    conn.set_trace_callback(None)
     conn.close()
+    
+    if args.metrics_out:
+        recorder.write_json(args.metrics_out, db_path=DB_PATH, db_size_bytes=os.path.getsize(DB_PATH),
+                            memory_plan=plan, memory=governor.report() if governor else None, args=vars(args))
+        print(f"Metrics: {args.metrics_out}")
+    
     print()
     print("Done!")
 
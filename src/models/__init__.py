@@ -1,2 +1,5 @@
-# Models module
-# No models are used in project yet.
\ No newline at end of file
+"""
+Models module.
+Compact in-memory stores for the entities stages pass to each other.
+"""
+from models.entities import Codes, EntityStore, GroupedIds, Record
@@ -0,0 +1,132 @@
+"""
+Compact in-memory entity stores.
+
+Stages hand entities (users, teams, projects, sections) to later stages
+through these stores instead of lists of dicts. Each store keeps one list or
+array per column; low-cardinality text columns (departments, project types,
+dates) are stored as small integer codes into a shared table of interned
+values. A user costs two list/array slots instead of a dict.
+
+Rows are read by position (store.value(i, "department")) or through a
+lightweight Record view that supports record["column"], so generators can
+keep their dict-style access.
+"""
+import sys
+from array import array
+
+
+class Codes:
+    """Two-way table between interned values and small integer codes."""
+
+    __slots__ = ("values", "index")
+
+    def __init__(self):
+        self.values = []
+        self.index = {}
+
+    def code(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(sys.intern(value) if isinstance(value, str) else value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+class Record:
+    """A read-only view of one row of an EntityStore."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, name):
+        return self.store.value(self.index, name)
+
+    def get(self, name, default=None):
+        return self.store.value(self.index, name) if name in self.store.columns else default
+
+    def to_dict(self):
+        """Copy the row into a plain dict (e.g. to send it to a worker process)."""
+        return {name: self.store.value(self.index, name) for name in self.store.columns}
+
+    def __repr__(self):
+        return f"Record({self.to_dict()!r})"
+
+
+class EntityStore:
+    """
+    Struct-of-arrays table of one entity type.
+
+    Args:
+        columns: Column names, in append() order.
+        coded: Columns stored as codes into an interned value table
+               (use for values that repeat, like departments or dates).
+    """
+
+    def __init__(self, columns, coded=()):
+        self.columns = tuple(columns)
+        self.codes = {name: Codes() for name in coded}
+        # Coded columns are 4-byte arrays; plain columns hold references to shared objects
+        self.data = {name: array("I") if name in self.codes else [] for name in self.columns}
+
+    def append(self, *values):
+        """Add one row (values in column order) and return its index."""
+        for name, value in zip(self.columns, values):
+            codes = self.codes.get(name)
+            self.data[name].append(codes.code(value) if codes is not None else value)
+        return len(self) - 1
+
+    def __len__(self):
+        return len(self.data[self.columns[0]])
+
+    def value(self, index, name):
+        """Value of one column of row index."""
+        value = self.data[name][index]
+        codes = self.codes.get(name)
+        return codes.values[value] if codes is not None else value
+
+    def column(self, name):
+        """All values of a column, in row order (decoded)."""
+        codes = self.codes.get(name)
+        if codes is not None:
+            values = codes.values
+            return [values[code] for code in self.data[name]]
+        return self.data[name]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return Record(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Record(self, index)
+
+
+class GroupedIds:
+    """
+    Lists of IDs per parent row (e.g. section IDs per project), stored as one
+    flat list plus offsets instead of a list per parent.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.offsets = array("L", [0])
+
+    def append_group(self, ids):
+        """Add the IDs of the next parent row."""
+        self.ids.extend(ids)
+        self.offsets.append(len(self.ids))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
@@ -0,0 +1,224 @@
+"""Stream task activity events as JSON Lines for load-testing consumers.
+
+Builds the task.created / task.assigned / comment.added / task.completed
+events of the dataset a generation run with the same settings would produce
+(see generators/virtual.py, no database needed) and writes them in time
+order to stdout, a file or a local socket.
+
+Memory: at most --max-events events are held at once. Larger feeds are built
+in time windows, one pass over the projects per window (see
+generators/events.py), so each window after the first pauses the stream
+while it is generated.
+
+Pacing:
+- --rate N caps the stream at N events/sec
+- --speedup X replays event times on a simulated clock running X times
+  faster than real time (86400 = one simulated day per second)
+- With both, an event waits for whichever allows it later; with neither,
+  events are written as fast as the output accepts them
+
+Backpressure: writes block when the consumer (pipe or socket) is full, so
+a slow consumer slows the stream instead of growing a buffer. If it falls
+more than --max-lag seconds behind schedule, the schedule is moved back
+rather than bursting to catch up.
+
+Usage:
+    python src/stream_events.py --rate 100000 > events.jsonl
+    python src/stream_events.py --output tcp://127.0.0.1:9000 --speedup 86400
+    python src/stream_events.py --output unix:/tmp/events.sock --projects 5000 --limit 1000000
+"""
+import argparse
+import os
+import socket
+import sys
+import time
+from bisect import bisect_right
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import SEED, ID_MODE, REFERENCE_DATE, NUM_USERS, NUM_PROJECTS, TASK_ENGINE  # type: ignore
+from config import STREAM_RATE, STREAM_SPEEDUP, STREAM_BATCH, STREAM_MAX_LAG, STREAM_MAX_EVENTS  # type: ignore
+from utils.ids import ID_MODES  # type: ignore
+from utils.dates import to_epoch  # type: ignore
+from generators.virtual import VirtualDataset  # type: ignore
+from generators.events import build_events, event_windows  # type: ignore
+
+
+def log(message):
+    """Progress goes to stderr, since stdout may be the stream."""
+    print(message, file=sys.stderr, flush=True)
+
+
+def open_output(target):
+    """
+    Open a stream target: "-" (stdout), tcp://HOST:PORT, unix:PATH or a file path.
+
+    Returns:
+        tuple: (write(bytes) function, close() function)
+    """
+    if target == "-":
+        out = sys.stdout.buffer
+        return out.write, out.flush
+    if target.startswith("tcp://"):
+        host, _, port = target[len("tcp://"):].rpartition(":")
+        sock = socket.create_connection((host or "127.0.0.1", int(port)))
+        return sock.sendall, sock.close
+    if target.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(target[len("unix:"):])
+        return sock.sendall, sock.close
+    f = open(target, "wb")
+    return f.write, f.close
+
+
+def stream_events(events, write, rate=0.0, speedup=0.0, batch_size=STREAM_BATCH,
+                  max_lag=STREAM_MAX_LAG, limit=None, stats_every=5.0):
+    """
+    Write events as JSON Lines, paced by rate and/or simulated clock speed.
+
+    Events are read lazily from any iterator of (time, type index, body) in
+    time order; at most batch_size of them are held ahead of the output.
+
+    Returns:
+        dict: events, seconds, events_per_sec, bytes, blocked_seconds (time spent
+              in writes, i.e. backpressure), rebased_seconds (schedule dropped)
+              and startup_seconds (wait for the first event)
+    """
+    events = iter(events) if limit is None else islice(events, limit)
+    pending = []      # Events read but not yet written
+    times = []        # Their times as epoch seconds (only needed with --speedup)
+    first_time = None
+    start = time.perf_counter()
+    next_stats = start + stats_every
+    emitted = written = 0
+    blocked = rebased = startup = 0.0
+
+    while True:
+        if len(pending) < batch_size:
+            more = list(islice(events, batch_size - len(pending)))
+            if speedup:
+                times.extend(to_epoch(event[0]) for event in more)
+            pending += more
+            if not pending:
+                break
+            if first_time is None:
+                # Pacing starts with the first event, once the merge has produced it
+                first_time = times[0] if speedup else 0
+                startup = time.perf_counter() - start
+                start += startup
+                next_stats = start + stats_every
+
+        elapsed = time.perf_counter() - start
+        # Events allowed by now: the rate limit and the simulated clock each cap the count
+        due = len(pending)
+        if rate:
+            due = min(due, int(elapsed * rate) + 1 - emitted)
+        if speedup:
+            due = min(due, bisect_right(times, first_time + elapsed * speedup))
+        if due <= 0:
+            wait = 0.0
+            if rate:
+                wait = emitted / rate - elapsed
+            if speedup:
+                wait = max(wait, (times[0] - first_time) / speedup - elapsed)
+            time.sleep(min(max(wait, 0.0005), 0.1))
+            continue
+
+        data = "".join([f'{{"seq":{seq},"time":"{event[0]}",{event[2]}}}\n'
+                        for seq, event in enumerate(pending[:due], emitted)]).encode("utf-8")
+        write_start = time.perf_counter()
+        write(data)
+        now = time.perf_counter()
+        blocked += now - write_start
+        emitted += due
+        written += len(data)
+        last_time = times[due - 1] if speedup else 0
+        del pending[:due]
+        del times[:due]
+
+        # Backpressure: a consumer that held us back more than max_lag moves the schedule
+        if rate or speedup:
+            scheduled = max(emitted / rate if rate else 0.0,
+                            (last_time - first_time) / speedup if speedup else 0.0)
+            lag = (now - start) - scheduled
+            if lag > max_lag:
+                start += lag - max_lag
+                rebased += lag - max_lag
+
+        if now >= next_stats:
+            seconds = now - start + rebased
+            log(f"  [stream] {emitted:,} events, {emitted / seconds:,.0f} events/s, "
+                f"blocked {blocked:.2f}s, rebased {rebased:.2f}s")
+            next_stats = now + stats_every
+
+    seconds = time.perf_counter() - start + rebased
+    return {
+        "events": emitted,
+        "seconds": round(seconds, 3),
+        "events_per_sec": round(emitted / seconds) if seconds else None,
+        "bytes": written,
+        "blocked_seconds": round(blocked, 3),
+        "rebased_seconds": round(rebased, 3),
+        "startup_seconds": round(startup, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream task activity events as JSON Lines")
+    parser.add_argument("--output", default="-",
+                        help="- (stdout, default), a file path, tcp://HOST:PORT or unix:PATH")
+    parser.add_argument("--rate", type=float, default=STREAM_RATE,
+                        help="target events per second (default: 0 = as fast as possible)")
+    parser.add_argument("--speedup", type=float, default=STREAM_SPEEDUP,
+                        help="simulated seconds per wall-clock second (default: 0 = ignore event times)")
+    parser.add_argument("--projects", type=int, default=NUM_PROJECTS,
+                        help=f"projects whose events are streamed (default: {NUM_PROJECTS})")
+    parser.add_argument("--users", type=int, default=NUM_USERS, help=f"users in the dataset (default: {NUM_USERS})")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many events")
+    parser.add_argument("--max-events", type=int, default=STREAM_MAX_EVENTS,
+                        help=f"most events held in memory at once, about 300 bytes each; more projects are "
+                             f"streamed in time windows of this size, one pass over the projects per window, "
+                             f"pausing the stream between windows (default: {STREAM_MAX_EVENTS:,})")
+    parser.add_argument("--batch-size", type=int, default=STREAM_BATCH,
+                        help=f"most events per write (default: {STREAM_BATCH})")
+    parser.add_argument("--max-lag", type=float, default=STREAM_MAX_LAG,
+                        help=f"seconds behind schedule before the schedule is moved back (default: {STREAM_MAX_LAG})")
+    parser.add_argument("--seed", type=int, default=SEED, help=f"dataset seed (default: {SEED})")
+    parser.add_argument("--id-mode", choices=ID_MODES, default=ID_MODE, help=f"ID format (default: {ID_MODE})")
+    parser.add_argument("--reference-date", default=REFERENCE_DATE,
+                        help="reference 'now' for event times (default: REFERENCE_DATE or now)")
+    parser.add_argument("--engine", choices=["python", "numpy"], default=TASK_ENGINE,
+                        help=f"task generation engine (default: {TASK_ENGINE})")
+    args = parser.parse_args()
+
+    if args.rate < 0 or args.speedup < 0:
+        parser.error("--rate and --speedup must not be negative")
+    if args.projects < 1 or args.batch_size < 1 or args.max_events < 1:
+        parser.error("--projects, --batch-size and --max-events must be at least 1")
+
+    dataset = VirtualDataset(seed=args.seed, id_mode=args.id_mode, reference_date=args.reference_date,
+                             num_users=args.users, num_projects=args.projects, engine=args.engine)
+    windows = event_windows(args.projects, args.max_events)
+    log(f"Building the events of {args.projects:,} projects in {len(windows)} time window(s)...")
+    events = build_events(dataset, args.projects, windows)
+
+    write, close = open_output(args.output)
+    try:
+        stats = stream_events(events, write, args.rate, args.speedup, args.batch_size,
+                              args.max_lag, args.limit)
+        close()
+    except (BrokenPipeError, ConnectionResetError):
+        # The consumer went away (e.g. piped into head); stop without a traceback
+        if args.output == "-":
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        log("Consumer closed the stream")
+        return
+
+    log(f"Streamed {stats['events']:,} events in {stats['seconds']:.2f}s, the first after "
+        f"{stats['startup_seconds']:.2f}s ({stats['events_per_sec'] or 0:,} events/s, {stats['bytes'] / 1e6:.1f} MB, "
+        f"blocked {stats['blocked_seconds']:.2f}s, rebased {stats['rebased_seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
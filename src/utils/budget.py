@@ -0,0 +1,229 @@
+"""
+Memory-budget tuning for generation (--memory-budget).
+
+plan_memory() turns a budget into the settings that decide how much memory a
+run holds: rows buffered per table before a flush, SQLite's page cache, task
+worker processes and project results in flight, and how many projects go
+into each transaction. MemoryGovernor then watches the memory actually used
+during the tasks stage and tightens or relaxes the same settings.
+
+Methodology:
+- Rows per project follow from the config (TASKS_PER_PROJECT, SUBTASK_CHANCE,
+  COMMENT_CHANCE, custom field and tag rates); bytes per row are measured
+  sizes of the generated row tuples
+- Memory that does not depend on the settings (the interpreter, user,
+  team and project stores, per-user activity counters) is taken off first;
+  the rest is split between worker processes and their in-flight results,
+  the SQLite page cache and the writer's buffers
+- Commits every commit_projects projects bound how much a transaction
+  writes (the WAL of a --resume run can only be checkpointed between
+  transactions); an interrupted tasks stage is still cleared and rerun
+"""
+import os
+import re
+import time
+
+from utils.metrics import current_rss_mb, total_rss_mb
+from config import (NUM_USERS, NUM_PROJECTS, TASKS_PER_PROJECT, SUBTASK_CHANCE, COMMENT_CHANCE,
+                    CUSTOM_FIELDS_PER_PROJECT, CUSTOM_FIELD_FILL_RATE, TAG_CHANCE, TAGS_PER_TASK, TASK_BATCH)
+
+SUBTASKS_PER_PARENT = 2.5  # Mean of the 1-4 subtasks a task with subtasks gets
+
+# Python size of one buffered row (tuple plus its strings), measured on generated projects
+ROW_BYTES = {"tasks": 650, "comments": 420, "custom_field_definitions": 380, "custom_field_values": 390,
+             "task_tags": 260}
+ROW_DISK_BYTES = 160        # Database bytes per row, indexes excluded
+INDEX_SORT_BYTES = 64       # Sorter memory per row while an index is built
+USER_BYTES = 400            # Users store, team memberships, activity counters and stats row per user
+PROJECT_BYTES = 600         # Projects store and section IDs per project
+WORKER_MB = 40              # Interpreter and generator modules of one task worker process
+
+MIN_BATCH, MAX_BATCH = 500, 100_000
+MIN_CACHE_MB, MAX_CACHE_MB = 2, 2048
+MIN_FREE_MB = 32            # Below this the budget is too small and the minimum settings are used
+
+# Shares of the memory left once fixed costs are taken off
+WORKER_SHARE = 0.5
+CACHE_SHARE = 0.25
+BUFFER_SHARE = 0.25
+
+HIGH_WATER = 0.9            # Tighten the settings above this fraction of the budget
+LOW_WATER = 0.6             # Relax them back towards the plan below this fraction
+CHECK_INTERVAL = 0.25       # Seconds between memory readings
+
+
+def parse_size(value):
+    """Parse a memory size like "512M", "2G", "1.5GB" or "2048" (MB) into MB."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([kmgt]?)i?b?\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"Invalid memory size: {value!r} (expected e.g. 512M or 2G)")
+    number, unit = float(match.group(1)), match.group(2) or "m"
+    return number * {"k": 1 / 1024, "m": 1, "g": 1024, "t": 1024 * 1024}[unit]
+
+
+def rows_per_project():
+    """Expected rows each table gets per project, from the config."""
+    tasks = sum(TASKS_PER_PROJECT) / 2
+    all_tasks = tasks * (1 + SUBTASK_CHANCE * SUBTASKS_PER_PARENT)
+    fields = sum(CUSTOM_FIELDS_PER_PROJECT) / 2
+    return {
+        "tasks": all_tasks,
+        "comments": tasks * COMMENT_CHANCE,
+        "custom_field_definitions": fields,
+        "custom_field_values": all_tasks * fields * CUSTOM_FIELD_FILL_RATE,
+        "task_tags": all_tasks * TAG_CHANCE * sum(TAGS_PER_TASK) / 2,
+    }
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+def plan_memory(budget_mb, num_users=NUM_USERS, num_projects=NUM_PROJECTS, max_workers=None):
+    """
+    Choose generation settings that fit in budget_mb.
+
+    Args:
+        budget_mb: Memory for the whole run (this process and its workers)
+        max_workers: Most task workers to use (default: CPU count)
+
+    Returns:
+        dict: budget_mb, batch_size, cache_mb, workers, chunksize, max_pending,
+              commit_projects, temp_store, plus the estimates behind them
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    per_project = rows_per_project()
+    project_mb = sum(ROW_BYTES[table] * rows for table, rows in per_project.items()) / 2**20
+    base_mb = current_rss_mb()
+    fixed_mb = base_mb + (num_users * USER_BYTES + num_projects * PROJECT_BYTES) / 2**20
+    free_mb = max(budget_mb - fixed_mb, 0.0)
+    if free_mb < MIN_FREE_MB:
+        print(f"  Memory budget {budget_mb:,.0f} MB leaves {free_mb:,.0f} MB after fixed costs "
+              f"({fixed_mb:,.0f} MB); the run may not fit in it")
+
+    # Workers: each costs a process plus the results of the chunks it has in flight
+    chunksize = max(1, min(TASK_BATCH, num_projects // (max_workers * 8)))
+    per_worker_mb = WORKER_MB + 2 * chunksize * project_mb
+    workers = int(_clamp(free_mb * WORKER_SHARE // per_worker_mb, 1, max_workers))
+    if workers == 1:
+        # One batch of projects at a time, as large as the share allows
+        chunksize = int(_clamp(free_mb * WORKER_SHARE // project_mb, 1, TASK_BATCH))
+        max_pending = 1
+    else:
+        chunksize = max(1, min(TASK_BATCH, num_projects // (workers * 8)))
+        pending_mb = max(free_mb * WORKER_SHARE - workers * WORKER_MB, 0.0)
+        max_pending = int(_clamp(pending_mb // (chunksize * project_mb), 1, workers * 2))
+
+    cache_mb = int(_clamp(free_mb * CACHE_SHARE, MIN_CACHE_MB, MAX_CACHE_MB))
+    # A full buffer for every tasks-stage table at once is the worst case
+    batch_size = int(_clamp(free_mb * BUFFER_SHARE * 2**20 // sum(ROW_BYTES.values()), MIN_BATCH, MAX_BATCH))
+    # One transaction writes about one page cache's worth of rows
+    commit_projects = max(1, int(cache_mb * 2**20 / ROW_DISK_BYTES / sum(per_project.values())))
+    # Index builds sort a whole table; keep the sort in memory only if the largest one fits in the cache share
+    sort_mb = max(per_project.values()) * num_projects * INDEX_SORT_BYTES / 2**20
+    temp_store = "MEMORY" if sort_mb <= cache_mb else "FILE"
+
+    return {
+        "budget_mb": round(budget_mb, 1),
+        "batch_size": batch_size,
+        "cache_mb": cache_mb,
+        "workers": workers,
+        "chunksize": chunksize,
+        "max_pending": max_pending,
+        "commit_projects": commit_projects,
+        "temp_store": temp_store,
+        "base_mb": round(base_mb, 1),
+        "fixed_mb": round(fixed_mb, 1),
+        "project_mb": round(project_mb, 3),
+        "rows_per_project": {table: round(rows, 1) for table, rows in per_project.items()},
+    }
+
+
+def describe_plan(plan):
+    """One-line summary of a plan."""
+    return (f"batch {plan['batch_size']:,} rows, cache {plan['cache_mb']:,} MB, {plan['workers']} worker(s), "
+            f"{plan['max_pending']} chunk(s) of {plan['chunksize']} project(s) in flight, "
+            f"commit every {plan['commit_projects']:,} projects, temp store {plan['temp_store'].lower()}")
+
+
+class MemoryGovernor:
+    """
+    Keeps the tasks stage within a plan's budget at runtime.
+
+    Call project_done() after each project's rows are handed to the writer.
+    It commits every commit_projects projects and, every CHECK_INTERVAL
+    seconds, reads the memory of this process and its workers: above
+    HIGH_WATER of the budget it commits (emptying the writer's buffers),
+    releases SQLite's spare memory and halves the batch size, page cache and
+    chunks in flight; below LOW_WATER it grows them back towards the plan.
+    """
+
+    def __init__(self, plan, writer, conn=None):
+        self.plan = plan
+        self.writer = writer
+        self.conn = conn
+        self.batch_size = plan["batch_size"]
+        self.cache_mb = plan["cache_mb"]
+        self.max_pending = plan["max_pending"]
+        self.since_commit = 0
+        self.next_check = 0.0
+        self.peak_mb = 0.0
+        self.adjustments = 0
+        self.commits = 0
+        self._apply()
+
+    def pending_limit(self):
+        """Chunks of projects the worker pool may have in flight (read by imap_bounded)."""
+        return self.max_pending
+
+    def project_done(self):
+        self.since_commit += 1
+        if self.since_commit >= self.plan["commit_projects"]:
+            self.commit()
+        now = time.perf_counter()
+        if now >= self.next_check:
+            self.next_check = now + CHECK_INTERVAL
+            self.check()
+
+    def commit(self):
+        self.writer.commit()
+        self.since_commit = 0
+        self.commits += 1
+
+    def check(self):
+        used = total_rss_mb()
+        self.peak_mb = max(self.peak_mb, used)
+        budget = self.plan["budget_mb"]
+        if used > budget * HIGH_WATER:
+            self.commit()
+            if self.conn is not None:
+                self.conn.execute("PRAGMA shrink_memory")
+            self._resize(0.5, f"{used:,.0f} MB used, over {HIGH_WATER:.0%} of {budget:,.0f} MB")
+        elif used < budget * LOW_WATER and (self.batch_size < self.plan["batch_size"] or
+                                            self.cache_mb < self.plan["cache_mb"] or
+                                            self.max_pending < self.plan["max_pending"]):
+            self._resize(1.5, f"{used:,.0f} MB used, under {LOW_WATER:.0%} of {budget:,.0f} MB")
+
+    def _resize(self, factor, reason):
+        plan = self.plan
+        batch_size = int(_clamp(self.batch_size * factor, MIN_BATCH, plan["batch_size"]))
+        cache_mb = int(_clamp(self.cache_mb * factor, MIN_CACHE_MB, plan["cache_mb"]))
+        max_pending = int(_clamp(round(self.max_pending * factor), 1, plan["max_pending"]))
+        if (batch_size, cache_mb, max_pending) == (self.batch_size, self.cache_mb, self.max_pending):
+            return
+        self.batch_size, self.cache_mb, self.max_pending = batch_size, cache_mb, max_pending
+        self.adjustments += 1
+        self._apply()
+        print(f"  [memory] {reason}: batch {batch_size:,}, cache {cache_mb:,} MB, {max_pending} chunk(s) in flight")
+
+    def _apply(self):
+        self.writer.batch_size = self.batch_size
+        if self.conn is not None:
+            self.conn.execute(f"PRAGMA cache_size = {-self.cache_mb * 1024}")
+            self.conn.execute(f"PRAGMA temp_store = {self.plan['temp_store']}")
+
+    def report(self):
+        """Runtime summary for the metrics report."""
+        return {"peak_mb": round(self.peak_mb, 1), "adjustments": self.adjustments, "commits": self.commits,
+                "final_batch_size": self.batch_size, "final_cache_mb": self.cache_mb,
+                "final_max_pending": self.max_pending}
@@ -0,0 +1,45 @@
+"""
+Stage checkpoints for resumable generation.
+
+Each completed stage records a fingerprint of the config values and seed it
+depends on (chained with the fingerprint of the stage before it). A resumed
+run skips stages whose fingerprint is unchanged and regenerates the rest.
+"""
+import hashlib
+import json
+
+CHECKPOINT_TABLE = "_checkpoints"
+
+
+def fingerprint(*values):
+    """Stable short hash of JSON-serializable values."""
+    data = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def ensure_checkpoint_table(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+            stage TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            reference_now INTEGER NOT NULL,
+            completed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def load_checkpoints(conn):
+    """Return {stage: (fingerprint, reference_now)} for completed stages."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                          (CHECKPOINT_TABLE,)).fetchone()
+    if not exists:
+        return {}
+    rows = conn.execute(f"SELECT stage, fingerprint, reference_now FROM {CHECKPOINT_TABLE}")
+    return {stage: (fp, reference) for stage, fp, reference in rows}
+
+
+def save_checkpoint(conn, stage, fp, reference_now):
+    """Mark a stage as complete. Call in the same transaction as the stage's rows."""
+    conn.execute(f"INSERT OR REPLACE INTO {CHECKPOINT_TABLE} (stage, fingerprint, reference_now) VALUES (?, ?, ?)",
+                 (stage, fp, reference_now))
+
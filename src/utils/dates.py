@@ -1,45 +1,93 @@
 """
 Date and time utilities for data generation.
+
+Timestamps are handled as integer epoch seconds (UTC) and only formatted to
+strings when a row is written. All "days ago" values are relative to a single
+reference time fixed once per run, so a run does not drift while it executes
+and can be reproduced by pinning the reference (REFERENCE_DATE).
 """
 import random
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timezone
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_reference_now = None
 
+# Day number -> "YYYY-MM-DD", filled on first use of each day
+_day_strings = {}
 
-def random_date(start_days_ago=180, end_days_ago=0):
+
+def set_reference_now(value=None):
     """
-    Generate random date within range.
-    Returns ISO string format for SQLite compatibility.
+    Fix the reference "now" for this run.
+    Accepts epoch seconds, a datetime, a "YYYY-MM-DD[ HH:MM:SS]" string, or
+    None for the current time. Returns the reference as epoch seconds.
     """
-    days_ago = random.randint(end_days_ago, start_days_ago)
-    dt = datetime.now() - timedelta(days=days_ago)
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    global _reference_now
+    if value is None:
+        _reference_now = int(time.time())
+    elif isinstance(value, datetime):
+        _reference_now = int(value.replace(tzinfo=value.tzinfo or timezone.utc).timestamp())
+    elif isinstance(value, str):
+        _reference_now = to_epoch(value if " " in value else value + " 00:00:00")
+    else:
+        _reference_now = int(value)
+    return _reference_now
 
 
-def now_str():
-    """Get current datetime as string."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def reference_now():
+    """Get the reference time as epoch seconds, fixing it on first use."""
+    if _reference_now is None:
+        set_reference_now()
+    return _reference_now
 
 
-def parse_datetime(dt_str):
-    """Parse datetime string back to datetime object."""
-    return datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
+def random_epoch(start_days_ago=180, end_days_ago=0, rng=None):
+    """Generate a random timestamp a whole number of days before the reference time."""
+    days_ago = (rng or random).randint(end_days_ago, start_days_ago)
+    return reference_now() - days_ago * SECONDS_PER_DAY
+
+
+def format_date(epoch):
+    """Format epoch seconds as a date-only string."""
+    day = epoch // SECONDS_PER_DAY
+    value = _day_strings.get(day)
+    if value is None:
+        value = date.fromordinal(_EPOCH_ORDINAL + day).isoformat()
+        _day_strings[day] = value
+    return value
 
 
-def add_days(dt_str, days):
-    """Add days to a datetime string and return new string."""
-    dt = parse_datetime(dt_str)
-    new_dt = dt + timedelta(days=days)
-    return new_dt.strftime("%Y-%m-%d %H:%M:%S")
+def format_datetime(epoch):
+    """Format epoch seconds as an ISO string for SQLite compatibility."""
+    day, seconds = divmod(epoch, SECONDS_PER_DAY)
+    hours, seconds = divmod(seconds, SECONDS_PER_HOUR)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{format_date(day * SECONDS_PER_DAY)} {hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
-def add_hours(dt_str, hours):
-    """Add hours to a datetime string and return new string."""
-    dt = parse_datetime(dt_str)
-    new_dt = dt + timedelta(hours=hours)
-    return new_dt.strftime("%Y-%m-%d %H:%M:%S")
+def to_epoch(dt_str):
+    """Parse a datetime string to epoch seconds."""
+    return int(parse_datetime(dt_str).replace(tzinfo=timezone.utc).timestamp())
 
 
-def to_date_only(dt_str):
-    """Convert datetime string to date-only string."""
-    dt = parse_datetime(dt_str)
-    return dt.strftime("%Y-%m-%d")
+def random_date(start_days_ago=180, end_days_ago=0, rng=None):
+    """
+    Generate random date within range.
+    Returns ISO string format for SQLite compatibility.
+    """
+    return format_datetime(random_epoch(start_days_ago, end_days_ago, rng))
+
+
+def now_str():
+    """Get the reference time as string."""
+    return format_datetime(reference_now())
+
+
+def parse_datetime(dt_str):
+    """Parse datetime string back to datetime object."""
+    return datetime.strptime(dt_str, DATETIME_FORMAT)
@@ -0,0 +1,166 @@
+"""
+Database write utilities for data generation.
+Buffers rows per table and writes them with executemany in batches.
+"""
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+
+
+# Column order for each table. Generators build row tuples in this order.
+TABLE_COLUMNS = {
+    "organizations": ("org_id", "name", "domain", "created_at"),
+    "users": ("user_id", "org_id", "full_name", "email", "department", "role", "created_at"),
+    "teams": ("team_id", "org_id", "name", "department", "created_at"),
+    "team_memberships": ("id", "team_id", "user_id", "role", "joined_at"),
+    "projects": ("project_id", "team_id", "owner_id", "name", "project_type", "status",
+                 "created_at", "due_date"),
+    "sections": ("section_id", "project_id", "name", "order_index", "created_at"),
+    "tasks": ("task_id", "project_id", "section_id", "parent_task_id", "assignee_id", "name",
+              "completed", "priority", "due_date", "created_at", "completed_at"),
+    "comments": ("comment_id", "task_id", "author_id", "content", "created_at"),
+    "tags": ("tag_id", "org_id", "name", "color", "created_at"),
+    "task_tags": ("task_id", "tag_id", "created_at"),
+    "custom_field_definitions": ("field_id", "project_id", "name", "field_type", "created_at"),
+    "custom_field_values": ("id", "task_id", "field_id", "value", "created_at"),
+    "user_stats": ("user_id", "team_count", "tasks_assigned", "tasks_completed", "comments_authored"),
+    "team_stats": ("team_id", "member_count"),
+}
+
+# Tables whose inserts skip rows that conflict with an existing key
+IGNORE_CONFLICTS = {"team_memberships"}
+
+DEFAULT_BATCH_SIZE = 5000
+
+# PRAGMAs applied while bulk loading a freshly created database
+BULK_LOAD_PRAGMAS = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": -200000,   # Negative values are KiB (~200 MB)
+    "temp_store": "MEMORY",
+}
+
+# Fast-loading PRAGMAs that keep a journal, so an interrupted load can be resumed
+RESUMABLE_BULK_LOAD_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -200000,
+    "temp_store": "MEMORY",
+}
+
+
+def load_schema(conn, schema_path, integer_ids=False):
+    """
+    Create the tables from a schema file.
+    With integer_ids, every *_id column is declared INTEGER instead of TEXT, so
+    primary keys become SQLite rowid aliases.
+    """
+    with open(schema_path, "r") as f:
+        sql = f.read()
+    if integer_ids:
+        sql = re.sub(r"\b(\w*id) TEXT\b", r"\1 INTEGER", sql)
+    conn.executescript(sql)
+
+
+def connect_readonly(path, **kwargs):
+    """Open a read-only connection; any number of them can read the database at once."""
+    return sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True, **kwargs)
+
+
+def drop_indexes(conn):
+    """Drop the secondary indexes (idx_*) so a reload does not maintain them row by row."""
+    names = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'")]
+    for name in names:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    return names
+
+
+def build_indexes(conn, indexes_path):
+    """Create the secondary indexes after loading, then refresh planner statistics."""
+    with open(indexes_path, "r") as f:
+        conn.executescript(f.read())
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def insert_sql(table):
+    """Build the INSERT statement for a table from its registered columns."""
+    columns = TABLE_COLUMNS[table]
+    verb = "INSERT OR IGNORE" if table in IGNORE_CONFLICTS else "INSERT"
+    placeholders = ", ".join("?" for _ in columns)
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+class BulkWriter:
+    """
+    Collects rows per table and flushes them with executemany.
+
+    Rows are written inside the connection's current transaction; call
+    commit() to flush the remaining buffers and commit.
+    """
+
+    def __init__(self, conn, batch_size=DEFAULT_BATCH_SIZE):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.batch_size = batch_size
+        self.buffers = {table: [] for table in TABLE_COLUMNS}
+        self.rows_written = {table: 0 for table in TABLE_COLUMNS}
+        self.batches = 0
+        self._sql = {table: insert_sql(table) for table in TABLE_COLUMNS}
+
+    def add(self, table, row):
+        """Buffer a single row, flushing the table when the batch is full."""
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush_table(table)
+
+    def add_many(self, table, rows):
+        """Buffer several rows for the same table."""
+        buffer = self.buffers[table]
+        buffer.extend(rows)
+        if len(buffer) >= self.batch_size:
+            self.flush_table(table)
+
+    def flush_table(self, table):
+        """Write all buffered rows for one table."""
+        buffer = self.buffers[table]
+        if not buffer:
+            return
+        self.cursor.executemany(self._sql[table], buffer)
+        self.rows_written[table] += len(buffer)
+        self.batches += 1
+        buffer.clear()
+
+    def flush(self):
+        """Write all buffered rows for every table."""
+        for table in self.buffers:
+            self.flush_table(table)
+
+    def commit(self):
+        """Flush all buffers and commit the current transaction."""
+        self.flush()
+        self.conn.commit()
+
+
+@contextmanager
+def bulk_load(conn, pragmas=None):
+    """
+    Apply fast-loading PRAGMAs for the duration of the block.
+
+    The previous settings are restored afterwards, so the finished database
+    uses the normal journal and sync behaviour.
+    """
+    pragmas = pragmas or BULK_LOAD_PRAGMAS
+    conn.commit()
+    previous = {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in pragmas}
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    try:
+        yield conn
+    finally:
+        conn.commit()
+        for name, value in previous.items():
+            conn.execute(f"PRAGMA {name} = {value}")
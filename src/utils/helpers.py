@@ -1,15 +1,29 @@
 """
-Helper utilities for ID generation and common operations.
+Helper utilities for seeding and common operations.
 """
-import uuid
-import random
+import hashlib
 
+# Seed every stage and project seed of the current run is derived from. main.py
+# sets it from config.SEED (or per organization in multi-org runs).
+_base_seed = 42
 
-def gen_id():
-    """Generate a short unique ID (12 characters)."""
-    return str(uuid.uuid4())[:12]
 
+def derive_seed(*parts):
+    """
+    Derive a stable 64-bit seed from the given parts (e.g. base seed, stage, index).
+    Unlike hash(), the result is the same in every process and every run.
+    """
+    key = "/".join(str(part) for part in parts).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
 
-def pick_weighted(options, weights):
-    """Pick from options with weighted probability."""
-    return random.choices(options, weights=weights, k=1)[0]
+
+def set_base_seed(seed):
+    """Set the base seed of this run (and of worker processes it starts)."""
+    global _base_seed
+    _base_seed = seed
+    return seed
+
+
+def base_seed():
+    """Get the base seed of this run."""
+    return _base_seed
@@ -0,0 +1,177 @@
+"""
+ID allocation for generated entities.
+
+Every ID starts as a unique integer built from a shard, a block and a counter:
+
+    | shard (10 bits) | block (28 bits) | counter (24 bits) |
+
+Blocks let independent workers allocate IDs without coordination (tasks of
+project k use block k), and shards keep separately generated databases apart.
+The integer is then rendered according to the ID mode:
+
+- seeded:  scrambled with a keyed bijection and base36-encoded (12 characters).
+           Looks random, depends only on the seed, and can never collide.
+- counter: base36-encoded as-is, so IDs sort in allocation order.
+- integer: the raw integer, for INTEGER PRIMARY KEY columns.
+
+IDs are encoded in bulk: take() and the buffer behind next() render a whole
+range at once, as NumPy array operations when NumPy is installed.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from utils.helpers import derive_seed
+
+ID_MODES = ("seeded", "counter", "integer")
+
+SHARD_BITS = 10
+BLOCK_BITS = 28
+COUNTER_BITS = 24
+ID_BITS = SHARD_BITS + BLOCK_BITS + COUNTER_BITS
+ID_LENGTH = 12  # 36 ** 12 > 2 ** 62, so every ID fits in 12 base36 characters
+
+_MASK = (1 << ID_BITS) - 1
+_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+_CHUNK_DIGITS = 3
+_CHUNK = 36 ** _CHUNK_DIGITS
+_chunks = []              # Every 3-digit base36 string, built on first use
+_NUMPY_MIN = 16           # Smaller ranges are encoded in Python
+_PREFETCH_MIN, _PREFETCH_MAX = 64, 4096  # IDs next() encodes ahead: doubling between these
+
+_settings = {"mode": "seeded", "seed": 42, "shard": 0}
+
+
+def configure_ids(mode=None, seed=None, shard=None):
+    """Set the ID mode, seed and shard used by new allocators. Returns the settings."""
+    if mode is not None:
+        if mode not in ID_MODES:
+            raise ValueError(f"Unknown ID mode: {mode} (expected one of {', '.join(ID_MODES)})")
+        _settings["mode"] = mode
+    if seed is not None:
+        _settings["seed"] = seed
+    if shard is not None:
+        if not 0 <= shard < (1 << SHARD_BITS):
+            raise ValueError(f"Shard {shard} is out of range")
+        _settings["shard"] = shard
+    return dict(_settings)
+
+
+def id_settings():
+    """Get the current ID settings (e.g. to pass to worker processes)."""
+    return dict(_settings)
+
+
+def encode_base36(value, width=ID_LENGTH):
+    """Encode a non-negative integer as a fixed-width base36 string."""
+    if not _chunks:
+        _chunks.extend(a + b + c for a in _ALPHABET for b in _ALPHABET for c in _ALPHABET)
+    parts = []
+    for _ in range(-(-width // _CHUNK_DIGITS)):
+        value, chunk = divmod(value, _CHUNK)
+        parts.append(_chunks[chunk])
+    return "".join(reversed(parts))[-width:]
+
+
+def scramble(value, key):
+    """
+    Keyed bijection on ID_BITS-bit integers.
+    XOR, multiplication by an odd constant and xorshift are each invertible
+    modulo 2**ID_BITS, so distinct inputs always give distinct outputs.
+    """
+    value = (value ^ key) & _MASK
+    value = (value * 0x9E3779B97F4A7C15) & _MASK
+    value ^= value >> 31
+    value = (value * 0xBF58476D1CE4E5B9) & _MASK
+    value ^= value >> 29
+    return value
+
+
+def _encode_many(values, mode, key):
+    """Render a uint64 array of raw ID values like id_for does, as a list."""
+    if mode == "integer":
+        return values.tolist()
+    if mode == "seeded":
+        # The same steps as scramble(); uint64 products wrap modulo 2**64, which masking reduces
+        # to the same result modulo 2**ID_BITS
+        mask = np.uint64(_MASK)
+        values = (values ^ np.uint64(key)) & mask
+        values = (values * np.uint64(0x9E3779B97F4A7C15)) & mask
+        values ^= values >> np.uint64(31)
+        values = (values * np.uint64(0xBF58476D1CE4E5B9)) & mask
+        values ^= values >> np.uint64(29)
+    # Every digit of every ID at once, then one string cut into IDs
+    powers = np.uint64(36) ** np.arange(ID_LENGTH - 1, -1, -1, dtype=np.uint64)
+    alphabet = np.frombuffer(_ALPHABET.encode(), dtype=np.uint8)
+    text = alphabet[values[:, None] // powers % np.uint64(36)].tobytes().decode()
+    return [text[i:i + ID_LENGTH] for i in range(0, len(text), ID_LENGTH)]
+
+
+def encode_ids(kind, blocks, counters):
+    """
+    IDs of one kind for NumPy arrays of blocks and counters, the same as
+    IdAllocator(kind, block).id_for(counter) for each pair (needs NumPy).
+    """
+    if len(counters) and int(counters.max()) >= 1 << COUNTER_BITS:
+        raise OverflowError(f"{kind} ID block exhausted ({1 << COUNTER_BITS} IDs)")
+    values = (np.uint64(_settings["shard"] << (BLOCK_BITS + COUNTER_BITS)) |
+              (blocks.astype(np.uint64) << np.uint64(COUNTER_BITS)) | counters.astype(np.uint64))
+    return _encode_many(values, _settings["mode"], derive_seed(_settings["seed"], "ids", kind) & _MASK)
+
+
+class IdAllocator:
+    """Allocates IDs for one kind of entity within one block."""
+
+    def __init__(self, kind, block=0):
+        if not 0 <= block < (1 << BLOCK_BITS):
+            raise ValueError(f"Block {block} is out of range")
+        self.kind = kind
+        self.mode = _settings["mode"]
+        self.base = (_settings["shard"] << (BLOCK_BITS + COUNTER_BITS)) | (block << COUNTER_BITS)
+        self.key = derive_seed(_settings["seed"], "ids", kind) & _MASK
+        self.count = 0
+        self._buffer = []    # Encoded IDs from self.count - self._position on
+        self._position = 0
+
+    def id_for(self, n):
+        """Get the n-th ID of this allocator without allocating it."""
+        if not 0 <= n < (1 << COUNTER_BITS):
+            raise OverflowError(f"{self.kind} ID block exhausted ({1 << COUNTER_BITS} IDs)")
+        value = self.base | n
+        if self.mode == "integer":
+            return value
+        if self.mode == "counter":
+            return encode_base36(value)
+        return encode_base36(scramble(value, self.key))
+
+    def ids_for(self, start, count):
+        """Get IDs start to start + count - 1 without allocating them."""
+        if count <= 0:
+            return []
+        if start < 0 or start + count > (1 << COUNTER_BITS):
+            raise OverflowError(f"{self.kind} ID block exhausted ({1 << COUNTER_BITS} IDs)")
+        if np is None or count < _NUMPY_MIN:
+            return [self.id_for(n) for n in range(start, start + count)]
+        values = np.arange(self.base | start, (self.base | start) + count, dtype=np.uint64)
+        return _encode_many(values, self.mode, self.key)
+
+    def next(self):
+        """Allocate the next ID."""
+        if self._position >= len(self._buffer):
+            # Encode ahead, twice as many IDs each time up to _PREFETCH_MAX
+            size = min(max(_PREFETCH_MIN, self.count), _PREFETCH_MAX, (1 << COUNTER_BITS) - self.count)
+            self._buffer = self.ids_for(self.count, size) if size > 0 else [self.id_for(self.count)]
+            self._position = 0
+        value = self._buffer[self._position]
+        self._position += 1
+        self.count += 1
+        return value
+
+    def take(self, count):
+        """Allocate several IDs at once."""
+        ids = self._buffer[self._position:self._position + count]
+        ids += self.ids_for(self.count + len(ids), count - len(ids))
+        self._position += count
+        self.count += count
+        return ids
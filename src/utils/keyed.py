@@ -0,0 +1,161 @@
+"""
+Counter-based (keyed) randomness.
+
+Instead of taking the next value from a shared generator, every random value
+is a hash of (seed, kind, index, draw number): draw 3 of user 1234 is the same
+number whether or not users 0-1233 were ever generated. This lets any entity
+be materialized on its own (see generators/virtual.py), and the values of one
+entity do not shift when the number of entities before it changes.
+
+- KeyedStream: the random values of one kind of entity. stream.at(index)
+  returns a small random.Random-like object (random, randint, choice, pick)
+  for that entity's fixed draws; stream.rng(index) returns a full
+  random.Random for draws whose number varies (sampling, per-project tasks).
+- ConsistentChoice: a keyed pick from a set of values (team members) that
+  only changes when the value it picked leaves or a new value wins it, so
+  adding users does not reshuffle owners and assignees.
+"""
+import random
+from array import array
+from bisect import bisect, bisect_left
+
+from utils.helpers import derive_seed, base_seed
+
+_MASK64 = (1 << 64) - 1
+_DRAW_BITS = 8  # Draws per index addressed by at(); rng() uses the last one
+_RNG_DRAW = (1 << _DRAW_BITS) - 1
+RING_POINTS = 64  # Points per value on a ConsistentChoice ring (share of each value within ~1/8)
+
+
+def mix64(value):
+    """SplitMix64 finalizer: a bijective 64-bit hash (distinct inputs give distinct outputs)."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class KeyedStream:
+    """
+    Random values for one kind of entity, addressed by (index, draw).
+
+    Args:
+        kind: Entity kind (part of the key, e.g. "user")
+        seed: Base seed (defaults to the run's base seed)
+    """
+
+    __slots__ = ("kind", "key")
+
+    def __init__(self, kind, seed=None):
+        self.kind = kind
+        self.key = derive_seed(base_seed() if seed is None else seed, "keyed", kind)
+
+    def bits(self, index, draw=0):
+        """64 random bits for draw number draw of entity index."""
+        return mix64((self.key + (index << _DRAW_BITS) + draw) & _MASK64)
+
+    def at(self, index):
+        """Sequential draws for entity index (see Draws)."""
+        return Draws(self, index)
+
+    def rng(self, index):
+        """A random.Random private to entity index, for a varying number of draws."""
+        return random.Random(self.bits(index, _RNG_DRAW))
+
+
+class Draws:
+    """
+    The fixed draws of one entity, taken in order from its KeyedStream.
+    Implements the subset of the random.Random interface the generators use,
+    so it can be passed as rng to helpers like random_epoch.
+    """
+
+    __slots__ = ("stream", "index", "draw")
+
+    def __init__(self, stream, index):
+        self.stream = stream
+        self.index = index
+        self.draw = 0
+
+    def _bits(self):
+        draw = self.draw
+        if draw >= _RNG_DRAW:
+            raise IndexError(f"Too many draws for {self.stream.kind} {self.index}")
+        self.draw = draw + 1
+        # KeyedStream.bits with mix64 inlined (this is the per-draw hot path)
+        value = (self.stream.key + (self.index << _DRAW_BITS) + draw + 0x9E3779B97F4A7C15) & _MASK64
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return value ^ (value >> 31)
+
+    def bits(self):
+        """64 random bits."""
+        return self._bits()
+
+    def random(self):
+        """Float in [0, 1)."""
+        return (self._bits() >> 11) * (1.0 / (1 << 53))
+
+    def below(self, n):
+        """Integer in [0, n) (multiply-shift, bias below 2**-40 for any n used here)."""
+        return (self._bits() * n) >> 64
+
+    def randint(self, a, b):
+        """Integer in [a, b], like random.randint."""
+        return a + self.below(b - a + 1)
+
+    def choice(self, seq):
+        return seq[self.below(len(seq))]
+
+    def pick(self, values, cum_weights):
+        """Weighted choice with precomputed cumulative weights (like random.choices(k=1))."""
+        return values[bisect(cum_weights, self.random() * cum_weights[-1], 0, len(values) - 1)]
+
+
+class ConsistentChoice:
+    """
+    Picks values from a fixed set by 64 random bits (consistent hashing).
+
+    Methodology:
+    - Every value gets RING_POINTS points on a 64-bit ring, drawn from a hash
+      of the value itself (not of its position in the set)
+    - choose(bits) returns the value of the first point at or after bits
+    - A new value only takes over the arcs ending at its own points, so adding
+      a value changes only the picks it wins, and removing one only the picks
+      it had won
+
+    Attributes:
+        points: Sorted ring points (array of unsigned 64-bit integers)
+        owners: Index into values of each point's value (array of unsigned ints)
+    """
+
+    __slots__ = ("values", "points", "owners")
+
+    def __init__(self, values):
+        self.values = list(values)
+        points = []
+        for value in self.values:
+            rng = random.Random(derive_seed("ring", value))
+            points.extend([rng.getrandbits(64) for _ in range(RING_POINTS)])
+        order = sorted(range(len(points)), key=points.__getitem__)
+        self.points = array("Q", [points[i] for i in order])
+        self.owners = array("I", [i // RING_POINTS for i in order])
+
+    def choose(self, bits):
+        """The value picked by 64 random bits (None if there are no values)."""
+        if not self.values:
+            return None
+        i = bisect_left(self.points, bits)
+        return self.values[self.owners[i if i < len(self.owners) else 0]]
+
+
+_choices = {}
+
+
+def consistent_choice(values):
+    """The ConsistentChoice of a sequence of values, built once per process for each distinct set."""
+    key = tuple(values)
+    choice = _choices.get(key)
+    if choice is None:
+        choice = _choices[key] = ConsistentChoice(key)
+    return choice
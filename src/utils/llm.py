@@ -1,44 +1,180 @@
 """
 LLM integration utilities for generating realistic text content.
 Optional - uses OpenAI API if available and configured.
+
+Task names are prefetched concurrently for every department/project type
+combination and stored in a persistent on-disk cache keyed by model and
+prompt, so repeat runs make no network calls. Set OPENAI_BASE_URL to point the
+client at any OpenAI-compatible server (e.g. a local stub).
 """
+import asyncio
+import hashlib
+import json
 import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = "output/llm_cache.sqlite"
 
 
-def get_openai_client():
-    """Get OpenAI client if available and configured."""
+def get_async_openai_client():
+    """Get an async OpenAI client if available and configured."""
     try:
-        from openai import OpenAI
+        from openai import AsyncOpenAI
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key and api_key != "your-api-key-here":
-            return OpenAI(api_key=api_key)
+            # Retries are handled by fetch_completion
+            return AsyncOpenAI(api_key=api_key, base_url=os.getenv("OPENAI_BASE_URL") or None, max_retries=0)
     except ImportError:
         pass
     return None
 
 
-def generate_task_names_with_llm(department, project_type, count=10):
+def build_task_names_prompt(department, project_type, count):
+    """Build the prompt asking for task names."""
+    return f"""Generate {count} realistic task names for a {department} team
+working on a {project_type} project at a B2B SaaS company.
+Return only the task names, one per line. Make them specific and realistic."""
+
+
+def parse_task_names(content):
+    """Split a completion into clean task names."""
+    names = content.strip().split('\n')
+    return [n.strip().lstrip('0123456789.-) ') for n in names if n.strip()]
+
+
+class LLMCache:
     """
-    Use OpenAI to generate realistic task names.
-    Returns None if LLM is not available.
+    Persistent cache of LLM responses keyed by model and prompt.
+    Entries are evicted least-recently-used first once the total size exceeds max_bytes.
     """
-    client = get_openai_client()
+
+    def __init__(self, path=None, max_bytes=None):
+        self.path = path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_bytes = max_bytes or int(float(os.getenv("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024)
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def key(model, prompt):
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, model, prompt):
+        """Return the cached value, or None on a miss."""
+        key = self.key(model, prompt)
+        row = self.conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return json.loads(row[0])
+
+    def put(self, model, prompt, value):
+        """Store a value and evict old entries if the cache is over its size limit."""
+        data = json.dumps(value)
+        self.conn.execute("INSERT OR REPLACE INTO llm_cache (key, model, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                          (self.key(model, prompt), model, data, len(data), time.time()))
+        self.evict()
+        self.conn.commit()
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used").fetchall():
+            self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        self.conn.close()
+
+
+async def fetch_completion(client, semaphore, model, prompt, retries, timeout):
+    """Request one completion, retrying with exponential backoff. Returns None on failure."""
+    async with semaphore:
+        for attempt in range(retries + 1):
+            try:
+                response = await asyncio.wait_for(client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=500,
+                    temperature=0.8
+                ), timeout)
+                return response.choices[0].message.content
+            except Exception as e:
+                if attempt == retries:
+                    print(f"LLM call failed: {e}")
+                    return None
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+
+async def _fetch_all(prompts, model, concurrency, retries, timeout):
+    client = get_async_openai_client()
     if not client:
-        return None
-    
+        return {}
+    semaphore = asyncio.Semaphore(concurrency)
     try:
-        prompt = f"""Generate {count} realistic task names for a {department} team 
-working on a {project_type} project at a B2B SaaS company.
-Return only the task names, one per line. Make them specific and realistic."""
-        
-        response = client.chat.completions.create(
-            model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=500,
-            temperature=0.8
-        )
-        names = response.choices[0].message.content.strip().split('\n')
-        return [n.strip().lstrip('0123456789.-) ') for n in names if n.strip()]
-    except Exception as e:
-        print(f"LLM call failed: {e}")
-        return None
+        results = await asyncio.gather(*(fetch_completion(client, semaphore, model, prompt, retries, timeout)
+                                         for prompt in prompts.values()))
+    finally:
+        await client.close()
+    return dict(zip(prompts, results))
+
+
+def prefetch_task_names(combos, count=20, cache=None):
+    """
+    Fetch task names for many (department, project_type) pairs at once.
+
+    Cached combinations are served from disk; the rest are requested
+    concurrently (LLM_CONCURRENCY at a time, LLM_TIMEOUT seconds per attempt,
+    LLM_RETRIES retries).
+
+    Returns:
+        dict: Mapping of (department, project_type) to a list of names.
+              Combinations that could not be generated are left out.
+    """
+    model = os.getenv("LLM_MODEL", "gpt-4o-mini")
+    own_cache = cache is None
+    cache = cache or LLMCache()
+    names = {}
+    missing = {}
+
+    try:
+        for combo in combos:
+            prompt = build_task_names_prompt(combo[0], combo[1], count)
+            cached = cache.get(model, prompt)
+            if cached:
+                names[combo] = cached
+            else:
+                missing[combo] = prompt
+
+        if missing:
+            print(f"  Requesting task names for {len(missing)} combinations from {model}...")
+            responses = asyncio.run(_fetch_all(missing, model,
+                                               concurrency=int(os.getenv("LLM_CONCURRENCY", "8")),
+                                               retries=int(os.getenv("LLM_RETRIES", "3")),
+                                               timeout=float(os.getenv("LLM_TIMEOUT", "30"))))
+            for combo, content in responses.items():
+                parsed = parse_task_names(content) if content else None
+                if parsed:
+                    cache.put(model, missing[combo], parsed)
+                    names[combo] = parsed
+    finally:
+        if own_cache:
+            cache.close()
+
+    return names
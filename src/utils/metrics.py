@@ -0,0 +1,241 @@
+"""
+Stage metrics for the generation pipeline.
+Records wall time, row counts, SQLite statement counts and the memory each
+stage peaked at (sampled while it runs, worker processes included) and
+writes them as a JSON report. Individual stages can also
+be run under cProfile or tracemalloc.
+"""
+import cProfile
+import glob
+import io
+import json
+import multiprocessing
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    """
+    Peak resident set size so far, in MB: of this process over its lifetime, or
+    with RUSAGE_CHILDREN of the largest child process that has exited.
+    """
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def current_rss_mb(pid="self"):
+    """
+    Memory a process uses now, in MB.
+
+    On Linux this is the proportional set size (PSS), so pages a forked worker
+    still shares with its parent are not counted twice; without smaps_rollup
+    it falls back to RSS, and without /proc to this process's peak RSS.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        return peak_rss_mb() if pid == "self" else 0.0
+
+
+def child_pids():
+    """
+    PIDs of this process's live children. Read from /proc where possible, since
+    multiprocessing.active_children() reaps exited children and so must not run
+    beside a Pool's own bookkeeping thread.
+    """
+    files = glob.glob("/proc/self/task/*/children")
+    if not files:
+        return [child.pid for child in multiprocessing.active_children()]
+    pids = []
+    for path in files:
+        try:
+            with open(path) as f:
+                pids.extend(int(pid) for pid in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def total_rss_mb():
+    """Memory of this process plus its live child processes (e.g. pool workers), in MB."""
+    return current_rss_mb() + sum(current_rss_mb(pid) for pid in child_pids())
+
+
+class MemorySampler:
+    """
+    Samples total_rss_mb() on a background thread and keeps the maximum.
+
+    ru_maxrss only ever grows over a process's lifetime, so it cannot say what
+    one stage used; sampling while the stage runs can, and also sees worker
+    processes.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        self.peak_mb = max(self.peak_mb, total_rss_mb())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling and return the peak in MB."""
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self.peak_mb
+
+
+def parse_stage_list(value):
+    """Parse a comma-separated stage list ("users,tasks" or "all") into a set."""
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+class StageRecorder:
+    """
+    Collects one record per pipeline stage.
+
+    Args:
+        conn: Connection to count every executed SQLite statement on (trace_sql).
+              Tracing costs a Python callback per statement, so it is opt-in.
+        profile: Stage names (or "all") to run under cProfile.
+        trace_memory: Stage names (or "all") to run under tracemalloc.
+        profile_dir: Where .prof files are written.
+        verbose: Print a one-line summary after each stage.
+    """
+
+    def __init__(self, conn=None, trace_sql=False, profile=(), trace_memory=(),
+                 profile_dir="output/profiles", verbose=False):
+        self.stages = []
+        self.profile = set(profile)
+        self.trace_memory = set(trace_memory)
+        self.profile_dir = profile_dir
+        self.verbose = verbose
+        self.statements = None
+        if conn is not None and trace_sql:
+            self.statements = 0
+            conn.set_trace_callback(self._count_statement)
+
+    def _count_statement(self, sql):
+        self.statements += 1
+
+    def _enabled(self, names, stage):
+        return stage in names or "all" in names
+
+    @contextmanager
+    def stage(self, name, writer=None):
+        """
+        Time a stage. When a BulkWriter is given, the rows and batches it wrote
+        during the stage are counted; otherwise set record["rows"] inside the block.
+        """
+        record = {"stage": name, "rows": 0}
+        rows_before = sum(writer.rows_written.values()) if writer else 0
+        batches_before = writer.batches if writer else 0
+        statements_before = self.statements
+        profiler = cProfile.Profile() if self._enabled(self.profile, name) else None
+        tracing = self._enabled(self.trace_memory, name) and not tracemalloc.is_tracing()
+        children_before = peak_rss_mb(resource.RUSAGE_CHILDREN)
+        sampler = MemorySampler().start()
+        if tracing:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield record
+            if writer:
+                writer.flush()
+        finally:
+            seconds = time.perf_counter() - start
+            if profiler:
+                profiler.disable()
+                record["profile"] = self._save_profile(name, profiler)
+            if tracing:
+                record.update(self._memory_report())
+                tracemalloc.stop()
+            if writer:
+                record["rows"] = sum(writer.rows_written.values()) - rows_before
+                record["sql_batches"] = writer.batches - batches_before
+            if self.statements is not None:
+                record["sql_statements"] = self.statements - statements_before
+            record["seconds"] = round(seconds, 4)
+            record["rows_per_sec"] = round(record["rows"] / seconds, 1) if seconds > 0 else None
+            record["peak_rss_mb"] = round(sampler.stop(), 1)
+            # Workers that exited during the stage, in case one peaked between samples
+            children = peak_rss_mb(resource.RUSAGE_CHILDREN)
+            if children > children_before:
+                record["children_peak_rss_mb"] = round(children, 1)
+            self.stages.append(record)
+            if self.verbose:
+                print(f"  [{name}] {seconds:.2f}s, {record['rows']:,} rows "
+                      f"({record['rows_per_sec'] or 0:,.0f} rows/s), peak RSS {record['peak_rss_mb']:,.0f} MB")
+
+    def skip(self, name):
+        """Record a stage that was not run (e.g. reused from a checkpoint)."""
+        self.stages.append({"stage": name, "rows": 0, "skipped": True, "seconds": 0.0,
+                            "rows_per_sec": None, "peak_rss_mb": round(total_rss_mb(), 1)})
+
+    def _save_profile(self, name, profiler):
+        """Dump a stage profile to disk and print its top functions."""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{name}.prof")
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(15)
+        print(out.getvalue())
+        return path
+
+    def _memory_report(self, limit=10):
+        """Summarize tracemalloc's view of the stage."""
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+        return {
+            "traced_current_mb": round(current / 1e6, 2),
+            "traced_peak_mb": round(peak / 1e6, 2),
+            "top_allocations": [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                                f"{stat.size / 1e6:.2f} MB" for stat in top],
+        }
+
+    def to_dict(self, **extra):
+        """Build the report: per-stage records plus run totals."""
+        return {
+            **extra,
+            "total_seconds": round(sum(stage["seconds"] for stage in self.stages), 4),
+            "total_rows": sum(stage["rows"] for stage in self.stages),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "children_peak_rss_mb": round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+            "stages": self.stages,
+        }
+
+    def write_json(self, path, **extra):
+        """Write the report (plus any extra top-level fields) to a JSON file."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(**extra), f, indent=2)
@@ -0,0 +1,110 @@
+"""
+Bulk person-name generation.
+
+Reads first and last names (with their frequency weights, where the locale
+has them) straight from Faker's person providers once, then draws each
+identity with two weighted picks instead of one fake.name() call per user.
+Emails are built from ASCII slugs of the names and made unique with a
+per-name counter (jane.doe, jane.doe2, ...).
+"""
+import re
+import unicodedata
+from itertools import accumulate
+
+from faker import Faker
+
+# Letters NFKD does not decompose into ASCII
+_TRANSLITERATE = str.maketrans({"ß": "ss", "æ": "ae", "Æ": "AE", "ø": "o", "Ø": "O", "œ": "oe",
+                                "Œ": "OE", "ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "þ": "th", "ð": "d"})
+_NON_SLUG = re.compile(r"[^a-z-]+")
+
+
+def slugify(name):
+    """Lowercase ASCII form of a name for email addresses ("José Núñez" -> "josenunez")."""
+    ascii_name = unicodedata.normalize("NFKD", name.translate(_TRANSLITERATE))
+    ascii_name = ascii_name.encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_SLUG.sub("", ascii_name).strip("-")
+
+
+def _person_provider(locale):
+    fake = Faker(locale)
+    for provider in fake.providers:
+        if hasattr(provider, "first_names") and hasattr(provider, "last_names"):
+            return provider
+    raise ValueError(f"Faker locale {locale} has no person names")
+
+
+def _names_and_weights(values):
+    """Split a provider name list (tuple, or dict of name -> frequency) into names and cumulative weights."""
+    if isinstance(values, dict):
+        names = list(values)
+        weights = [float(w) for w in values.values()]
+    else:
+        names = list(dict.fromkeys(values))
+        weights = [1.0] * len(names)
+    # Names without any ASCII letters cannot be used in an email address
+    kept = [(name, weight) for name, weight in zip(names, weights) if slugify(name)]
+    return [name for name, _ in kept], list(accumulate(weight for _, weight in kept))
+
+
+class NamePool:
+    """
+    First and last names for one or more Faker locales.
+
+    Args:
+        locales: {locale: weight} share of users drawn from each locale
+                 (a list of locales gives each the same weight).
+    """
+
+    def __init__(self, locales):
+        if not isinstance(locales, dict):
+            locales = {locale: 1.0 for locale in locales}
+        self.locales = list(locales)
+        self.locale_weights = list(accumulate(locales.values()))
+        self.first = {}
+        self.last = {}
+        for locale in self.locales:
+            provider = _person_provider(locale)
+            self.first[locale] = _names_and_weights(provider.first_names)
+            self.last[locale] = _names_and_weights(provider.last_names)
+            if not self.first[locale][0] or not self.last[locale][0]:
+                raise ValueError(f"Faker locale {locale} has no names with Latin letters")
+        self._slugs = {}
+
+    def draw(self, rng):
+        """
+        Draw one (first_name, last_name) pair, choosing the locale by weight.
+        rng needs pick(values, cum_weights), like the keyed draws of utils.keyed.
+        """
+        locale = self.locales[0] if len(self.locales) == 1 else rng.pick(self.locales, self.locale_weights)
+        first_names, first_weights = self.first[locale]
+        last_names, last_weights = self.last[locale]
+        return rng.pick(first_names, first_weights), rng.pick(last_names, last_weights)
+
+    def slug(self, name):
+        """Cached slugify for pool names."""
+        value = self._slugs.get(name)
+        if value is None:
+            value = self._slugs[name] = slugify(name)
+        return value
+
+
+class EmailAllocator:
+    """
+    Hands out unique addresses of the form first.last@domain.
+
+    Repeated names get a counter (first.last2, first.last3, ...). Slugs contain
+    only letters and hyphens, so numbered and unnumbered addresses never collide.
+    """
+
+    def __init__(self, domain):
+        self.domain = domain
+        self.counts = {}
+
+    def allocate(self, first_slug, last_slug):
+        local = f"{first_slug}.{last_slug}"
+        count = self.counts.get(local, 0) + 1
+        self.counts[local] = count
+        if count > 1:
+            local = f"{local}{count}"
+        return f"{local}@{self.domain}"
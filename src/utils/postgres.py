@@ -0,0 +1,384 @@
+"""
+PostgreSQL bulk-load bundles.
+
+Turns a generated SQLite database into files psql loads at COPY speed:
+- schema.sql: CREATE TABLE statements with column types, NOT NULL and
+  defaults only, so the load does not maintain keys or check references
+- <table>.copy: each table's rows in COPY text format
+- constraints.sql / indexes.sql: primary keys, unique keys, foreign keys and
+  secondary indexes, added once the data is in
+- load.sql: the psql script that runs them in order
+- manifest.json: load order, columns, row counts and SHA-256 of every file
+
+The DDL is read from the database's own catalog (PRAGMA table_info,
+foreign_key_list, index_list), so it follows schema.sql, indexes.sql and the
+--id-mode the database was generated with.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+
+from utils.db import TABLE_COLUMNS
+
+MANIFEST_NAME = "manifest.json"
+COPY_SUFFIX = ".copy"
+NULL = "\\N"
+
+# SQLite declared type -> PostgreSQL type (INTEGER ids are bigint, see pg_type)
+PG_TYPES = {"TEXT": "text", "INTEGER": "integer", "BOOLEAN": "boolean", "TIMESTAMP": "timestamp", "DATE": "date"}
+
+# Backslash escapes of COPY text format; any other backslashed character stands for itself, as in PostgreSQL
+COPY_ESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r", "b": "\b", "f": "\f", "v": "\v"}
+_SPECIAL_GLOB = "'*[\\' || char(9) || char(10) || char(13) || ']*'"  # Text that needs escaping
+_ESCAPE = re.compile(r"\\(?:([0-7]{1,3})|x([0-9A-Fa-f]{1,2})|(.)|$)")
+
+# Values COPY accepts for each type, as written from SQLite
+_VALUE_PATTERNS = {
+    "bigint": re.compile(r"-?\d+"),
+    "integer": re.compile(r"-?\d+"),
+    "boolean": re.compile(r"[tf]"),
+    "timestamp": re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d+)?"),
+    "date": re.compile(r"\d{4}-\d{2}-\d{2}"),
+}
+
+
+def pg_type(column, declared):
+    """PostgreSQL type of a column; integer ids are bigint (sharded IDs exceed 2**31)."""
+    declared = declared.upper()
+    if declared == "INTEGER" and column.endswith("id"):
+        return "bigint"
+    return PG_TYPES.get(declared, "text")
+
+
+def read_tables(conn):
+    """
+    Table definitions from the database catalog, in load order.
+
+    Returns:
+        list: dicts with name, columns [(name, pg type, not null, default)],
+              primary_key, unique [column lists] and foreign_keys
+              [(columns, referenced table, referenced columns)]
+    """
+    tables = []
+    for table in TABLE_COLUMNS:
+        columns, primary_key = [], []
+        for _, name, declared, notnull, default, pk in conn.execute(f"PRAGMA table_info({table})"):
+            kind = pg_type(name, declared)
+            if default is not None and kind == "boolean":
+                default = "true" if default.strip("'") in ("1", "true") else "false"
+            columns.append((name, kind, bool(notnull or pk), default))
+            if pk:
+                primary_key.append((pk, name))
+        foreign_keys = {}
+        for fk_id, _, parent, column, parent_column, *_ in conn.execute(f"PRAGMA foreign_key_list({table})"):
+            _, child_columns, parent_columns = foreign_keys.setdefault(fk_id, (parent, [], []))
+            child_columns.append(column)
+            parent_columns.append(parent_column)
+        unique = []
+        for _, index, is_unique, origin, _ in conn.execute(f"PRAGMA index_list({table})"):
+            if is_unique and origin == "u":
+                unique.append([row[2] for row in conn.execute(f"PRAGMA index_info({index})")])
+        tables.append({
+            "name": table,
+            "columns": columns,
+            "primary_key": [name for _, name in sorted(primary_key)],
+            "unique": unique,
+            "foreign_keys": [(child, parent, parents) for parent, child, parents in
+                             (foreign_keys[fk_id] for fk_id in sorted(foreign_keys))],
+        })
+    return dependency_order(tables)
+
+
+def dependency_order(tables):
+    """Tables sorted so every table comes after the tables it references (self-references aside)."""
+    by_name = {table["name"]: table for table in tables}
+    ordered, done = [], set()
+
+    def visit(table, path):
+        if table["name"] in done:
+            return
+        if table["name"] in path:
+            raise ValueError(f"Foreign key cycle through {table['name']}")
+        for _, parent, _ in table["foreign_keys"]:
+            if parent != table["name"] and parent in by_name:
+                visit(by_name[parent], path | {table["name"]})
+        done.add(table["name"])
+        ordered.append(table)
+
+    for table in tables:
+        visit(table, set())
+    return ordered
+
+
+def index_definitions(conn):
+    """(index name, table, columns) of the secondary indexes (idx_*) in the database."""
+    indexes = []
+    for name, table in conn.execute(
+            "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\' "
+            "ORDER BY name"):
+        indexes.append((name, table, [row[2] for row in conn.execute(f"PRAGMA index_info({name})")]))
+    return indexes
+
+
+def schema_sql(tables):
+    """CREATE TABLE statements without keys or references."""
+    statements = []
+    for table in tables:
+        lines = []
+        for name, kind, notnull, default in table["columns"]:
+            line = f"    {name} {kind}"
+            if notnull:
+                line += " NOT NULL"
+            if default is not None:
+                line += f" DEFAULT {default}"
+            lines.append(line)
+        statements.append(f"CREATE TABLE {table['name']} (\n" + ",\n".join(lines) + "\n);")
+    return "-- Tables without keys or references; constraints.sql adds them after the load\n\n" + \
+        "\n\n".join(statements) + "\n"
+
+
+def constraints_sql(tables):
+    """
+    Primary and unique keys, then foreign keys, as ALTER TABLE statements.
+    Foreign keys are DEFERRABLE INITIALLY DEFERRED, so later loads into the
+    same tables (e.g. subtasks before their parents) are checked at commit.
+    """
+    keys, references = [], []
+    for table in tables:
+        name = table["name"]
+        if table["primary_key"]:
+            keys.append(f"ALTER TABLE {name} ADD CONSTRAINT {name}_pkey PRIMARY KEY ({', '.join(table['primary_key'])});")
+        for columns in table["unique"]:
+            keys.append(f"ALTER TABLE {name} ADD CONSTRAINT {name}_{'_'.join(columns)}_key UNIQUE ({', '.join(columns)});")
+        for columns, parent, parent_columns in table["foreign_keys"]:
+            references.append(
+                f"ALTER TABLE {name} ADD CONSTRAINT {name}_{'_'.join(columns)}_fkey FOREIGN KEY ({', '.join(columns)}) "
+                f"REFERENCES {parent} ({', '.join(parent_columns)}) DEFERRABLE INITIALLY DEFERRED;")
+    return ("-- Keys first (foreign keys need the referenced keys), then references\n\n" +
+            "\n".join(keys) + "\n\n" + "\n".join(references) + "\n")
+
+
+def indexes_sql(indexes):
+    """CREATE INDEX statements for the secondary indexes."""
+    return "-- Secondary indexes, built after the load\n\n" + "".join(
+        f"CREATE INDEX {name} ON {table} ({', '.join(columns)});\n" for name, table, columns in indexes)
+
+
+def load_sql(tables):
+    """
+    psql script loading the bundle (run from the bundle directory).
+
+    Methodology:
+    - Tables are created and filled in one transaction, so COPY ... FREEZE
+      writes rows already frozen (no vacuum pass to set hint bits later), and
+      with wal_level = minimal the table data is not WAL-logged at all
+    - Keys, references and indexes are built afterwards in single passes,
+      instead of being maintained row by row during the load
+    """
+    lines = ["-- Load the bundle: cd into its directory, then psql -d DATABASE -f load.sql",
+             "\\set ON_ERROR_STOP on",
+             "BEGIN;",
+             "\\ir schema.sql"]
+    for table in tables:
+        columns = ", ".join(name for name, _, _, _ in table["columns"])
+        lines.append(f"\\copy {table['name']} ({columns}) FROM '{table['name']}{COPY_SUFFIX}' "
+                     f"WITH (FORMAT text, FREEZE true, ENCODING 'UTF8')")
+    lines += ["COMMIT;",
+              "\\ir constraints.sql",
+              "\\ir indexes.sql",
+              "ANALYZE;"]
+    return "\n".join(lines) + "\n"
+
+
+def copy_select(table):
+    """
+    Query returning each row of a table as one line of COPY text format.
+
+    The escaping runs inside SQLite: text values containing a backslash, tab,
+    newline or carriage return get them escaped (the GLOB test skips the
+    replace() calls for the rest), NULLs become \\N and booleans t/f, so
+    Python only joins the lines.
+    """
+    fields = []
+    for name, kind, _, _ in table["columns"]:
+        if kind == "text":
+            fields.append(f"ifnull(CASE WHEN {name} GLOB {_SPECIAL_GLOB} THEN replace(replace(replace(replace("
+                          f"{name}, '\\', '\\\\'), char(9), '\\t'), char(10), '\\n'), char(13), '\\r') "
+                          f"ELSE {name} END, '{NULL}')")
+        elif kind == "boolean":
+            fields.append(f"CASE WHEN {name} IS NULL THEN '{NULL}' WHEN {name} THEN 't' ELSE 'f' END")
+        else:
+            fields.append(f"ifnull({name}, '{NULL}')")
+    return f"SELECT {' || char(9) || '.join(fields)} FROM {table['name']} ORDER BY rowid"
+
+
+def write_copy(conn, table, path, chunk_size=10000):
+    """
+    Write a table's COPY file.
+
+    Returns:
+        dict: file, rows, bytes, sha256 and seconds
+    """
+    start = time.perf_counter()
+    digest = hashlib.sha256()
+    rows = size = 0
+    cursor = conn.execute(copy_select(table))
+    with open(path, "wb") as f:
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            data = ("\n".join([row[0] for row in chunk]) + "\n").encode("utf-8")
+            digest.update(data)
+            f.write(data)
+            rows += len(chunk)
+            size += len(data)
+    return {"table": table["name"], "file": os.path.basename(path), "rows": rows, "bytes": size,
+            "sha256": digest.hexdigest(), "seconds": round(time.perf_counter() - start, 4)}
+
+
+def file_checksum(path):
+    """SHA-256 and size of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest(), os.path.getsize(path)
+
+
+def write_bundle_sql(directory, tables, indexes):
+    """Write schema.sql, constraints.sql, indexes.sql and load.sql; returns their paths."""
+    paths = []
+    for name, sql in (("schema.sql", schema_sql(tables)), ("constraints.sql", constraints_sql(tables)),
+                      ("indexes.sql", indexes_sql(indexes)), ("load.sql", load_sql(tables))):
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(sql)
+        paths.append(path)
+    return paths
+
+
+def write_manifest(directory, tables, files, sql_paths, **extra):
+    """
+    Write manifest.json: tables in load order with their columns and COPY
+    file stats, and the checksums of the SQL files.
+    """
+    stats = {entry["table"]: entry for entry in files}
+    sql_files = {}
+    for path in sql_paths:
+        sha256, size = file_checksum(path)
+        sql_files[os.path.basename(path)] = {"bytes": size, "sha256": sha256}
+    manifest = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "format": "postgresql-copy-text",
+        "null": NULL,
+        **extra,
+        "tables": [{"name": table["name"],
+                    "file": stats[table["name"]]["file"],
+                    "columns": [[name, kind, notnull] for name, kind, notnull, _ in table["columns"]],
+                    "rows": stats[table["name"]]["rows"],
+                    "bytes": stats[table["name"]]["bytes"],
+                    "sha256": stats[table["name"]]["sha256"]} for table in tables],
+        "sql_files": sql_files,
+    }
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+# ============================================
+# VALIDATION
+# ============================================
+
+def _unescape(match):
+    octal, hexa, char = match.groups()
+    if octal:
+        return chr(int(octal, 8))
+    if hexa:
+        return chr(int(hexa, 16))
+    if char is None:
+        raise ValueError("backslash at end of field")
+    return COPY_ESCAPES.get(char, char)
+
+
+def parse_copy_line(line):
+    """
+    Parse one line of COPY text format (without its newline).
+
+    Returns:
+        list: field values (None for \\N)
+    """
+    if line == "\\.":
+        raise ValueError("end-of-data marker inside the file")
+    if "\r" in line:
+        raise ValueError("unescaped carriage return")
+    return [None if field == NULL else _ESCAPE.sub(_unescape, field) for field in line.split("\t")]
+
+
+def validate_copy_file(path, columns, max_errors=10):
+    """
+    Parse a COPY file and check it against its manifest columns: field count,
+    escapes, NOT NULL and the value format of typed columns.
+
+    Returns:
+        tuple: (rows, sha256, list of error messages)
+    """
+    digest = hashlib.sha256()
+    errors = []
+    rows = 0
+    name = os.path.basename(path)
+    with open(path, "rb") as f:
+        for number, raw in enumerate(f, 1):
+            digest.update(raw)
+            rows += 1
+            if len(errors) >= max_errors:
+                continue
+            try:
+                if not raw.endswith(b"\n"):
+                    raise ValueError("last line has no newline")
+                values = parse_copy_line(raw[:-1].decode("utf-8"))
+                if len(values) != len(columns):
+                    raise ValueError(f"{len(values)} fields, expected {len(columns)}")
+                for value, (column, kind, notnull) in zip(values, columns):
+                    if value is None:
+                        if notnull:
+                            raise ValueError(f"NULL in NOT NULL column {column}")
+                    elif kind in _VALUE_PATTERNS and not _VALUE_PATTERNS[kind].fullmatch(value):
+                        raise ValueError(f"invalid {kind} in {column}: {value!r}")
+            except (ValueError, UnicodeDecodeError) as e:
+                errors.append(f"{name} line {number}: {e}")
+    return rows, digest.hexdigest(), errors
+
+
+def validate_bundle(directory, max_errors=10):
+    """
+    Check a bundle offline against its manifest: every COPY file parses, has
+    the manifest's row count and SHA-256, and every SQL file's checksum matches.
+
+    Returns:
+        list: error messages (empty when the bundle is valid)
+    """
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    errors = []
+    for table in manifest["tables"]:
+        path = os.path.join(directory, table["file"])
+        if not os.path.exists(path):
+            errors.append(f"{table['file']}: missing")
+            continue
+        rows, sha256, file_errors = validate_copy_file(path, table["columns"], max_errors)
+        errors += file_errors
+        if rows != table["rows"]:
+            errors.append(f"{table['file']}: {rows:,} rows, manifest says {table['rows']:,}")
+        if sha256 != table["sha256"]:
+            errors.append(f"{table['file']}: checksum does not match the manifest")
+    for name, expected in manifest["sql_files"].items():
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            errors.append(f"{name}: missing")
+        elif file_checksum(path)[0] != expected["sha256"]:
+            errors.append(f"{name}: checksum does not match the manifest")
+    return errors
@@ -0,0 +1,108 @@
+"""
+Shard sets for multi-organization generation.
+
+Each organization is generated into its own SQLite database (a shard) with
+its own ID shard, so IDs never collide between shards. Shards can be merged
+into one database with ATTACH and INSERT ... SELECT, which copies rows inside
+SQLite without passing them through Python, or kept as a shard set described
+by a JSON manifest.
+"""
+import json
+import os
+import time
+
+from faker import Faker
+
+from utils.db import TABLE_COLUMNS
+from utils.helpers import derive_seed
+from utils.names import slugify
+
+MANIFEST_NAME = "manifest.json"
+
+
+def shard_path(directory, index):
+    """Path of the database for organization number index."""
+    return os.path.join(directory, f"org_{index:04d}.sqlite")
+
+
+def org_seed(seed, index):
+    """Base seed for one organization; the first one uses the run seed itself."""
+    return seed if index == 0 else derive_seed(seed, "org", index)
+
+
+def org_identities(count, seed, first=None):
+    """
+    Company names and unique email domains for count organizations.
+    The first organization can be fixed (e.g. the configured company).
+
+    Returns:
+        list: (name, domain) per organization
+    """
+    fake = Faker()
+    orgs = [first] if first else []
+    domains = {domain for _, domain in orgs}
+    while len(orgs) < count:
+        fake.seed_instance(derive_seed(seed, "org_name", len(orgs)))
+        name = fake.company()
+        base = "".join(slugify(word) for word in name.split()[:2]) or "org"
+        domain = f"{base}.io"
+        n = 1
+        while domain in domains:
+            n += 1
+            domain = f"{base}{n}.io"
+        domains.add(domain)
+        orgs.append((name, domain))
+    return orgs
+
+
+def merge_shards(conn, paths, tables=None):
+    """
+    Copy every table of each shard database into conn, shard by shard.
+
+    Returns:
+        dict: Rows copied per table
+    """
+    tables = tables or list(TABLE_COLUMNS)
+    copied = {table: 0 for table in tables}
+    for path in paths:
+        conn.execute("ATTACH DATABASE ? AS shard", (path,))
+        try:
+            for table in tables:
+                columns = ", ".join(TABLE_COLUMNS[table])
+                cursor = conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM shard.{table}")
+                copied[table] += cursor.rowcount
+            conn.commit()
+        finally:
+            conn.execute("DETACH DATABASE shard")
+    return copied
+
+
+def write_manifest(directory, shards, **extra):
+    """
+    Write manifest.json describing a shard set.
+
+    Args:
+        shards: One dict per shard (index, org, path, rows, ...), in shard order.
+
+    Returns:
+        str: Path of the manifest
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    manifest = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        **extra,
+        "total_rows": {table: sum(shard["rows"].get(table, 0) for shard in shards) for table in TABLE_COLUMNS},
+        "shards": [dict(shard, path=os.path.relpath(shard["path"], directory)) for shard in shards],
+    }
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def read_manifest(directory):
+    """Load a shard set's manifest, with shard paths made absolute."""
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    for shard in manifest["shards"]:
+        shard["path"] = os.path.join(directory, shard["path"])
+    return manifest
@@ -0,0 +1,130 @@
+"""
+File sinks for data generation.
+Stream generated rows straight to one CSV or JSON Lines file per table
+(optionally gzip-compressed), without going through SQLite.
+"""
+import csv
+import gzip
+import json
+import os
+
+from utils.db import TABLE_COLUMNS, DEFAULT_BATCH_SIZE
+
+SINK_FORMATS = ("csv", "jsonl")
+
+# Columns SQLite stores as 0/1; file sinks write them the same way
+BOOLEAN_COLUMNS = {
+    "tasks": ("completed",),
+}
+
+
+def table_path(directory, table, fmt, compress=False):
+    """Path of the file a table is written to."""
+    return os.path.join(directory, f"{table}.{fmt}" + (".gz" if compress else ""))
+
+
+def _open_text(path, compress):
+    if compress:
+        # Level 6 is a good size/speed trade-off for generated text
+        return gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=6)
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def _bool_converter(table):
+    """Return a function that turns a table's boolean columns into 0/1, or None if it has none."""
+    columns = TABLE_COLUMNS[table]
+    positions = [columns.index(name) for name in BOOLEAN_COLUMNS.get(table, ())]
+    if not positions:
+        return None
+
+    def convert(row):
+        row = list(row)
+        for i in positions:
+            if row[i] is not None:
+                row[i] = int(row[i])
+        return row
+
+    return convert
+
+
+class FileWriter:
+    """
+    Drop-in replacement for BulkWriter that writes one file per table.
+
+    Rows are buffered per table and appended to the table's file when the
+    batch is full, so memory stays constant regardless of dataset size. Rows
+    are written in insertion order with the same values SQLite would store
+    (booleans as 0/1, None as an empty CSV field or JSON null).
+    """
+
+    def __init__(self, directory, fmt="csv", compress=False, batch_size=DEFAULT_BATCH_SIZE):
+        if fmt not in SINK_FORMATS:
+            raise ValueError(f"Unknown sink format: {fmt}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fmt = fmt
+        self.compress = compress
+        self.batch_size = batch_size
+        self.buffers = {table: [] for table in TABLE_COLUMNS}
+        self.rows_written = {table: 0 for table in TABLE_COLUMNS}
+        self.batches = 0
+        self.paths = {table: table_path(directory, table, fmt, compress) for table in TABLE_COLUMNS}
+        self._converters = {table: _bool_converter(table) for table in TABLE_COLUMNS}
+        self._files = {}
+        self._csv = {}
+        for table, path in self.paths.items():
+            f = self._files[table] = _open_text(path, compress)
+            if fmt == "csv":
+                self._csv[table] = csv.writer(f)
+                self._csv[table].writerow(TABLE_COLUMNS[table])
+
+    def add(self, table, row):
+        """Buffer a single row, flushing the table when the batch is full."""
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush_table(table)
+
+    def add_many(self, table, rows):
+        """Buffer several rows for the same table."""
+        buffer = self.buffers[table]
+        buffer.extend(rows)
+        if len(buffer) >= self.batch_size:
+            self.flush_table(table)
+
+    def flush_table(self, table):
+        """Append all buffered rows for one table to its file."""
+        buffer = self.buffers[table]
+        if not buffer:
+            return
+        convert = self._converters[table]
+        rows = map(convert, buffer) if convert else buffer
+        if self.fmt == "csv":
+            self._csv[table].writerows(rows)
+        else:
+            columns = TABLE_COLUMNS[table]
+            self._files[table].write("".join(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows))
+        self.rows_written[table] += len(buffer)
+        self.batches += 1
+        buffer.clear()
+
+    def flush(self):
+        """Write all buffered rows for every table."""
+        for table in self.buffers:
+            self.flush_table(table)
+
+    def commit(self):
+        """Flush all buffers (files have no transactions)."""
+        self.flush()
+
+    def close(self):
+        """Flush remaining rows and close every file."""
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def total_bytes(self):
+        """Size of the written files on disk."""
+        return sum(os.path.getsize(path) for path in self.paths.values() if os.path.exists(path))
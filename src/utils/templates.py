@@ -0,0 +1,100 @@
+"""
+Precompiled text templates.
+
+Templates like "Fix bug in {component}" are parsed once into their literal
+parts and the value list of each placeholder, so rendering never searches
+for placeholders. A template's renderings are numbered 0..size-1 (mixed radix
+over its slots); small templates are expanded up front into a tuple of
+interned strings, so rendering is a single index lookup and identical names
+share one string object.
+"""
+import math
+import sys
+from string import Formatter
+
+# Templates with at most this many distinct renderings are expanded at compile time
+MAX_EXPANSION = 4096
+
+
+class CompiledTemplate:
+    """One template split into literals and placeholder slots."""
+
+    __slots__ = ("literals", "slots", "size", "names")
+
+    def __init__(self, template, placeholders, max_expansion=MAX_EXPANSION):
+        literals, slots = [], []
+        pending = ""
+        for literal, field, _, _ in Formatter().parse(template):
+            pending += literal
+            if field is not None:
+                values = placeholders[field]
+                if not values:
+                    raise ValueError(f"Placeholder {{{field}}} has no values")
+                literals.append(pending)
+                slots.append(tuple(sys.intern(value) for value in values))
+                pending = ""
+        literals.append(pending)
+
+        self.literals = tuple(literals)
+        self.slots = tuple(slots)
+        self.size = math.prod(len(values) for values in slots)
+        self.names = None
+        if self.size <= max_expansion:
+            self.names = tuple(self._render(k) for k in range(self.size))
+
+    def _render(self, k):
+        # The first slot is the most significant digit of k
+        parts = [self.literals[-1]]
+        for literal, values in zip(reversed(self.literals[:-1]), reversed(self.slots)):
+            k, i = divmod(k, len(values))
+            parts.append(values[i])
+            parts.append(literal)
+        return sys.intern("".join(reversed(parts)))
+
+    def render(self, k):
+        """Return rendering number k (0 <= k < size)."""
+        names = self.names
+        return names[k] if names is not None else self._render(k)
+
+
+class TemplateSet:
+    """A group of compiled templates (e.g. one department's) rendered in batches."""
+
+    def __init__(self, templates, placeholders, max_expansion=MAX_EXPANSION):
+        self.templates = [CompiledTemplate(t, placeholders, max_expansion) for t in templates]
+
+    def __len__(self):
+        return len(self.templates)
+
+    def render(self, template_idx, slot_draws):
+        """
+        Render one name per (template index, uniform [0, 1) draw) pair.
+        The draw picks uniformly among the template's renderings.
+        """
+        templates = self.templates
+        names = []
+        append = names.append
+        for t, u in zip(template_idx, slot_draws):
+            template = templates[t]
+            k = int(u * template.size)
+            append(template.names[k] if template.names is not None else template._render(k))
+        return names
+
+    def sample(self, count, rng):
+        """Draw count names using a random.Random-style rng (two draws per name)."""
+        templates = self.templates
+        random = rng.random
+        n = len(templates)
+        names = []
+        append = names.append
+        for _ in range(count):
+            template = templates[int(random() * n)]
+            k = int(random() * template.size)
+            append(template.names[k] if template.names is not None else template._render(k))
+        return names
+
+
+def compile_templates(groups, placeholders, max_expansion=MAX_EXPANSION):
+    """Compile {group: [template, ...]} into {group: TemplateSet}."""
+    return {group: TemplateSet(templates, placeholders, max_expansion)
+            for group, templates in groups.items()}